@@ -0,0 +1,292 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+import asyncio
+import logging
+import math
+import os
+import time
+
+from app.core.json_codec import FastJSONResponse
+from app.core.single_flight import RoutePatterns
+
+logger = logging.getLogger("gateway_api")
+
+CRITICAL = "critical"
+READ = "read"
+DEFAULT = "default"
+EXPENSIVE = "expensive"
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionClass:
+    """우선순위 클래스 하나의 설정과 통계
+
+    priority가 낮을수록 먼저 처리하고, max_share는 이 클래스가 쓸 수 있는
+    전체 동시 처리 한도의 비율입니다 (1보다 크면 한도를 넘어 여유분까지 사용).
+    """
+
+    def __init__(self, name: str, priority: int, max_queue: int, max_queue_time: float, max_share: float):
+        self.name = name
+        self.priority = priority
+        self.max_queue = max_queue
+        self.max_queue_time = max_queue_time
+        self.max_share = max_share
+        self.in_flight = 0
+        self.admitted = 0
+        self.queued_total = 0
+        self.rejected_queue_full = 0
+        self.rejected_early = 0
+        self.rejected_timeout = 0
+        self.queue_time_ewma: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, name: str, priority: int, max_queue: int, max_queue_time: float, max_share: float) -> "AdmissionClass":
+        """ADMISSION_{CLASS}_MAX_QUEUE / _MAX_QUEUE_TIME / _MAX_SHARE 환경 변수로 기본값 덮어쓰기"""
+        prefix = f"ADMISSION_{name.upper()}"
+        return cls(
+            name=name,
+            priority=priority,
+            max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", max_queue)),
+            max_queue_time=float(os.getenv(f"{prefix}_MAX_QUEUE_TIME", max_queue_time)),
+            max_share=float(os.getenv(f"{prefix}_MAX_SHARE", max_share)),
+        )
+
+    def record_queue_time(self, waited: float):
+        self.queue_time_ewma = waited if self.queue_time_ewma is None else self.queue_time_ewma * 0.9 + waited * 0.1
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 찼거나 대기 시간이 클래스 기한을 넘어 요청을 받지 않음"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """우선순위 클래스별 대기열을 둔 게이트웨이 입구 동시 처리 한도
+
+    한도에 여유가 있으면 바로 처리하고, 없으면 클래스별 대기열에서 기다립니다.
+    슬롯이 반환되면 우선순위가 높은 클래스의 대기 요청부터 처리합니다.
+    대기열이 가득 차면 429, 예상 대기 시간이나 실제 대기 시간이 클래스 기한을 넘으면 503으로 즉시 거절합니다.
+    """
+
+    def __init__(self, capacity: int, classes: List[AdmissionClass]):
+        self.capacity = capacity
+        self.classes = sorted(classes, key=lambda c: c.priority)
+        self._by_name = {c.name: c for c in self.classes}
+        self._queues: Dict[str, Deque[asyncio.Future]] = {c.name: deque() for c in self.classes}
+        self.in_flight = 0
+        # 슬롯 하나를 점유하는 평균 시간 (예상 대기 시간 계산용)
+        self.hold_time_ewma: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            capacity=int(os.getenv("ADMISSION_CONCURRENCY", "512")),
+            classes=[
+                AdmissionClass.from_env(CRITICAL, 0, max_queue=100, max_queue_time=1.0, max_share=1.1),
+                AdmissionClass.from_env(READ, 1, max_queue=500, max_queue_time=2.0, max_share=1.0),
+                AdmissionClass.from_env(DEFAULT, 2, max_queue=200, max_queue_time=5.0, max_share=1.0),
+                AdmissionClass.from_env(EXPENSIVE, 3, max_queue=20, max_queue_time=10.0, max_share=0.5),
+            ],
+        )
+
+    def get_class(self, name: str) -> AdmissionClass:
+        return self._by_name[name]
+
+    def _slots_for(self, admission_class: AdmissionClass) -> int:
+        return max(1, int(self.capacity * admission_class.max_share))
+
+    def _can_admit(self, admission_class: AdmissionClass) -> bool:
+        return self.in_flight < self._slots_for(admission_class)
+
+    def _waiting_ahead(self, admission_class: AdmissionClass) -> int:
+        """같거나 높은 우선순위 클래스에서 기다리는 요청 수"""
+        return sum(len(self._queues[c.name]) for c in self.classes if c.priority <= admission_class.priority)
+
+    def _admit(self, admission_class: AdmissionClass):
+        self.in_flight += 1
+        admission_class.in_flight += 1
+        admission_class.admitted += 1
+
+    def estimate_wait(self, admission_class: AdmissionClass) -> float:
+        """앞선 대기 요청이 모두 처리될 때까지의 예상 대기 시간(초)"""
+        if self.hold_time_ewma is None:
+            return 0.0
+        ahead = self._waiting_ahead(admission_class) + 1
+        return ahead * self.hold_time_ewma / self._slots_for(admission_class)
+
+    async def acquire(self, admission_class: AdmissionClass):
+        """처리 슬롯 획득 (거절 시 AdmissionRejected)"""
+        if self._can_admit(admission_class) and self._waiting_ahead(admission_class) == 0:
+            self._admit(admission_class)
+            return
+
+        queue = self._queues[admission_class.name]
+        if len(queue) >= admission_class.max_queue:
+            admission_class.rejected_queue_full += 1
+            raise AdmissionRejected(429, f"{admission_class.name} 요청 대기열이 가득 찼습니다")
+
+        estimate = self.estimate_wait(admission_class)
+        if estimate > admission_class.max_queue_time:
+            # 기다려도 기한 안에 처리되지 못할 요청은 대기열에 넣지 않고 바로 거절
+            admission_class.rejected_early += 1
+            raise AdmissionRejected(
+                503, f"{admission_class.name} 요청 예상 대기 시간 초과 ({estimate:.1f}초)", math.ceil(estimate)
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        admission_class.queued_total += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, admission_class.max_queue_time)
+        except asyncio.TimeoutError:
+            if not (future.done() and not future.cancelled()):
+                self._forget(queue, future)
+                admission_class.rejected_timeout += 1
+                raise AdmissionRejected(
+                    503, f"{admission_class.name} 요청 대기 시간 초과", math.ceil(admission_class.max_queue_time)
+                )
+            # 기한과 같은 시점에 슬롯을 받음 (거절하면 받은 슬롯이 반환되지 않으므로 그대로 처리)
+        except asyncio.CancelledError:
+            # 대기 중 클라이언트 연결 종료 (이미 슬롯을 받았다면 반환)
+            if future.done() and not future.cancelled():
+                self.release(admission_class, 0.0)
+            else:
+                self._forget(queue, future)
+            raise
+        task = asyncio.current_task()
+        if task is not None and task.cancelling():
+            # 슬롯을 받은 직후 취소됨 (wait_for가 취소 대신 결과를 돌려주는 버전) → 끊긴 요청에 슬롯을 남기지 않음
+            self.release(admission_class, 0.0)
+            raise asyncio.CancelledError()
+        admission_class.record_queue_time(time.monotonic() - started)
+
+    @staticmethod
+    def _forget(queue: Deque[asyncio.Future], future: asyncio.Future):
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+
+    def release(self, admission_class: AdmissionClass, held: float):
+        """슬롯 반환 후 우선순위가 높은 대기 요청부터 처리"""
+        self.in_flight = max(0, self.in_flight - 1)
+        admission_class.in_flight = max(0, admission_class.in_flight - 1)
+        if held > 0:
+            self.hold_time_ewma = held if self.hold_time_ewma is None else self.hold_time_ewma * 0.9 + held * 0.1
+        self._dispatch()
+
+    def _dispatch(self):
+        for admission_class in self.classes:
+            queue = self._queues[admission_class.name]
+            while queue and self._can_admit(admission_class):
+                future = queue.popleft()
+                if future.done():
+                    continue
+                self._admit(admission_class)
+                future.set_result(None)
+            if queue:
+                # 우선순위가 높은 클래스가 기다리는 동안 낮은 클래스는 처리하지 않음
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "hold_time_ewma": round(self.hold_time_ewma, 4) if self.hold_time_ewma is not None else None,
+            "classes": {
+                c.name: {
+                    "priority": c.priority,
+                    "slots": self._slots_for(c),
+                    "in_flight": c.in_flight,
+                    "queued": len(self._queues[c.name]),
+                    "max_queue": c.max_queue,
+                    "max_queue_time": c.max_queue_time,
+                    "admitted": c.admitted,
+                    "queued_total": c.queued_total,
+                    "rejected_queue_full": c.rejected_queue_full,
+                    "rejected_early": c.rejected_early,
+                    "rejected_timeout": c.rejected_timeout,
+                    "queue_time_ewma": round(c.queue_time_ewma, 4) if c.queue_time_ewma is not None else None,
+                }
+                for c in self.classes
+            },
+        }
+
+
+class AdmissionClassifier:
+    """요청 경로/메서드로 우선순위 클래스 결정
+
+    ADMISSION_CRITICAL_ROUTES, ADMISSION_EXPENSIVE_ROUTES에 'METHOD:경로' 패턴을 쉼표로 지정합니다.
+    나머지 요청은 읽기(GET/HEAD/OPTIONS)는 read, 그 외는 default입니다.
+    """
+
+    def __init__(self, critical_routes: List[str], expensive_routes: List[str]):
+        self.critical = RoutePatterns(critical_routes)
+        self.expensive = RoutePatterns(expensive_routes)
+
+    @classmethod
+    def from_env(cls) -> "AdmissionClassifier":
+        def routes(name: str, default: str) -> List[str]:
+            return os.getenv(name, default).split(",")
+
+        return cls(
+            critical_routes=routes("ADMISSION_CRITICAL_ROUTES", "*:e/v2/health,*:e/v2/health/*,GET:metrics,GET:.well-known/jwks.json"),
+            expensive_routes=routes("ADMISSION_EXPENSIVE_ROUTES", "POST:e/v2/news/search,POST:e/v2/aggregate,POST:e/v2/token/verify/batch"),
+        )
+
+    def classify(self, method: str, path: str) -> str:
+        if self.critical.matches(method, path):
+            return CRITICAL
+        if self.expensive.matches(method, path):
+            return EXPENSIVE
+        return READ if method in READ_METHODS else DEFAULT
+
+
+class AdmissionMiddleware:
+    """게이트웨이에 들어오는 모든 HTTP 요청에 입구 동시 처리 한도 적용 (응답 전송이 끝날 때 슬롯 반환)"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: Optional[AdmissionController] = None,
+        classifier: Optional[AdmissionClassifier] = None
+    ):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.classifier = classifier or AdmissionClassifier.from_env()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        admission_class = self.controller.get_class(self.classifier.classify(scope["method"], scope["path"]))
+        try:
+            await self.controller.acquire(admission_class)
+        except AdmissionRejected as e:
+            logger.warning(f"🚦 요청 거절 ({e.status_code}): {scope['method']} {scope['path']} - {e.detail}")
+            response = FastJSONResponse(
+                content={"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(max(1, e.retry_after))}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(admission_class, time.monotonic() - started)
+
+
+# ✅ 게이트웨이 전역 입구 동시 처리 한도 (ADMISSION_* 환경 변수)
+admission_controller = AdmissionController.from_env()
@@ -0,0 +1,290 @@
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import os
+import zlib
+
+# ✅ brotli가 설치되어 있으면 br도 협상 (없으면 gzip만 사용)
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+GZIP = "gzip"
+BR = "br"
+DEFLATE = "deflate"
+
+# 게이트웨이가 클라이언트용으로 압축할 수 있는 인코딩 (선호 순서)
+ENCODERS: Tuple[str, ...] = (BR, GZIP) if brotli is not None else (GZIP,)
+# 게이트웨이가 풀 수 있는 인코딩 (업스트림에 요청할 수 있는 인코딩)
+DECODABLE: Tuple[str, ...] = ENCODERS + (DEFLATE,)
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+})
+
+DEFAULT_LEVELS = {"application/json": 6, "text/html": 6}
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._coder = zlib.compressobj(min(max(level, 1), 9), zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._coder.compress(data)
+
+    def finish(self) -> bytes:
+        return self._coder.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._coder = brotli.Compressor(quality=min(max(level, 0), 11))
+
+    def process(self, data: bytes) -> bytes:
+        return self._coder.process(data)
+
+    def finish(self) -> bytes:
+        return self._coder.finish()
+
+
+class _Inflate:
+    def __init__(self, encoding: str):
+        # gzip은 헤더 자동 인식(47), deflate는 zlib 래핑 형식
+        self._coder = zlib.decompressobj(47 if encoding == GZIP else zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        return self._coder.decompress(data)
+
+    def finish(self) -> bytes:
+        return self._coder.flush()
+
+
+class _Unbrotli:
+    def __init__(self):
+        self._coder = brotli.Decompressor()
+
+    def process(self, data: bytes) -> bytes:
+        return self._coder.process(data)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+def _encoder(encoding: str, level: int):
+    return _Brotli(level) if encoding == BR else _Gzip(level)
+
+
+def _decoder(encoding: str):
+    return _Unbrotli() if encoding == BR else _Inflate(encoding)
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    """Content-Encoding(gzip/deflate/br)으로 압축된 본문 전체를 풉니다"""
+    decoder = _decoder(encoding)
+    return decoder.process(body) + decoder.finish()
+
+
+def weaken_etag(headers: MutableHeaders):
+    """본문 바이트를 바꿔 전달할 때 업스트림의 강한 ETag를 약한 ETag(W/)로 변경
+
+    변환한 본문은 업스트림 표현과 바이트 단위로 같지 않으므로 강한 검증자를 그대로 두면 안 됩니다.
+    약한 ETag로 보낸 If-None-Match도 업스트림의 약한 비교로 그대로 재검증됩니다.
+    """
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+
+def parse_accept_encoding(value: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding 헤더 → {인코딩: q값} (q=0은 제외)"""
+    accepted: Dict[str, float] = {}
+    if not value:
+        return accepted
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[name] = q
+    return accepted
+
+
+def negotiate(accepted: Dict[str, float]) -> Optional[str]:
+    """클라이언트가 받을 수 있는 인코딩 중 q값이 가장 높은 것 (같으면 br 우선)"""
+    best, best_q = None, 0.0
+    for encoding in ENCODERS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def upstream_accept_encoding(requested: str) -> str:
+    """업스트림에 보낼 Accept-Encoding (게이트웨이가 풀 수 있는 인코딩만 남김)"""
+    encodings = [e.strip().lower() for e in requested.split(",") if e.strip().lower() in DECODABLE]
+    return ", ".join(encodings) if encodings else "identity"
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def parse_levels(value: Optional[str]) -> Dict[str, int]:
+    """'application/json=6,text/html=5' 형식의 콘텐츠 타입별 압축 레벨"""
+    if not value:
+        return dict(DEFAULT_LEVELS)
+    levels: Dict[str, int] = {}
+    for item in value.split(","):
+        media_type, _, level = item.partition("=")
+        if media_type.strip() and level.strip():
+            levels[media_type.strip().lower()] = int(level)
+    return levels
+
+
+class CompressionMiddleware:
+    """응답 압축 협상 미들웨어
+
+    - 압축되지 않은 응답: minimum_size 이상이고 압축할 만한 콘텐츠면 클라이언트가 받는 인코딩(br/gzip)으로 압축
+    - 이미 압축된 응답(업스트림 gzip 등): 클라이언트가 같은 인코딩을 받으면 바이트를 그대로 전달하고,
+      받지 못하면 스트리밍으로 풀어서 (가능하면 다른 인코딩으로 다시 압축해) 전달
+
+    압축 레벨은 콘텐츠 타입별로 지정하며, 같은 값을 gzip level(1~9)과 brotli quality(0~11)로 사용합니다.
+    압축하거나 풀어서 전달하는 응답의 강한 ETag는 약한 ETag(W/)로 바꿉니다 (그대로 전달하는 응답은 유지).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        levels: Optional[Dict[str, int]] = None,
+        default_level: Optional[int] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+        self.levels = levels if levels is not None else parse_levels(os.getenv("COMPRESSION_LEVELS"))
+        self.default_level = default_level if default_level is not None else int(os.getenv("COMPRESSION_DEFAULT_LEVEL", "5"))
+
+    def level_for(self, content_type: str) -> int:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type in self.levels:
+            return self.levels[media_type]
+        return self.levels.get(media_type.split("/", 1)[0] + "/*", self.default_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = parse_accept_encoding(Headers(scope=scope).get("accept-encoding"))
+        responder = _CompressionResponder(self, accepted, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """응답 시작 메시지를 첫 본문 청크까지 보류했다가 압축/해제/그대로 전달 중 하나로 결정"""
+
+    def __init__(self, middleware: CompressionMiddleware, accepted: Dict[str, float], send: Send):
+        self.middleware = middleware
+        self.accepted = accepted
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.decided = False
+        # (decoder, encoder): 둘 다 None이면 그대로 전달
+        self.decoder = None
+        self.encoder = None
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.decided:
+            self.decided = True
+            headers = MutableHeaders(raw=list(self.start_message["headers"]))
+            self._decide(headers, body, more_body)
+            if (self.decoder is not None or self.encoder is not None) and not more_body:
+                # 본문이 한 번에 온 경우 변환 결과 길이로 Content-Length 지정
+                body = self._transform(body, final=True)
+                headers["content-length"] = str(len(body))
+                self.decoder = self.encoder = None
+                message = {"type": "http.response.body", "body": body, "more_body": False}
+            self.start_message["headers"] = headers.raw
+            await self._send(self.start_message)
+
+        if self.decoder is None and self.encoder is None:
+            await self._send(message)
+            return
+
+        chunk = self._transform(body, final=not more_body)
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _transform(self, body: bytes, final: bool) -> bytes:
+        data = body
+        if self.decoder is not None:
+            data = self.decoder.process(data) + (self.decoder.finish() if final else b"")
+        if self.encoder is not None:
+            data = self.encoder.process(data) + (self.encoder.finish() if final else b"")
+        return data
+
+    def _decide(self, headers: MutableHeaders, body: bytes, more_body: bool):
+        status = self.start_message["status"]
+        if status < 200 or status in (204, 304) or "no-transform" in headers.get("cache-control", ""):
+            return
+
+        content_type = headers.get("content-type", "")
+        compressible = is_compressible(content_type)
+        current = headers.get("content-encoding", "").strip().lower()
+        target = negotiate(self.accepted) if compressible else None
+
+        if current and current != "identity":
+            if current in self.accepted or current not in DECODABLE or (current == BR and brotli is None):
+                # ✅ 클라이언트와 업스트림 인코딩이 같으면 압축된 바이트 그대로 전달
+                return
+            self.decoder = _decoder(current)
+        else:
+            if target is None:
+                if compressible:
+                    headers.add_vary_header("Accept-Encoding")
+                return
+            content_length = headers.get("content-length")
+            size = int(content_length) if content_length and content_length.isdigit() else None
+            if (size is not None and size < self.middleware.minimum_size) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                headers.add_vary_header("Accept-Encoding")
+                return
+
+        if target is not None:
+            self.encoder = _encoder(target, self.middleware.level_for(content_type))
+            headers["content-encoding"] = target
+        else:
+            del headers["content-encoding"]
+        if "content-length" in headers:
+            del headers["content-length"]
+        weaken_etag(headers)
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
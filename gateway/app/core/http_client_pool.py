@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional, Any, Tuple
+import importlib.util
+import logging
+import httpx
+
+from app.domain.model.service_type import ServiceType
+from app.domain.model.upstream_config_model import UpstreamClientConfig, load_upstream_client_config
+
+logger = logging.getLogger("gateway_api")
+
+# h2 패키지가 있을 때만 HTTP/2 사용 가능
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ServiceClientPool:
+    """ServiceType별로 하나의 장기 실행 httpx.AsyncClient를 관리하는 풀
+
+    lifespan에서 start()/close()를 호출하며, 프록시 요청은 매번 새 클라이언트를
+    만들지 않고 여기서 꺼낸 클라이언트의 keep-alive 커넥션을 재사용합니다.
+    Unix 도메인 소켓 인스턴스(unix://)는 소켓 경로마다 별도 클라이언트를 둡니다.
+    """
+
+    def __init__(
+        self,
+        configs: Optional[Dict[ServiceType, UpstreamClientConfig]] = None,
+        transports: Optional[Dict[ServiceType, httpx.AsyncBaseTransport]] = None
+    ):
+        self._configs: Dict[ServiceType, UpstreamClientConfig] = dict(configs or {})
+        # 서비스별 전송 계층 교체용 (벤치마크의 가짜 업스트림 등)
+        self._transports: Dict[ServiceType, httpx.AsyncBaseTransport] = dict(transports or {})
+        self._clients: Dict[ServiceType, httpx.AsyncClient] = {}
+        self._socket_clients: Dict[Tuple[ServiceType, str], httpx.AsyncClient] = {}
+        self._pool_usage_warned = False
+
+    def config_for(self, service_type: ServiceType) -> UpstreamClientConfig:
+        """서비스 설정 조회 (없으면 환경 변수에서 로드)"""
+        if service_type not in self._configs:
+            self._configs[service_type] = load_upstream_client_config(service_type)
+        return self._configs[service_type]
+
+    def _create_client(self, service_type: ServiceType, socket_path: Optional[str] = None) -> httpx.AsyncClient:
+        config = self.config_for(service_type)
+        http2 = config.http2 and HTTP2_AVAILABLE
+        if config.http2 and not HTTP2_AVAILABLE:
+            logger.warning(f"⚠️ {service_type.value}: h2 패키지가 없어 HTTP/1.1로 동작합니다.")
+
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        transport = self._transports.get(service_type)
+        if transport is None and socket_path:
+            # ✅ 같은 호스트의 서비스는 TCP 대신 Unix 도메인 소켓으로 연결
+            transport = httpx.AsyncHTTPTransport(uds=socket_path, http2=http2, limits=limits)
+            logger.info(f"🔌 {service_type.value}: Unix 소켓 클라이언트 생성 ({socket_path})")
+
+        return httpx.AsyncClient(
+            http2=http2,
+            transport=transport,
+            limits=limits,
+            timeout=httpx.Timeout(
+                connect=config.connect_timeout,
+                read=config.read_timeout,
+                write=config.write_timeout,
+                pool=config.pool_timeout,
+            ),
+        )
+
+    async def start(self):
+        """모든 서비스 클라이언트 생성"""
+        for service_type in ServiceType:
+            if service_type not in self._clients:
+                self._clients[service_type] = self._create_client(service_type)
+        logger.info(f"🔌 업스트림 클라이언트 풀 생성: {[s.value for s in self._clients]}")
+
+    async def close(self):
+        """모든 서비스 클라이언트 종료"""
+        clients = [(service_type, client) for service_type, client in self._clients.items()]
+        clients += [(service_type, client) for (service_type, _), client in self._socket_clients.items()]
+        for service_type, client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"❌ {service_type.value} 클라이언트 종료 실패: {e}")
+        self._clients.clear()
+        self._socket_clients.clear()
+        logger.info("🔌 업스트림 클라이언트 풀 종료")
+
+    def get(self, service_type: ServiceType, socket_path: Optional[str] = None) -> httpx.AsyncClient:
+        """서비스 클라이언트 조회 (start() 전이면 필요할 때 생성, socket_path가 있으면 그 소켓 전용 클라이언트)"""
+        if socket_path:
+            key = (service_type, socket_path)
+            client = self._socket_clients.get(key)
+            if client is None or client.is_closed:
+                client = self._create_client(service_type, socket_path)
+                self._socket_clients[key] = client
+            return client
+
+        client = self._clients.get(service_type)
+        if client is None or client.is_closed:
+            client = self._create_client(service_type)
+            self._clients[service_type] = client
+        return client
+
+    def stats(self) -> Dict[str, Any]:
+        """서비스별 커넥션 풀 사용 현황"""
+        result: Dict[str, Any] = {}
+        for service_type, client in self._clients.items():
+            config = self.config_for(service_type)
+            sockets = {path: c for (s, path), c in self._socket_clients.items() if s == service_type}
+            result[service_type.value] = {
+                **self._pool_usage([client, *sockets.values()]),
+                "max_connections": config.max_connections,
+                "max_keepalive_connections": config.max_keepalive_connections,
+                "http2": config.http2 and HTTP2_AVAILABLE,
+                "unix_sockets": sorted(sockets),
+            }
+        return result
+
+    def _pool_usage(self, clients: List[httpx.AsyncClient]) -> Dict[str, Any]:
+        """TCP 클라이언트와 소켓별 클라이언트의 커넥션을 합산
+
+        httpx는 풀 상태를 공개하지 않으므로 httpcore 풀의 내부 속성을 조회합니다.
+        httpcore 버전이 바뀌어 속성이 없거나 형태가 다르면 "unknown"으로 표시합니다 (메트릭 게이지는 생략됨).
+        """
+        try:
+            connections = []
+            requests = []
+            for pool_client in clients:
+                pool = pool_client._transport._pool
+                connections.extend(pool.connections)
+                requests.extend(pool._requests)
+            idle = sum(1 for conn in connections if conn.is_idle())
+            return {
+                "connections": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+                "in_flight_requests": len(requests),
+                "queued_requests": sum(1 for req in requests if req.is_queued()),
+            }
+        except Exception as e:
+            if not self._pool_usage_warned:
+                self._pool_usage_warned = True
+                logger.warning(f"⚠️ httpcore 커넥션 풀 상태를 읽을 수 없습니다 (httpcore 버전 확인 필요): {e}")
+            return {"pool": "unknown"}
+
+
+# ✅ 게이트웨이 전역 클라이언트 풀 (lifespan에서 start/close)
+client_pool = ServiceClientPool()
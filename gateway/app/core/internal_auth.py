@@ -0,0 +1,63 @@
+"""
+내부 작업 전용 엔드포인트 인증 (공유 API 키)
+
+토큰 일괄 검증처럼 사용자에게 공개하지 않는 엔드포인트는 X-Internal-Api-Key 헤더의 키가
+환경 변수에 등록된 키 중 하나와 같을 때만 허용합니다.
+- 키는 쉼표로 여러 개 지정 가능 (교체 중에는 새 키와 이전 키를 함께 등록)
+- 키가 하나도 설정되지 않았으면 엔드포인트를 사용할 수 없음 (기본값으로 열리지 않음)
+"""
+from typing import Callable, List, Optional, Sequence
+from fastapi import HTTPException, Request, status
+import hmac
+import logging
+import os
+
+logger = logging.getLogger("gateway_api")
+
+INTERNAL_API_KEY_HEADER = "x-internal-api-key"
+
+
+class InternalApiKeys:
+    """등록된 내부 API 키 목록 (비교는 상수 시간)"""
+
+    def __init__(self, keys: Sequence[str] = ()):
+        self.keys: List[bytes] = [key.encode("utf-8") for key in keys if key]
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, name: str) -> "InternalApiKeys":
+        return cls([key.strip() for key in os.getenv(name, "").split(",")])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.keys)
+
+    def matches(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        candidate = key.encode("utf-8")
+        # 어느 키와 일치하든 모든 키와 비교 (일치한 위치가 응답 시간에 드러나지 않게)
+        matched = False
+        for registered in self.keys:
+            matched |= hmac.compare_digest(candidate, registered)
+        return matched
+
+
+def internal_api_key(keys: InternalApiKeys) -> Callable[[Request], None]:
+    """FastAPI 의존성 생성: X-Internal-Api-Key가 등록된 키가 아니면 거절
+
+        @router.post("/token/verify/batch", dependencies=[Depends(internal_api_key(token_batch_keys))])
+    """
+    async def dependency(request: Request):
+        if not keys.enabled:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="내부 API 키가 설정되지 않아 사용할 수 없습니다")
+        if not keys.matches(request.headers.get(INTERNAL_API_KEY_HEADER)):
+            keys.rejected += 1
+            logger.warning(f"🚫 내부 API 키 불일치: {request.method} {request.url.path}")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="내부 API 키가 올바르지 않습니다")
+
+    return dependency
+
+
+# ✅ 토큰 일괄 검증용 내부 API 키 (TOKEN_BATCH_API_KEYS, 쉼표로 구분)
+token_batch_keys = InternalApiKeys.from_env("TOKEN_BATCH_API_KEYS")
@@ -0,0 +1,49 @@
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+import json
+
+# ✅ orjson이 설치되어 있으면 사용 (없으면 표준 json으로 동작)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """게이트웨이가 직접 만드는 JSON 직렬화 (UTF-8 바이트, 공백 없음)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """JSON 파싱 (bytes/str 모두 허용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def is_well_formed(data: bytes) -> bool:
+    """JSON 형식 검사 (객체로 변환한 결과는 버리고 본문은 원본 바이트 그대로 전달)"""
+    try:
+        loads(data)
+    except ValueError:
+        return False
+    return True
+
+
+def is_json_content_type(content_type: Optional[str]) -> bool:
+    """application/json 또는 application/*+json 여부"""
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or (media_type.startswith("application/") and media_type.endswith("+json"))
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 JSONResponse (게이트웨이 기본 응답 클래스)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
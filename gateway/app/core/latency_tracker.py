@@ -0,0 +1,39 @@
+from typing import List, Optional
+import math
+
+
+class LatencyTracker:
+    """최근 응답 지연 시간 표본(고정 크기 링 버퍼)과 백분위 계산
+
+    백분위는 표본이 refresh_every개 쌓일 때마다 다시 계산해 두고,
+    그 사이에는 캐시된 값을 돌려주므로 요청마다 정렬하지 않습니다.
+    """
+
+    def __init__(self, size: int = 256, refresh_every: int = 32):
+        self._samples: List[float] = [0.0] * size
+        self._size = size
+        self._count = 0
+        self._index = 0
+        self._refresh_every = refresh_every
+        self._since_refresh = 0
+        self._sorted: List[float] = []
+
+    def record(self, latency: float):
+        self._samples[self._index] = latency
+        self._index = (self._index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        self._since_refresh += 1
+        if self._since_refresh >= self._refresh_every or len(self._sorted) < min(self._count, self._refresh_every):
+            self._sorted = sorted(self._samples[:self._count])
+            self._since_refresh = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p 백분위 지연 시간(초), 표본이 없으면 None"""
+        if not self._sorted:
+            return None
+        rank = min(len(self._sorted) - 1, max(0, math.ceil(p / 100 * len(self._sorted)) - 1))
+        return self._sorted[rank]
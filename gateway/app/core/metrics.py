@@ -0,0 +1,443 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import asyncio
+import glob
+import logging
+import os
+import time
+
+from app.core import json_codec
+from app.domain.model.service_type import ServiceType
+
+logger = logging.getLogger("gateway_api")
+
+# ✅ 지연 시간 히스토그램 버킷(초) - 라벨 조합마다 한 번만 배열을 만들고 이후에는 카운트만 증가
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+# 경로의 {service} 값 중 라벨로 쓰는 값 (그 외 값은 "-"로 묶어 라벨 수가 늘지 않게 함)
+SERVICE_LABELS = frozenset(service_type.value for service_type in ServiceType)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (버킷별 개수, 합계, 전체 개수)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class HistogramFamily:
+    """라벨 값 조합별 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.bounds = bounds
+        self.children: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, *values: str) -> Histogram:
+        child = self.children.get(values)
+        if child is None:
+            child = Histogram(self.bounds)
+            self.children[values] = child
+        return child
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for values, child in self.children.items():
+            labels = _labels(self.label_names, values)
+            cumulative = 0
+            for bound, count in zip(self.bounds, child.counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {child.count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {child.sum}")
+            lines.append(f"{self.name}_count{{{labels}}} {child.count}")
+
+    def snapshot(self) -> List[list]:
+        return [[list(values), child.counts, child.sum, child.count] for values, child in self.children.items()]
+
+    def merge(self, items: List[list]):
+        for values, counts, total, count in items:
+            child = self.labels(*values)
+            for index, value in enumerate(counts):
+                child.counts[index] += value
+            child.sum += total
+            child.count += count
+
+
+class CounterFamily:
+    """라벨 값 조합별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.children: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, values: Tuple[str, ...], amount: float = 1.0):
+        self.children[values] = self.children.get(values, 0.0) + amount
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} counter")
+        for values, value in self.children.items():
+            lines.append(f"{self.name}{{{_labels(self.label_names, values)}}} {value}")
+
+    def snapshot(self) -> List[list]:
+        return [[list(values), value] for values, value in self.children.items()]
+
+    def merge(self, items: List[list]):
+        for values, value in items:
+            self.inc(tuple(values), value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+class RequestTimer:
+    """요청 하나가 업스트림 응답(헤더)을 기다린 시간 누적"""
+
+    __slots__ = ("upstream_wait",)
+
+    def __init__(self):
+        self.upstream_wait = 0.0
+
+
+# 현재 처리 중인 요청의 타이머 (ServiceProxyFactory가 업스트림 대기 시간을 더함)
+current_request: ContextVar[Optional[RequestTimer]] = ContextVar("gateway_current_request", default=None)
+
+
+class GatewayMetrics:
+    """게이트웨이 메트릭 모음 (Prometheus text format 0.0.4로 출력)"""
+
+    def __init__(self):
+        self.requests = CounterFamily(
+            "gateway_requests_total", "게이트웨이 요청 수", ("route", "service", "method", "status")
+        )
+        self.request_duration = HistogramFamily(
+            "gateway_request_duration_seconds", "요청 수신부터 응답 전송 완료까지의 시간", ("route", "service")
+        )
+        self.gateway_duration = HistogramFamily(
+            "gateway_self_duration_seconds", "요청 처리 시간 중 업스트림 응답 대기를 뺀 게이트웨이 자체 시간", ("route", "service")
+        )
+        self.upstream_duration = HistogramFamily(
+            "gateway_upstream_duration_seconds", "업스트림 호출부터 응답 헤더 수신까지의 시간", ("service", "outcome")
+        )
+        self.bytes_received = CounterFamily(
+            "gateway_request_bytes_total", "클라이언트로부터 받은 요청 본문 바이트", ("route", "service")
+        )
+        self.bytes_sent = CounterFamily(
+            "gateway_response_bytes_total", "클라이언트로 보낸 응답 본문 바이트", ("route", "service")
+        )
+        self.in_flight = 0
+
+    def observe_upstream(self, service: str, seconds: float, ok: bool):
+        self.upstream_duration.labels(service, "ok" if ok else "error").observe(seconds)
+        timer = current_request.get()
+        if timer is not None:
+            timer.upstream_wait += seconds
+
+    def families(self) -> Dict[str, Any]:
+        return {
+            family.name: family
+            for family in (
+                self.requests,
+                self.request_duration,
+                self.gateway_duration,
+                self.upstream_duration,
+                self.bytes_received,
+                self.bytes_sent,
+            )
+        }
+
+    def snapshot(self, pool_stats: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """워커 간 합산용 현재 값 (JSON 직렬화 가능)"""
+        return {
+            "in_flight": self.in_flight,
+            "families": {name: family.snapshot() for name, family in self.families().items()},
+            "pool": pool_stats or {},
+        }
+
+    def merge(self, snapshot: Dict[str, Any], live: bool = True):
+        """다른 워커의 스냅샷을 더함 (live=False면 종료된 워커로 보고 게이지는 제외)"""
+        families = self.families()
+        for name, items in snapshot.get("families", {}).items():
+            family = families.get(name)
+            if family is not None:
+                family.merge(items)
+        if live:
+            self.in_flight += snapshot.get("in_flight", 0)
+
+    def render(self, pool_stats: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        lines: List[str] = [
+            "# HELP gateway_in_flight_requests 처리 중인 요청 수",
+            "# TYPE gateway_in_flight_requests gauge",
+            f"gateway_in_flight_requests {self.in_flight}",
+        ]
+        for family in self.families().values():
+            family.render(lines)
+
+        if pool_stats:
+            for key, help_text in (
+                ("connections", "업스트림 커넥션 수"),
+                ("active", "요청을 처리 중인 업스트림 커넥션 수"),
+                ("idle", "유휴 업스트림 커넥션 수"),
+                ("queued_requests", "커넥션을 기다리는 업스트림 요청 수"),
+                ("max_connections", "업스트림 커넥션 풀 최대 크기"),
+            ):
+                name = f"gateway_upstream_pool_{key}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                for service, stats in pool_stats.items():
+                    if key in stats:
+                        lines.append(f'{name}{{service="{_escape(service)}"}} {stats[key]}')
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _status_class(status: int) -> str:
+    return STATUS_CLASSES[status // 100 - 1] if 100 <= status < 600 else "other"
+
+
+class MetricsMiddleware:
+    """요청 수, 처리 시간(전체/게이트웨이 자체), 송수신 바이트, 처리 중 요청 수 기록
+
+    라벨은 매칭된 라우트 템플릿과 경로의 {service} 값만 사용해 라벨 조합 수가 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Optional[GatewayMetrics] = None):
+        self.app = app
+        self.metrics = metrics or gateway_metrics
+        # 엔드포인트 → 라우트 템플릿 (add_route로 등록한 ASGI 앱은 scope에 route가 없어 라우트 목록에서 찾음)
+        self._route_paths: Dict[int, str] = {}
+
+    def _route_label(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        label = self._route_paths.get(id(endpoint))
+        if label is None:
+            router = getattr(scope.get("app"), "router", None)
+            label = next(
+                (r.path for r in getattr(router, "routes", ()) if getattr(r, "endpoint", None) is endpoint),
+                "unmatched"
+            )
+            self._route_paths[id(endpoint)] = label
+        return label
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        timer = RequestTimer()
+        token = current_request.set(timer)
+        counts = [0, 0, 500]  # 받은 바이트, 보낸 바이트, 상태 코드
+
+        async def counting_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                counts[0] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message):
+            if message["type"] == "http.response.start":
+                counts[2] = message["status"]
+            elif message["type"] == "http.response.body":
+                counts[1] += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            current_request.reset(token)
+
+            route_label = self._route_label(scope)
+            service = (scope.get("path_params") or {}).get("service", "-")
+            if service not in SERVICE_LABELS:
+                service = "-"
+            labels = (route_label, service)
+            metrics.requests.inc((route_label, service, scope["method"], _status_class(counts[2])))
+            metrics.request_duration.labels(*labels).observe(elapsed)
+            metrics.gateway_duration.labels(*labels).observe(max(0.0, elapsed - timer.upstream_wait))
+            metrics.bytes_received.inc(labels, counts[0])
+            metrics.bytes_sent.inc(labels, counts[1])
+
+
+ARCHIVE_FILE = "archive.json"
+# archive.json에 남겨 두는 최근 종료 워커 id 수 (합산 중 워커 파일과 아카이브를 이중으로 세지 않기 위함)
+ARCHIVED_IDS_KEPT = 64
+
+
+def _read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            return json_codec.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path: str, snapshot: Dict[str, Any]):
+    # 같은 디렉터리에 쓴 뒤 교체해 다른 워커가 반쯤 쓰인 파일을 읽지 않게 함
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json_codec.dumps(snapshot))
+    os.replace(tmp_path, path)
+
+
+def _merge_pool_stats(pools: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    merged: Dict[str, Dict[str, Any]] = {}
+    for pool in pools:
+        for service, stats in pool.items():
+            target = merged.setdefault(service, {})
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    target[key] = target.get(key, 0) + value
+    return merged
+
+
+def archive_worker_metrics(directory: str, pid: int):
+    """종료된 워커의 스냅샷을 archive.json에 누적하고 워커 파일 삭제 (gunicorn 마스터의 child_exit에서 호출)
+
+    워커가 재시작(max_requests)되어도 카운터와 히스토그램이 줄어들지 않게 합니다.
+    """
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    for path in glob.glob(os.path.join(directory, f"worker_{pid}_*.json")):
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            merged = GatewayMetrics()
+            archive = _read_snapshot(archive_path) or {}
+            merged.merge(archive, live=False)
+            merged.merge(snapshot, live=False)
+            worker_id = os.path.basename(path)[len("worker_"):-len(".json")]
+            result = merged.snapshot()
+            result["archived"] = (archive.get("archived", []) + [worker_id])[-ARCHIVED_IDS_KEPT:]
+            # 아카이브를 먼저 교체하고 워커 파일을 지워 합산 중에 값이 빠지지 않게 함
+            _write_snapshot(archive_path, result)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MultiprocessMetrics:
+    """pre-fork 워커별 메트릭을 공유 디렉터리에 기록하고 /metrics에서 모든 워커 값을 합산
+
+    각 워커는 METRICS_FLUSH_INTERVAL초마다(와 종료 시) worker_<pid>_<시작 시각>.json을 갱신하고,
+    /metrics를 받은 워커는 자신의 값을 먼저 기록한 뒤 디렉터리의 스냅샷을 모두 더해 출력합니다.
+    처리 중 요청 수와 커넥션 풀 게이지는 살아 있는 워커 값만 더합니다.
+    """
+
+    def __init__(self, directory: str, metrics: GatewayMetrics, interval: float = 5.0):
+        self.directory = directory
+        self.metrics = metrics
+        self.interval = interval
+        self._worker_id: Optional[str] = None
+        self._worker_pid: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, metrics: GatewayMetrics) -> Optional["MultiprocessMetrics"]:
+        directory = os.getenv("METRICS_MULTIPROC_DIR")
+        if not directory:
+            return None
+        return cls(directory, metrics, float(os.getenv("METRICS_FLUSH_INTERVAL", "5")))
+
+    @property
+    def path(self) -> str:
+        # fork된 워커마다 새 id (pid가 재사용되어도 이전 워커 파일과 겹치지 않게 시작 시각을 붙임)
+        pid = os.getpid()
+        if self._worker_pid != pid:
+            self._worker_pid = pid
+            self._worker_id = f"{pid}_{time.time_ns()}"
+        return os.path.join(self.directory, f"worker_{self._worker_id}.json")
+
+    def write(self, pool_stats: Optional[Dict[str, Dict[str, Any]]] = None):
+        os.makedirs(self.directory, exist_ok=True)
+        _write_snapshot(self.path, self.metrics.snapshot(pool_stats))
+
+    def start(self, pool_stats: Callable[[], Dict[str, Dict[str, Any]]]):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(pool_stats))
+            logger.info(f"📊 워커 메트릭 공유 시작 - {self.directory} ({self.interval}초 주기)")
+
+    async def _run(self, pool_stats: Callable[[], Dict[str, Dict[str, Any]]]):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.write(pool_stats())
+            except OSError as e:
+                logger.warning(f"⚠️ 워커 메트릭 기록 실패: {e}")
+
+    async def stop(self, pool_stats: Optional[Dict[str, Dict[str, Any]]] = None):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            self.write(pool_stats)
+        except OSError as e:
+            logger.warning(f"⚠️ 워커 메트릭 기록 실패: {e}")
+
+    def render(self, pool_stats: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        try:
+            self.write(pool_stats)
+        except OSError as e:
+            logger.warning(f"⚠️ 워커 메트릭 기록 실패: {e}")
+        # 워커 파일을 먼저 읽고 아카이브를 나중에 읽음 (그 사이 아카이브된 워커는 아카이브 값만 사용)
+        workers = {}
+        for path in glob.glob(os.path.join(self.directory, "worker_*.json")):
+            snapshot = _read_snapshot(path)
+            if snapshot is not None:
+                workers[os.path.basename(path)[len("worker_"):-len(".json")]] = snapshot
+        archive = _read_snapshot(os.path.join(self.directory, ARCHIVE_FILE)) or {}
+        archived = set(archive.get("archived", []))
+
+        merged = GatewayMetrics()
+        merged.merge(archive, live=False)
+        pools = []
+        for worker_id, snapshot in workers.items():
+            if worker_id in archived:
+                continue
+            merged.merge(snapshot)
+            pools.append(snapshot.get("pool") or {})
+        return merged.render(_merge_pool_stats(pools))
+
+
+# ✅ 게이트웨이 전역 메트릭
+gateway_metrics = GatewayMetrics()
+
+# ✅ pre-fork 워커 간 메트릭 합산 (METRICS_MULTIPROC_DIR이 없으면 None, 단일 프로세스 값만 출력)
+gateway_metrics_store = MultiprocessMetrics.from_env(gateway_metrics)
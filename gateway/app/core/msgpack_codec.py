@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import logging
+
+from app.core import json_codec
+from app.core.compression import DECODABLE, decompress, weaken_etag
+
+logger = logging.getLogger("gateway_api")
+
+# ✅ msgpack이 설치되어 있으면 게이트웨이-서비스 구간에 MessagePack 사용 가능 (없으면 JSON만 사용)
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+MSGPACK_AVAILABLE = msgpack is not None
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset({"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"})
+
+# 업스트림에 보내는 Accept (msgpack 우선, 지원하지 않는 서비스는 JSON으로 응답)
+UPSTREAM_ACCEPT = "application/msgpack, application/json;q=0.9"
+
+
+def _media_type(content_type: Optional[str]) -> str:
+    return content_type.split(";", 1)[0].strip().lower() if content_type else ""
+
+
+def is_msgpack_content_type(content_type: Optional[str]) -> bool:
+    return _media_type(content_type) in MSGPACK_MEDIA_TYPES
+
+
+def parse_accept(value: Optional[str]) -> Dict[str, float]:
+    """Accept 헤더 → {미디어 타입: q값}"""
+    accepted: Dict[str, float] = {}
+    if not value:
+        return accepted
+    for item in value.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        accepted[media_type] = q
+    return accepted
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """클라이언트가 msgpack을 명시했고 JSON보다 낮게 두지 않았는지 (*/*만으로는 msgpack을 보내지 않음)"""
+    accepted = parse_accept(accept)
+    msgpack_q = max((accepted.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES), default=0.0)
+    if msgpack_q <= 0:
+        return False
+    json_q = accepted.get("application/json", accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return msgpack_q >= json_q
+
+
+def packb(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def decode_body(content_type: Optional[str], content: bytes) -> Any:
+    """응답 본문을 Content-Type에 따라 msgpack 또는 JSON으로 파싱 (ValueError: 형식 오류)"""
+    if is_msgpack_content_type(content_type):
+        if msgpack is None:
+            raise ValueError("msgpack 응답을 풀 수 없습니다 (msgpack 미설치)")
+        try:
+            return unpackb(content)
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, TypeError) as e:
+            raise ValueError(f"잘못된 msgpack 본문: {e}") from e
+    return json_codec.loads(content)
+
+
+class MsgpackTranscodeMiddleware:
+    """업스트림 msgpack 응답을 msgpack을 받지 않는 클라이언트에게는 JSON으로 변환해 전달
+
+    msgpack을 받는 클라이언트(Accept에 application/msgpack 명시)에게는 바이트를 그대로 전달합니다.
+    변환 시에는 본문 전체를 모은 뒤 (압축되어 있으면 풀고) JSON으로 한 번 직렬화하며,
+    클라이언트용 압축은 바깥의 CompressionMiddleware가 다시 적용합니다.
+    변환한 본문은 업스트림 바이트와 다르므로 강한 ETag는 약한 ETag(W/)로 바꿉니다.
+
+    주의: 변환 경로는 업스트림 응답 전체를 메모리에 버퍼링하므로, upstream_msgpack을 켠 서비스는
+    msgpack을 받지 않는 클라이언트에 대해 응답 스트리밍(청크를 받는 대로 전달)이 동작하지 않습니다.
+    응답이 크거나 점진적으로 전달해야 하는 서비스에는 upstream_msgpack을 켜지 마세요.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or msgpack is None or accepts_msgpack(Headers(scope=scope).get("accept")):
+            await self.app(scope, receive, send)
+            return
+        responder = _TranscodeResponder(send)
+        await self.app(scope, receive, responder.send)
+
+
+class _TranscodeResponder:
+    """msgpack 응답이면 본문을 모아 JSON으로 변환하고, 아니면 그대로 전달"""
+
+    def __init__(self, send: Send):
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.transcoding = False
+        self.chunks: List[bytes] = []
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            encoding = headers.get("content-encoding", "").strip().lower()
+            if is_msgpack_content_type(headers.get("content-type")) and (not encoding or encoding == "identity" or encoding in DECODABLE):
+                self.transcoding = True
+                self.start_message = message
+                return
+            await self._send(message)
+            return
+        if not self.transcoding or message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        body = b"".join(self.chunks)
+        encoding = headers.get("content-encoding", "").strip().lower()
+        try:
+            if encoding and encoding != "identity":
+                body = decompress(body, encoding)
+                del headers["content-encoding"]
+            body = json_codec.dumps(unpackb(body))
+            headers["content-type"] = "application/json"
+            weaken_etag(headers)
+        except Exception as e:
+            # 변환할 수 없는 본문은 받은 그대로 전달
+            logger.warning(f"⚠️ msgpack → JSON 변환 실패, 원본 전달: {e}")
+            body = b"".join(self.chunks)
+            headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["content-length"] = str(len(body))
+        if "accept" not in [v.strip().lower() for v in headers.get("vary", "").split(",")]:
+            headers.add_vary_header("Accept")
+        self.start_message["headers"] = headers.raw
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
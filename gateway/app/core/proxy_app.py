@@ -0,0 +1,287 @@
+from typing import Dict, Optional, Set
+from fastapi import Response
+from starlette.types import Receive, Scope, Send
+import asyncio
+import logging
+import time
+
+from app.core.http_client_pool import ServiceClientPool
+from app.core.json_codec import FastJSONResponse, is_json_content_type, is_well_formed
+from app.core.proxy_response import (
+    build_raw_response,
+    forward_request_headers,
+    forward_response_headers,
+    get_response_transform,
+    iter_request_body,
+    read_raw_body,
+    request_body_length,
+    RequestBodyTooLarge,
+    stream_upstream_response,
+)
+from app.core.response_cache import CacheKey, CachedResponse, ResponseCache, response_cache
+from app.core.single_flight import RoutePatterns, SingleFlight, request_key, single_flight
+from app.domain.model.service_proxy_factory import ServiceProxyFactory
+from app.domain.model.service_type import ServiceType
+
+logger = logging.getLogger("gateway_api")
+
+# ✅ 경로의 {service} 값 → ServiceType (요청마다 Enum 검증 대신 dict 조회)
+ROUTE_TABLE: Dict[str, ServiceType] = {service_type.value: service_type for service_type in ServiceType}
+
+
+async def read_body(receive: Receive, max_bytes: int = 0) -> bytes:
+    """요청 본문을 파싱 없이 raw 바이트로 읽습니다 (max_bytes를 넘으면 RequestBodyTooLarge)"""
+    return b"".join([chunk async for chunk in iter_request_body(receive, max_bytes)])
+
+
+def body_too_large(max_bytes: int) -> Response:
+    return FastJSONResponse(
+        content={"detail": f"요청 본문이 허용 크기({max_bytes} bytes)를 넘었습니다"},
+        status_code=413
+    )
+
+
+class GatewayProxyApp:
+    """/e/v2/{service}/{path} 요청을 메서드 구분 없이 업스트림으로 전달하는 raw ASGI 앱
+
+    FastAPI 의존성 해석, Enum 검증, Form/JSON 파싱을 거치지 않고
+    요청 본문은 raw 바이트로, 응답은 스트리밍으로 그대로 전달합니다.
+    """
+
+    def __init__(
+        self,
+        client_pool: Optional[ServiceClientPool] = None,
+        cache: Optional[ResponseCache] = None,
+        coalescer: Optional[SingleFlight] = None
+    ):
+        self.client_pool = client_pool
+        self.cache = cache or response_cache
+        self.coalescer = coalescer or single_flight
+        self._factories: Dict[ServiceType, ServiceProxyFactory] = {}
+        self._coalesce_routes: Dict[ServiceType, RoutePatterns] = {}
+        # 백그라운드 재검증 중인 캐시 키와 작업 (작업이 GC되지 않도록 참조 유지)
+        self._revalidating: Set[CacheKey] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def factory_for(self, service_type: ServiceType) -> ServiceProxyFactory:
+        """서비스별 프록시 팩토리 (최초 요청 시 한 번만 생성)"""
+        factory = self._factories.get(service_type)
+        if factory is None:
+            factory = ServiceProxyFactory(service_type=service_type, client_pool=self.client_pool)
+            self._factories[service_type] = factory
+        return factory
+
+    def coalesce_routes_for(self, service_type: ServiceType) -> RoutePatterns:
+        """서비스별 요청 병합 대상 라우트 (설정에서 한 번만 컴파일)"""
+        patterns = self._coalesce_routes.get(service_type)
+        if patterns is None:
+            patterns = RoutePatterns(self.factory_for(service_type).config.coalesce_routes)
+            self._coalesce_routes[service_type] = patterns
+        return patterns
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        path_params = scope["path_params"]
+        service_type = ROUTE_TABLE.get(path_params["service"])
+        if service_type is None:
+            response = FastJSONResponse(
+                content={"detail": f"지원하지 않는 서비스입니다: {path_params['service']}"},
+                status_code=404
+            )
+        else:
+            response = await self.relay(service_type, path_params["path"], scope, receive)
+        await response(scope, receive, send)
+
+    async def relay(self, service_type: ServiceType, path: str, scope: Scope, receive: Receive) -> Response:
+        """업스트림 응답 전달 (응답 변환이 등록된 서비스만 본문을 읽어 변환)"""
+        method = scope["method"]
+        logger.debug(f"🌈Received {method} request for service: {service_type.value}, path: {path}")
+
+        factory = self.factory_for(service_type)
+        headers = forward_request_headers(scope["headers"])
+        # 기한은 요청이 도착한 시점부터 계산 (본문 수신 시간도 예산에 포함)
+        deadline = factory.deadline_for(headers)
+        query = scope["query_string"].decode("latin-1")
+        config = factory.config
+
+        content_length, chunked = request_body_length(scope["headers"])
+        if config.max_body_bytes and content_length is not None and content_length > config.max_body_bytes:
+            return body_too_large(config.max_body_bytes)
+
+        cached = method == "GET" and config.cache_enabled
+        coalesced = self.coalesce_routes_for(service_type).matches(method, path)
+        validated = config.validate_json and is_json_content_type(headers.get("content-type"))
+        large = chunked or (content_length is not None and content_length > config.stream_upload_threshold)
+
+        if large and not (cached or coalesced or validated or factory.should_hedge(method, path)):
+            # ✅ 큰 업로드(파일 등)는 메모리/디스크에 모으지 않고 받은 청크를 그대로 업스트림에 전달
+            if content_length is not None:
+                headers["content-length"] = str(content_length)
+            body = iter_request_body(receive, config.max_body_bytes)
+        else:
+            try:
+                body = await read_body(receive, config.max_body_bytes) or None
+            except RequestBodyTooLarge:
+                return body_too_large(config.max_body_bytes)
+
+        # JSON 본문은 파싱/재직렬화 없이 원본 바이트 그대로 전달 (설정 시 형식만 검사)
+        if body and validated and not is_well_formed(body):
+            return FastJSONResponse(content={"detail": "요청 본문이 올바른 JSON 형식이 아닙니다"}, status_code=400)
+
+        transform = get_response_transform(service_type)
+        if transform:
+            response = await factory.request(
+                method=method, path=path, headers=headers, body=body, query=query, deadline=deadline
+            )
+            return transform(response)
+
+        if cached:
+            return await self.relay_cached(service_type, factory, path, headers, query, deadline)
+
+        if coalesced:
+            return await self.relay_coalesced(
+                service_type, factory, method, path, headers, body, query, deadline
+            )
+
+        upstream = await factory.stream(
+            method=method, path=path, headers=headers, body=body, query=query, deadline=deadline
+        )
+        return stream_upstream_response(upstream)
+
+    async def relay_coalesced(
+        self,
+        service_type: ServiceType,
+        factory: ServiceProxyFactory,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+        query: str,
+        deadline: Optional[float] = None
+    ) -> Response:
+        """동시에 들어온 동일 요청은 업스트림 호출 한 번의 결과를 공유 (공유를 위해 본문은 버퍼링)"""
+        key = request_key(method, service_type.value, path, query, body, headers, factory.config.coalesce_key_headers)
+
+        async def call():
+            upstream = await factory.stream(
+                method=method, path=path, headers=headers, body=body, query=query, deadline=deadline
+            )
+            return upstream.status_code, forward_response_headers(upstream.headers), await read_raw_body(upstream)
+
+        status_code, response_headers, response_body = await self.coalescer.do(key, call)
+        return build_raw_response(status_code, response_headers, response_body)
+
+    async def relay_cached(
+        self,
+        service_type: ServiceType,
+        factory: ServiceProxyFactory,
+        path: str,
+        headers: Dict[str, str],
+        query: str,
+        deadline: Optional[float] = None
+    ) -> Response:
+        """GET 응답 캐시 (신선하면 캐시 응답, 만료됐으면 재검증, 없으면 업스트림 응답을 저장)"""
+        cache = self.cache
+        key = cache.make_key(service_type, path, query, headers)
+        entry = cache.get(key) if cache.can_lookup(headers) else None
+
+        if entry is not None:
+            now = time.monotonic()
+            if entry.is_fresh(now):
+                cache.hits += 1
+                return entry.to_response("HIT")
+            if entry.has_validators:
+                if entry.can_serve_stale(now):
+                    # ✅ 만료된 응답을 먼저 돌려주고 재검증은 백그라운드에서 진행
+                    cache.stale_hits += 1
+                    self._schedule_revalidation(key, entry, factory, path, headers, query)
+                    return entry.to_response("STALE")
+                revalidated = await self.revalidate(key, entry, factory, path, headers, query, deadline)
+                return revalidated.to_response("REVALIDATED")
+
+        cache.misses += 1
+        upstream = await factory.stream(method="GET", path=path, headers=headers, query=query, deadline=deadline)
+        config = factory.config
+        ttls = None
+        if upstream.status_code == 200 and cache.can_store(headers):
+            ttls = cache.ttls_for(upstream.headers, config.cache_ttl, config.cache_stale_ttl)
+        if ttls is None:
+            return stream_upstream_response(upstream)
+
+        response_headers = forward_response_headers(upstream.headers)
+
+        def store(body: bytes):
+            cache.put(key, CachedResponse(upstream.status_code, response_headers, body, *ttls))
+
+        # 클라이언트에는 스트리밍으로 전달하면서 본문을 모아 캐시에 저장
+        return stream_upstream_response(upstream, on_complete=store, capture_limit=cache.max_entry_bytes)
+
+    async def revalidate(
+        self,
+        key: CacheKey,
+        entry: CachedResponse,
+        factory: ServiceProxyFactory,
+        path: str,
+        headers: Dict[str, str],
+        query: str,
+        deadline: Optional[float] = None
+    ) -> CachedResponse:
+        """If-None-Match / If-Modified-Since 조건부 요청으로 캐시 항목 재검증"""
+        cache = self.cache
+        config = factory.config
+        conditional_headers = dict(headers)
+        if entry.etag:
+            conditional_headers["if-none-match"] = entry.etag
+        if entry.last_modified:
+            conditional_headers["if-modified-since"] = entry.last_modified
+
+        cache.revalidations += 1
+        upstream = await factory.stream(
+            method="GET", path=path, headers=conditional_headers, query=query, deadline=deadline
+        )
+        if upstream.status_code == 304:
+            await upstream.aclose()
+            cache.not_modified += 1
+            ttls = cache.ttls_for(upstream.headers, config.cache_ttl, config.cache_stale_ttl)
+            entry.refresh(*(ttls or (config.cache_ttl, config.cache_stale_ttl)))
+            return entry
+
+        # 변경된 경우 새 응답으로 교체 (캐시할 수 없는 응답이면 항목 삭제)
+        body = await read_raw_body(upstream)
+        ttls = cache.ttls_for(upstream.headers, config.cache_ttl, config.cache_stale_ttl) if upstream.status_code == 200 else None
+        fresh_entry = CachedResponse(upstream.status_code, forward_response_headers(upstream.headers), body, *(ttls or (0.0, 0.0)))
+        if ttls is None or not cache.put(key, fresh_entry):
+            cache.discard(key)
+        return fresh_entry
+
+    def _schedule_revalidation(
+        self,
+        key: CacheKey,
+        entry: CachedResponse,
+        factory: ServiceProxyFactory,
+        path: str,
+        headers: Dict[str, str],
+        query: str
+    ):
+        """키당 하나의 백그라운드 재검증만 실행"""
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+        task = asyncio.create_task(self._background_revalidate(key, entry, factory, path, headers, query))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _background_revalidate(
+        self,
+        key: CacheKey,
+        entry: CachedResponse,
+        factory: ServiceProxyFactory,
+        path: str,
+        headers: Dict[str, str],
+        query: str
+    ):
+        try:
+            await self.revalidate(key, entry, factory, path, headers, query)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 재검증 실패 ({key[0]}/{key[1]}): {e}")
+        finally:
+            self._revalidating.discard(key)
@@ -0,0 +1,169 @@
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive
+import httpx
+
+from app.domain.model.service_type import ServiceType
+
+# ✅ 프록시 구간마다 다시 정해지는 hop-by-hop 헤더 (RFC 7230 6.1)
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+})
+
+# 업스트림으로 전달하지 않는 요청 헤더 (Host, Content-Length는 httpx가 다시 계산)
+EXCLUDED_REQUEST_HEADERS = HOP_BY_HOP_HEADERS | {"host", "content-length"}
+
+HeaderItems = Iterable[Tuple[Union[str, bytes], Union[str, bytes]]]
+
+# 응답 변환 함수: 버퍼링된 업스트림 응답을 받아 클라이언트 응답을 만든다
+ResponseTransform = Callable[[httpx.Response], Response]
+
+# ✅ 서비스별 응답 변환 등록부 (등록되지 않은 서비스는 파싱 없이 스트리밍)
+RESPONSE_TRANSFORMS: Dict[ServiceType, ResponseTransform] = {}
+
+
+def register_response_transform(service_type: ServiceType, transform: ResponseTransform):
+    """서비스 응답 변환 등록"""
+    RESPONSE_TRANSFORMS[service_type] = transform
+
+
+def get_response_transform(service_type: ServiceType) -> Optional[ResponseTransform]:
+    """등록된 응답 변환 조회"""
+    return RESPONSE_TRANSFORMS.get(service_type)
+
+
+def _to_str(value: Union[str, bytes]) -> str:
+    return value.decode("latin-1") if isinstance(value, bytes) else value
+
+
+def forward_request_headers(headers: HeaderItems) -> Dict[str, str]:
+    """클라이언트 요청 헤더 중 업스트림에 전달할 헤더만 추립니다"""
+    result: Dict[str, str] = {}
+    for key, value in headers:
+        name = _to_str(key).lower()
+        if name not in EXCLUDED_REQUEST_HEADERS:
+            result[name] = _to_str(value)
+    return result
+
+
+class RequestBodyTooLarge(Exception):
+    """요청 본문이 허용 크기(max_body_bytes)를 넘음"""
+
+
+def request_body_length(headers: HeaderItems) -> Tuple[Optional[int], bool]:
+    """요청 본문 길이(Content-Length)와 chunked 전송 여부"""
+    content_length = None
+    chunked = False
+    for key, value in headers:
+        name = _to_str(key).lower()
+        if name == "content-length":
+            try:
+                content_length = int(_to_str(value))
+            except ValueError:
+                content_length = None
+        elif name == "transfer-encoding":
+            chunked = "chunked" in _to_str(value).lower()
+    return content_length, chunked
+
+
+async def iter_request_body(receive: Receive, max_bytes: int = 0) -> AsyncIterator[bytes]:
+    """요청 본문을 받은 청크 그대로 넘겨주는 비동기 이터레이터
+
+    업스트림에 청크를 다 쓴 뒤에야 다음 청크를 받으므로 업스트림이 느리면 클라이언트 수신도 늦춰집니다(백프레셔).
+    max_bytes(0이면 무제한)를 넘으면 RequestBodyTooLarge를 발생시킵니다.
+    """
+    received = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        chunk = message.get("body", b"")
+        received += len(chunk)
+        if max_bytes and received > max_bytes:
+            raise RequestBodyTooLarge()
+        if chunk:
+            yield chunk
+        more_body = message.get("more_body", False)
+
+
+def forward_response_headers(headers: httpx.Headers) -> List[Tuple[bytes, bytes]]:
+    """업스트림 응답 헤더 중 클라이언트에 전달할 헤더만 추립니다 (Set-Cookie 등 중복 헤더 유지)"""
+    return [
+        (key, value)
+        for key, value in headers.raw
+        if key.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+    ]
+
+
+def build_raw_response(status_code: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes) -> Response:
+    """버퍼링된 업스트림 응답(raw 헤더/본문)으로 클라이언트 응답 생성 (Content-Length는 다시 계산)"""
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers.extend(
+        (key, value) for key, value in raw_headers if key.lower() != b"content-length"
+    )
+    return response
+
+
+async def _relay_body(
+    upstream: httpx.Response,
+    on_complete: Optional[Callable[[bytes], None]] = None,
+    capture_limit: int = 0
+):
+    """클라이언트 연결이 끊겨도 업스트림 커넥션이 풀로 반환되도록 보장
+
+    on_complete가 있으면 전달한 본문을 capture_limit 바이트까지 모아 두었다가
+    본문 전체가 전달된 뒤 한 번 호출합니다 (한도를 넘으면 호출하지 않음).
+    """
+    captured: Optional[List[bytes]] = [] if on_complete else None
+    captured_size = 0
+    try:
+        async for chunk in upstream.aiter_raw():
+            if captured is not None:
+                captured_size += len(chunk)
+                if captured_size > capture_limit:
+                    captured = None
+                else:
+                    captured.append(chunk)
+            yield chunk
+        if captured is not None:
+            on_complete(b"".join(captured))
+    finally:
+        await upstream.aclose()
+
+
+async def read_raw_body(upstream: httpx.Response) -> bytes:
+    """스트리밍 응답 본문을 압축 해제 없이 끝까지 읽고 커넥션을 반환합니다"""
+    try:
+        return b"".join([chunk async for chunk in upstream.aiter_raw()])
+    finally:
+        await upstream.aclose()
+
+
+def stream_upstream_response(
+    upstream: httpx.Response,
+    on_complete: Optional[Callable[[bytes], None]] = None,
+    capture_limit: int = 0
+) -> StreamingResponse:
+    """업스트림 응답의 상태/헤더/본문 청크를 도착하는 대로 그대로 전달합니다
+
+    본문은 aiter_raw()로 받아 디코딩·압축 해제 없이 전달하므로
+    Content-Encoding, Content-Length 헤더도 그대로 유지됩니다.
+    """
+    response = StreamingResponse(
+        _relay_body(upstream, on_complete, capture_limit),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose),
+    )
+    response.raw_headers = forward_response_headers(upstream.headers)
+    return response
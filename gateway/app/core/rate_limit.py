@@ -0,0 +1,292 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+
+from app.core.json_codec import FastJSONResponse
+from app.core.single_flight import RoutePatterns
+
+logger = logging.getLogger("gateway_api")
+
+CLIENT = "client"
+TOKEN = "token"
+
+# (키, 초당 충전량, 버킷 크기, 소비량)
+BucketCheck = Tuple[str, float, float, float]
+# (허용 여부, 재시도까지 남은 시간(초))
+BucketResult = Tuple[bool, float]
+
+
+class RateLimitRule:
+    """토큰 버킷 규칙 하나 (클라이언트 IP 또는 인증 토큰 기준)"""
+
+    def __init__(self, name: str, key: str, rate: float, burst: float, routes: Sequence[str] = ()):
+        if key not in (CLIENT, TOKEN):
+            raise ValueError(f"지원하지 않는 rate limit 기준입니다: {key}")
+        # rate가 0이면 재시도 시간/만료 시간(burst / rate)이 무한대가 되어 Redis PEXPIRE가 실패함
+        if rate <= 0 or burst <= 0:
+            raise ValueError(f"rate limit 규칙의 rate/burst는 0보다 커야 합니다: {name}")
+        self.name = name
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self.routes = RoutePatterns(routes) if routes else None
+        self.allowed = 0
+        self.rejected = 0
+
+    def applies_to(self, method: str, path: str) -> bool:
+        return self.routes is None or self.routes.matches(method, path)
+
+
+# ✅ 기본 규칙: 클라이언트/토큰별 전체 요청 한도 + news 검색(크롤링) / 토큰 일괄 검증 전용 한도
+DEFAULT_RULES = [
+    {"name": "client", "key": CLIENT, "rate": 50, "burst": 100},
+    {"name": "token", "key": TOKEN, "rate": 20, "burst": 40},
+    {"name": "news_search", "key": CLIENT, "rate": 0.2, "burst": 3, "routes": ["POST:e/v2/news/search", "POST:e/v2/aggregate"]},
+    {"name": "token_verify_batch", "key": CLIENT, "rate": 1, "burst": 10, "routes": ["POST:e/v2/token/verify/batch"]},
+]
+
+
+def load_rules() -> List[RateLimitRule]:
+    """RATE_LIMIT_RULES(JSON 목록, 형식은 DEFAULT_RULES 참고)에서 규칙을 읽습니다"""
+    raw = os.getenv("RATE_LIMIT_RULES")
+    rules = json.loads(raw) if raw else DEFAULT_RULES
+    return [
+        RateLimitRule(rule["name"], rule["key"], float(rule["rate"]), float(rule["burst"]), rule.get("routes", ()))
+        for rule in rules
+    ]
+
+
+class InMemoryRateLimitBackend:
+    """프로세스 메모리 토큰 버킷 (워커 하나일 때 사용, 오래 쓰지 않은 키부터 max_keys개까지만 유지)"""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def consume(self, checks: Sequence[BucketCheck], now: float) -> List[BucketResult]:
+        """모든 버킷에서 소비 가능할 때만 소비 (하나라도 부족하면 어느 버킷도 차감하지 않음)"""
+        refilled = []
+        results: List[BucketResult] = []
+        for key, rate, burst, cost in checks:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            refilled.append(tokens)
+            if tokens >= cost:
+                results.append((True, 0.0))
+            else:
+                results.append((False, (cost - tokens) / rate))
+
+        allowed = all(ok for ok, _ in results)
+        for (key, rate, burst, cost), tokens in zip(checks, refilled):
+            self._buckets[key] = (tokens - cost if allowed else tokens, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return results
+
+    async def close(self):
+        pass
+
+
+# KEYS: 버킷 키 목록, ARGV: now, 그리고 키마다 (rate, burst, cost)
+# 모든 버킷을 한 번에 계산해 전부 허용될 때만 차감 (요청당 Redis 왕복 1회)
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local n = #KEYS
+local tokens = {}
+local allowed = 1
+local result = {}
+for i = 1, n do
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local burst = tonumber(ARGV[i * 3])
+    local cost = tonumber(ARGV[i * 3 + 1])
+    local bucket = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local current = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    current = math.min(burst, current + math.max(0, now - updated) * rate)
+    tokens[i] = current
+    if current < cost then
+        allowed = 0
+        result[i] = tostring((cost - current) / rate)
+    else
+        result[i] = '0'
+    end
+end
+for i = 1, n do
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local burst = tonumber(ARGV[i * 3])
+    local cost = tonumber(ARGV[i * 3 + 1])
+    local remaining = tokens[i]
+    if allowed == 1 then
+        remaining = remaining - cost
+    end
+    redis.call('HSET', KEYS[i], 'tokens', tostring(remaining), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[i], math.ceil(burst / rate * 1000) + 1000)
+end
+return result
+"""
+
+
+class RedisRateLimitBackend:
+    """Redis(프로토콜 호환 저장소) 토큰 버킷 - 여러 워커/인스턴스가 같은 한도를 공유
+
+    요청 하나의 모든 규칙을 Lua 스크립트 한 번(EVALSHA)으로 처리합니다.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None, prefix: str = "ratelimit:"):
+        if client is None:
+            import redis.asyncio as redis_asyncio
+
+            client = redis_asyncio.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def consume(self, checks: Sequence[BucketCheck], now: float) -> List[BucketResult]:
+        keys = [f"{self.prefix}{key}" for key, _, _, _ in checks]
+        args: List[float] = [now]
+        for _, rate, burst, cost in checks:
+            args.extend((rate, burst, cost))
+        retry_afters = [float(value) for value in await self._script(keys=keys, args=args)]
+        return [(retry_after == 0, retry_after) for retry_after in retry_afters]
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class RateLimiter:
+    """요청에 해당하는 규칙을 모아 백엔드에 한 번에 확인"""
+
+    def __init__(self, rules: List[RateLimitRule], backend: Any, trust_forwarded: bool = False):
+        self.rules = rules
+        self.backend = backend
+        self.trust_forwarded = trust_forwarded
+        self.backend_errors = 0
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+        backend = RedisRateLimitBackend() if backend_name == "redis" else InMemoryRateLimitBackend()
+        trust_forwarded = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes", "on")
+        return cls(load_rules(), backend, trust_forwarded)
+
+    def client_key(self, scope: Scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def token_key(headers: Headers) -> Optional[str]:
+        """Authorization 토큰 (원문 대신 해시로 저장)"""
+        authorization = headers.get("authorization")
+        if not authorization:
+            return None
+        token = authorization.split(" ", 1)[-1].strip()
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32] if token else None
+
+    async def check(self, scope: Scope) -> Optional[Tuple[RateLimitRule, float]]:
+        """허용되면 None, 거절되면 (걸린 규칙, 재시도까지 남은 시간)"""
+        method, path = scope["method"], scope["path"]
+        headers = Headers(scope=scope)
+        rules: List[RateLimitRule] = []
+        checks: List[BucketCheck] = []
+        client_key: Optional[str] = None
+        token_key: Optional[str] = None
+        for rule in self.rules:
+            if not rule.applies_to(method, path):
+                continue
+            if rule.key == CLIENT:
+                client_key = client_key or self.client_key(scope, headers)
+                subject = client_key
+            else:
+                token_key = token_key or self.token_key(headers)
+                if token_key is None:
+                    continue
+                subject = token_key
+            rules.append(rule)
+            checks.append((f"{rule.name}:{subject}", rule.rate, rule.burst, 1.0))
+        if not checks:
+            return None
+
+        try:
+            results = await self.backend.consume(checks, time.time())
+        except Exception as e:
+            # 저장소 장애 시에는 요청을 막지 않음 (fail open)
+            self.backend_errors += 1
+            logger.warning(f"⚠️ rate limit 저장소 오류, 제한 없이 통과: {e}")
+            return None
+
+        denied = [(rule, retry_after) for rule, (ok, retry_after) in zip(rules, results) if not ok]
+        if not denied:
+            for rule in rules:
+                rule.allowed += 1
+            return None
+        rule, retry_after = max(denied, key=lambda item: item[1])
+        rule.rejected += 1
+        return rule, retry_after
+
+    async def close(self):
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "backend_errors": self.backend_errors,
+            "rules": {
+                rule.name: {
+                    "key": rule.key,
+                    "rate": rule.rate,
+                    "burst": rule.burst,
+                    "routes": rule.routes.patterns if rule.routes else ["*"],
+                    "allowed": rule.allowed,
+                    "rejected": rule.rejected,
+                }
+                for rule in self.rules
+            },
+        }
+
+
+class RateLimitMiddleware:
+    """토큰 버킷 한도를 넘은 요청을 429로 거절 (헬스 체크/메트릭 경로는 제외)"""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None, exempt_routes: Sequence[str] = ("*:e/v2/health*", "GET:metrics", "GET:.well-known/jwks.json")):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.exempt = RoutePatterns(exempt_routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.exempt.matches(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        denied = await self.limiter.check(scope)
+        if denied is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule, retry_after = denied
+        logger.warning(f"🚫 rate limit 초과 ({rule.name}): {scope['method']} {scope['path']}")
+        response = FastJSONResponse(
+            content={"detail": f"요청 한도를 초과했습니다 ({rule.name})"},
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(min(retry_after, 3600)))), "X-RateLimit-Rule": rule.name}
+        )
+        await response(scope, receive, send)
+
+
+# ✅ 게이트웨이 전역 rate limiter (RATE_LIMIT_BACKEND=memory | redis)
+rate_limiter = RateLimiter.from_env()
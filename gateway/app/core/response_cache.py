@@ -0,0 +1,199 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from fastapi import Response
+import os
+import time
+
+from app.core.proxy_response import build_raw_response
+from app.domain.model.service_type import ServiceType
+
+RawHeaders = List[Tuple[bytes, bytes]]
+CacheKey = Tuple[str, str, str, Tuple[str, ...]]
+
+# 캐시 키에 포함하는 요청 헤더 (업스트림 Vary가 이 범위를 벗어나면 캐시하지 않음)
+DEFAULT_VARY_HEADERS = ("accept", "accept-encoding")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control 헤더를 {지시어: 값} 형태로 파싱"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CachedResponse:
+    """캐시된 업스트림 응답 (본문은 업스트림이 보낸 raw 바이트 그대로)"""
+
+    __slots__ = ("status_code", "headers", "body", "etag", "last_modified", "stored_at", "fresh_until", "stale_until")
+
+    def __init__(self, status_code: int, headers: RawHeaders, body: bytes, ttl: float, stale_ttl: float):
+        self.status_code = status_code
+        self.headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+        self.body = body
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        for key, value in self.headers:
+            name = key.lower()
+            if name == b"etag":
+                self.etag = value.decode("latin-1")
+            elif name == b"last-modified":
+                self.last_modified = value.decode("latin-1")
+        self.refresh(ttl, stale_ttl)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def refresh(self, ttl: float, stale_ttl: float):
+        """재검증(304) 성공 시 신선도 갱신"""
+        self.stored_at = time.monotonic()
+        self.fresh_until = self.stored_at + ttl
+        self.stale_until = self.fresh_until + stale_ttl
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def can_serve_stale(self, now: float) -> bool:
+        return now < self.stale_until
+
+    def to_response(self, cache_status: str) -> Response:
+        response = build_raw_response(self.status_code, self.headers, self.body)
+        response.raw_headers.append((b"age", str(int(time.monotonic() - self.stored_at)).encode("latin-1")))
+        response.raw_headers.append((b"x-cache", cache_status.encode("latin-1")))
+        return response
+
+
+class ResponseCache:
+    """게이트웨이 GET 응답 캐시 (전체 바이트 수 기준 LRU)"""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+        vary_headers: Tuple[str, ...] = DEFAULT_VARY_HEADERS
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.vary_headers = tuple(header.lower() for header in vary_headers)
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        vary = os.getenv("CACHE_VARY_HEADERS")
+        return cls(
+            max_bytes=int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            max_entry_bytes=int(os.getenv("CACHE_MAX_ENTRY_BYTES", 1024 * 1024)),
+            vary_headers=tuple(h.strip() for h in vary.split(",") if h.strip()) if vary else DEFAULT_VARY_HEADERS,
+        )
+
+    def make_key(self, service_type: ServiceType, path: str, query: str, headers: Dict[str, str]) -> CacheKey:
+        """서비스, 경로, 쿼리, 선택된 Vary 헤더 값으로 캐시 키 생성 (headers는 소문자 키)"""
+        return (service_type.value, path, query, tuple(headers.get(name, "") for name in self.vary_headers))
+
+    def can_store(self, headers: Mapping[str, str]) -> bool:
+        """인증 정보가 있거나 no-store인 요청의 응답은 공유 캐시에 저장하지 않음"""
+        if "authorization" in headers:
+            return False
+        return "no-store" not in parse_cache_control(headers.get("cache-control"))
+
+    def can_lookup(self, headers: Mapping[str, str]) -> bool:
+        """클라이언트가 no-cache로 새 응답을 요구하면 캐시를 조회하지 않음"""
+        return self.can_store(headers) and "no-cache" not in parse_cache_control(headers.get("cache-control"))
+
+    def ttls_for(self, headers: Mapping[str, str], default_ttl: float, default_stale_ttl: float) -> Optional[Tuple[float, float]]:
+        """업스트림 응답 헤더로 (TTL, stale TTL) 계산, 캐시할 수 없으면 None"""
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives or "private" in directives:
+            return None
+
+        vary = headers.get("vary")
+        if vary:
+            varied = {name.strip().lower() for name in vary.split(",")}
+            if "*" in varied or not varied.issubset(self.vary_headers):
+                return None
+
+        ttl = _seconds(directives.get("s-maxage"))
+        if ttl is None:
+            ttl = _seconds(directives.get("max-age"))
+        if ttl is None:
+            ttl = default_ttl
+        if "no-cache" in directives:
+            ttl = 0.0
+
+        stale_ttl = _seconds(directives.get("stale-while-revalidate"))
+        if stale_ttl is None:
+            stale_ttl = default_stale_ttl
+        if "must-revalidate" in directives or "proxy-revalidate" in directives or "no-cache" in directives:
+            stale_ttl = 0.0
+        return ttl, stale_ttl
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """캐시 조회 (조회된 항목은 최근 사용으로 이동)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> bool:
+        """캐시 저장 (항목 크기가 한도를 넘으면 저장하지 않음)"""
+        if entry.size > self.max_entry_bytes:
+            return False
+        self.discard(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+        return True
+
+    def discard(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+        }
+
+
+# ✅ 게이트웨이 전역 응답 캐시
+response_cache = ResponseCache.from_env()
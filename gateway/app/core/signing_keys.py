@@ -0,0 +1,288 @@
+"""
+토큰 서명 키 관리 (RS256 / ES256 / EdDSA, kid 포함, 주기적 교체)
+
+- 키는 TOKEN_SIGNING_KEYS_DIR에 <alg>-<기간 번호>.pem으로 저장하고 모든 워커/인스턴스가 같은 디렉터리를 공유
+- 기간(TOKEN_KEY_ROTATION_HOURS)마다 새 키로 서명하며, 다음 기간 키는 TOKEN_KEY_PREPUBLISH_MINUTES 전에 미리 만들어 JWKS에 공개
+  (서비스의 JWKS 캐시가 갱신된 뒤부터 새 키로 서명하게 됨)
+- 이전 키는 그 키로 서명한 토큰이 모두 만료될 때까지 JWKS에 남겨 둠
+- 키 파일은 같은 이름으로 하나만 만들어지므로(임시 파일 → 링크) 여러 워커가 동시에 교체해도 같은 키를 사용
+- kid는 <alg>-<기간 번호>-<공개키 thumbprint(RFC 7638) 앞부분>이므로 재시작 등으로 키가 다시 만들어지면 kid도 바뀜
+  (서비스는 모르는 kid를 보고 JWKS를 다시 받음)
+- 키 생성/파일 읽기는 start()의 백그라운드 작업이 스레드에서 수행하고, 서명은 준비된 키만 사용
+"""
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+from app.core.token_verifier import ASYMMETRIC_ALGORITHMS, TokenVerifier, b64url_encode
+
+logger = logging.getLogger("gateway_api")
+
+# ✅ 토큰 서명 알고리즘 (HS256: 게이트웨이 공유 비밀키, 그 외: 비대칭 키 + JWKS 공개)
+SIGNING_ALG = os.getenv("TOKEN_SIGNING_ALG", "HS256")
+
+
+def generate_private_key(alg: str) -> Any:
+    if alg == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if alg == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if alg == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"지원하지 않는 서명 알고리즘입니다: {alg}")
+
+
+def _int_b64url(value: int, length: Optional[int] = None) -> str:
+    length = length or (value.bit_length() + 7) // 8
+    return b64url_encode(value.to_bytes(length, "big"))
+
+
+def jwk_thumbprint(members: Dict[str, str]) -> str:
+    """RFC 7638 JWK thumbprint (필수 멤버만 사전순으로 직렬화한 SHA-256)"""
+    canonical = json.dumps(members, sort_keys=True, separators=(",", ":"))
+    return b64url_encode(hashlib.sha256(canonical.encode("utf-8")).digest())
+
+
+class SigningKey:
+    """서명 키 하나 (서명 기간과 JWKS 공개 기간 포함, kid는 기간 번호와 공개키 thumbprint로 정함)"""
+
+    def __init__(self, alg: str, period: int, private_key: Any, signs_from: float, signs_until: float):
+        self.alg = alg
+        self.period = period
+        self.private_key = private_key
+        self.signs_from = signs_from
+        self.signs_until = signs_until
+        members = self._public_members()
+        self.kid = f"{alg}-{period}-{jwk_thumbprint(members)[:16]}"
+        self.public_jwk = {"kid": self.kid, "alg": alg, "use": "sig", **members}
+
+    def _public_members(self) -> Dict[str, str]:
+        public_key = self.private_key.public_key()
+        if self.alg == "RS256":
+            numbers = public_key.public_numbers()
+            return {"kty": "RSA", "n": _int_b64url(numbers.n), "e": _int_b64url(numbers.e)}
+        if self.alg == "ES256":
+            numbers = public_key.public_numbers()
+            return {"kty": "EC", "crv": "P-256", "x": _int_b64url(numbers.x, 32), "y": _int_b64url(numbers.y, 32)}
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"kty": "OKP", "crv": "Ed25519", "x": b64url_encode(raw)}
+
+    def sign(self, signing_input: bytes) -> bytes:
+        if self.alg == "RS256":
+            return self.private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+        if self.alg == "ES256":
+            r, s = decode_dss_signature(self.private_key.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+            return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return self.private_key.sign(signing_input)
+
+
+class KeyRing:
+    """기간별 서명 키 모음 (현재 기간 키로 서명, 공개 중인 모든 키를 JWKS로 제공)"""
+
+    def __init__(
+        self,
+        alg: str,
+        directory: str,
+        rotation_seconds: float,
+        prepublish_seconds: float,
+        retain_seconds: float,
+        check_interval: float = 30.0,
+    ):
+        if alg not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"비대칭 서명 알고리즘이 아닙니다: {alg}")
+        self.alg = alg
+        self.directory = directory
+        # 0이면 교체하지 않음 (기간 번호가 항상 0)
+        self.rotation_seconds = rotation_seconds
+        self.prepublish_seconds = prepublish_seconds
+        self.retain_seconds = retain_seconds
+        self.check_interval = check_interval
+        self._pattern = re.compile(rf"^{re.escape(alg)}-(\d+)\.pem$")
+        # 기간 번호 → 키 (파일을 다시 만들면 다시 읽도록 파일 식별 정보와 함께 보관)
+        self._keys: Dict[int, SigningKey] = {}
+        self._loaded: Dict[str, Tuple[Tuple[int, int], SigningKey]] = {}
+        self._checked_at = 0.0
+        self._jwks: Dict[str, Any] = {"keys": []}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, alg: str) -> "KeyRing":
+        return cls(
+            alg=alg,
+            directory=os.getenv("TOKEN_SIGNING_KEYS_DIR", "/tmp/gateway-signing-keys"),
+            rotation_seconds=float(os.getenv("TOKEN_KEY_ROTATION_HOURS", "168")) * 3600,
+            prepublish_seconds=float(os.getenv("TOKEN_KEY_PREPUBLISH_MINUTES", "60")) * 60,
+            # 서명 기간이 끝난 키를 공개해 두는 시간 (토큰 수명 30분 + 시계 오차보다 길게)
+            retain_seconds=float(os.getenv("TOKEN_KEY_RETAIN_MINUTES", "60")) * 60,
+        )
+
+    def _period(self, now: float) -> int:
+        return int(now // self.rotation_seconds) if self.rotation_seconds > 0 else 0
+
+    def _period_range(self, period: int):
+        if self.rotation_seconds <= 0:
+            return 0.0, float("inf")
+        return period * self.rotation_seconds, (period + 1) * self.rotation_seconds
+
+    def _ensure_key_file(self, period: int):
+        """기간 키 파일이 없으면 생성 (이미 있으면 다른 워커가 만든 키를 그대로 사용)"""
+        path = os.path.join(self.directory, f"{self.alg}-{period}.pem")
+        if os.path.exists(path):
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        pem = generate_private_key(self.alg).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        # start()의 백그라운드 스레드(asyncio.to_thread)와 _ensure_loaded()를 부른 스레드가 동시에 만들 수 있으므로
+        # 임시 파일 이름에 프로세스 ID와 스레드 ID 포함
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(pem)
+        try:
+            # 링크는 대상이 있으면 실패하므로 먼저 만든 워커의 키만 남음
+            os.link(tmp_path, path)
+            logger.info(f"🔑 서명 키 생성: {self.alg}-{period}")
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+
+    def refresh(self, now: Optional[float] = None):
+        """현재/다음 기간 키를 준비하고 공개 기간이 지난 키를 정리"""
+        now = time.time() if now is None else now
+        period = self._period(now)
+        self._ensure_key_file(period)
+        next_start, _ = self._period_range(period + 1)
+        if self.rotation_seconds > 0 and now >= next_start - self.prepublish_seconds:
+            self._ensure_key_file(period + 1)
+
+        keys: Dict[int, SigningKey] = {}
+        loaded: Dict[str, Tuple[Tuple[int, int], SigningKey]] = {}
+        for name in os.listdir(self.directory):
+            match = self._pattern.match(name)
+            if match is None:
+                continue
+            key_period = int(match.group(1))
+            signs_from, signs_until = self._period_range(key_period)
+            path = os.path.join(self.directory, name)
+            if signs_until + self.retain_seconds < now:
+                # 이 키로 서명한 토큰이 모두 만료됨
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            identity = (stat.st_ino, stat.st_mtime_ns)
+            cached = self._loaded.get(name)
+            if cached is not None and cached[0] == identity:
+                key = cached[1]
+            else:
+                with open(path, "rb") as f:
+                    private_key = serialization.load_pem_private_key(f.read(), password=None)
+                key = SigningKey(self.alg, key_period, private_key, signs_from, signs_until)
+            keys[key_period] = key
+            loaded[name] = (identity, key)
+        self._loaded = loaded
+        self._jwks = {"keys": [key.public_jwk for key in sorted(keys.values(), key=lambda k: k.signs_from)]}
+        self._keys = keys
+        self._checked_at = now
+
+    def _ensure_loaded(self):
+        # start() 없이 서명/조회하는 경우(스크립트, 테스트)에만 호출한 곳에서 바로 준비
+        if not self._keys:
+            self.refresh()
+
+    def active_key(self, now: Optional[float] = None) -> SigningKey:
+        """현재 기간 키 (교체 시점에 새 키가 아직 준비되지 않았으면 백그라운드 갱신 전까지 직전 키 사용)"""
+        now = time.time() if now is None else now
+        self._ensure_loaded()
+        keys = self._keys
+        key = keys.get(self._period(now))
+        if key is None:
+            started = [k for k in keys.values() if k.signs_from <= now] or list(keys.values())
+            key = max(started, key=lambda k: k.signs_from)
+        return key
+
+    def jwks(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        return self._jwks
+
+    async def start(self):
+        """키를 준비하고 check_interval마다 스레드에서 교체/정리 (키 생성이 요청 처리 중 이벤트 루프를 막지 않게 함)"""
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self.refresh)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"🔑 서명 키 관리 시작 - {self.alg} ({self.check_interval}초 주기)")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.warning(f"⚠️ 서명 키 갱신 실패 (기존 키로 계속 서명): {e}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        """클레임을 현재 키로 서명한 compact JWS"""
+        key = self.active_key()
+        header = {"alg": key.alg, "typ": "JWT", "kid": key.kid}
+        signing_input = (
+            b64url_encode(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+            + "."
+            + b64url_encode(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        )
+        return f"{signing_input}.{b64url_encode(key.sign(signing_input.encode('ascii')))}"
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "alg": self.alg,
+            "active_kid": self.active_key(now).kid,
+            "published_kids": [jwk["kid"] for jwk in self.jwks()["keys"]],
+            "rotation_hours": self.rotation_seconds / 3600,
+        }
+
+
+# ✅ 비대칭 서명이면 게이트웨이 전역 키 모음과 로컬 검증기 (HS256이면 None, 키는 lifespan의 start()에서 준비)
+token_keyring: Optional[KeyRing] = KeyRing.from_env(SIGNING_ALG) if SIGNING_ALG in ASYMMETRIC_ALGORITHMS else None
+local_token_verifier: Optional[TokenVerifier] = (
+    TokenVerifier(
+        jwks_provider=token_keyring.jwks,
+        algorithms=(SIGNING_ALG,),
+        issuer=os.getenv("TOKEN_ISSUER") or None,
+        leeway=float(os.getenv("TOKEN_LEEWAY", "30")),
+        cache_ttl=token_keyring.check_interval,
+    )
+    if token_keyring is not None
+    else None
+)
+
+
+def published_jwks() -> Dict[str, Any]:
+    """JWKS 엔드포인트 응답 (HS256이면 빈 목록)"""
+    return token_keyring.jwks() if token_keyring is not None else {"keys": []}
@@ -0,0 +1,86 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+import asyncio
+import fnmatch
+import hashlib
+import re
+
+T = TypeVar("T")
+
+# 항상 병합 키에 포함하는 요청 헤더 (호출자마다 다른 응답을 받는 요청이 다른 사용자의 결과를 공유하지 않게 함)
+CREDENTIAL_KEY_HEADERS = ("authorization", "cookie")
+
+
+class RoutePatterns:
+    """'METHOD:경로' 형식의 glob 패턴 목록 (예: POST:search, GET:company/*)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [pattern.strip() for pattern in patterns if pattern.strip()]
+        compiled = [fnmatch.translate(self._normalize(pattern)) for pattern in self.patterns]
+        self._regex: Optional[re.Pattern] = re.compile("|".join(compiled)) if compiled else None
+
+    @staticmethod
+    def _normalize(pattern: str) -> str:
+        method, sep, path = pattern.partition(":")
+        if not sep:
+            method, path = "*", pattern
+        return f"{method.upper()}:{path.lstrip('/')}"
+
+    def matches(self, method: str, path: str) -> bool:
+        return self._regex is not None and self._regex.match(f"{method}:{path.lstrip('/')}") is not None
+
+
+def request_key(
+    method: str,
+    service: str,
+    path: str,
+    query: str,
+    body: Optional[bytes],
+    headers: Dict[str, str],
+    key_headers: Iterable[str] = ()
+) -> Tuple[Any, ...]:
+    """병합 키 (메서드, 서비스, 경로, 쿼리, 본문 해시, 인증 헤더 + 선택 헤더 값)"""
+    body_hash = hashlib.sha256(body).digest() if body else b""
+    credentials = tuple(headers.get(name, "") for name in CREDENTIAL_KEY_HEADERS)
+    return (method, service, path, query, body_hash, credentials, tuple(headers.get(name.lower(), "") for name in key_headers))
+
+
+class SingleFlight:
+    """동일 키로 동시에 들어온 호출을 하나의 실행으로 합치고 결과를 공유
+
+    실제 호출은 별도 작업으로 실행되므로 먼저 요청한 클라이언트가 연결을 끊어도
+    나머지 대기자는 같은 결과를 받습니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # 모든 대기자가 취소된 경우에도 예외가 기록되지 않은 채 남지 않도록 조회
+        if not call.cancelled():
+            call.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+# ✅ 게이트웨이 전역 요청 병합기
+single_flight = SingleFlight()
@@ -0,0 +1,343 @@
+"""
+JWT 폐기 목록 (무상태 검증용)
+
+- 각 게이트웨이 인스턴스는 폐기된 jti의 Bloom filter와 사용자별 폐기 세대(epoch)를 메모리에 유지
+- 검증 시 Bloom filter에 없으면 바로 유효(공유 저장소 조회 없음), 있을 때만 공유 저장소의 정확한 집합을 조회
+- 폐기 기록은 공유 저장소(memory | redis)의 변경 로그를 TOKEN_REVOCATION_SYNC_INTERVAL초마다 읽어 인스턴스 간 동기화
+다른 인스턴스의 폐기는 최대 동기화 주기만큼 늦게 반영됩니다 (폐기한 인스턴스에는 즉시 반영).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger("gateway_api")
+
+STATEFUL = "stateful"
+STATELESS = "stateless"
+
+# ✅ 토큰 검증 방식 (stateful: 토큰 저장소 조회, stateless: 서명/만료 확인 후 폐기 목록만 확인)
+VERIFY_MODE = os.getenv("TOKEN_VERIFY_MODE", STATEFUL).lower()
+
+# 변경 로그 이벤트 종류
+REVOKE = "revoke"
+EPOCH = "epoch"
+
+# (종류, jti 또는 사용자 ID, 만료 시각 또는 세대)
+RevocationEvent = Tuple[str, str, float]
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 Bloom filter (삭제 없음, 만료된 항목이 쌓이면 새로 만들어 교체)"""
+
+    __slots__ = ("size", "hashes", "bits", "count")
+
+    def __init__(self, size: int, hashes: int):
+        self.size = max(8, size)
+        self.hashes = max(1, hashes)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """capacity개를 넣었을 때 오탐률이 error_rate가 되는 크기"""
+        capacity = max(1, capacity)
+        size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        return cls(size, round(size / capacity * math.log(2)))
+
+    def _positions(self, item: str):
+        # 해시 한 번으로 두 값을 얻어 k개 위치 생성 (double hashing)
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        """새로 켜진 비트가 있을 때만 count 증가 (같은 항목을 다시 넣어도 한 번만 셈)"""
+        bits = self.bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class InMemoryRevocationStore:
+    """프로세스 메모리 공유 저장소 (단일 인스턴스/개발용, 같은 프로세스의 검증기끼리 공유)"""
+
+    name = "memory"
+
+    def __init__(self, max_log: int = 100_000):
+        self.max_log = max_log
+        self._revoked: Dict[str, float] = {}
+        self._epochs: Dict[str, int] = {}
+        self._log: List[RevocationEvent] = []
+        self._log_start = 0  # _log[0]의 순번
+
+    def _append(self, event: RevocationEvent):
+        self._log.append(event)
+        if len(self._log) > self.max_log:
+            trimmed = len(self._log) - self.max_log
+            del self._log[:trimmed]
+            self._log_start += trimmed
+
+    async def revoke(self, jti: str, expires_at: float):
+        self._revoked[jti] = expires_at
+        self._append((REVOKE, jti, expires_at))
+
+    async def bump_epoch(self, user_id: str) -> int:
+        epoch = self._epochs.get(user_id, 0) + 1
+        self._epochs[user_id] = epoch
+        self._append((EPOCH, user_id, epoch))
+        return epoch
+
+    async def is_revoked(self, jti: str, now: float) -> bool:
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > now
+
+    async def snapshot(self, now: float) -> Tuple[Any, Dict[str, float], Dict[str, int]]:
+        """(로그 위치, 만료되지 않은 폐기 jti, 사용자별 세대)"""
+        revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+        return self._log_start + len(self._log), revoked, dict(self._epochs)
+
+    async def events_since(self, offset: Any) -> Optional[Tuple[Any, List[RevocationEvent]]]:
+        """offset 이후 이벤트 (로그가 잘려 이어 읽을 수 없으면 None → snapshot부터 다시)"""
+        if offset < self._log_start:
+            return None
+        return self._log_start + len(self._log), self._log[offset - self._log_start:]
+
+    async def purge(self, now: float):
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+
+    async def close(self):
+        pass
+
+
+class RedisRevocationStore:
+    """Redis(프로토콜 호환 저장소) 공유 폐기 목록 - 여러 워커/인스턴스가 같은 목록을 사용
+
+    - {prefix}revoked: 폐기 jti → 만료 시각 (sorted set, 만료된 항목은 purge에서 삭제)
+    - {prefix}epochs: 사용자 ID → 폐기 세대 (hash)
+    - {prefix}log: 변경 로그 (stream, 최근 max_log개 유지)
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None, prefix: str = "revocation:", max_log: int = 100_000):
+        if client is None:
+            import redis.asyncio as redis_asyncio
+
+            client = redis_asyncio.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True)
+        self.client = client
+        self.max_log = max_log
+        self.revoked_key = f"{prefix}revoked"
+        self.epochs_key = f"{prefix}epochs"
+        self.log_key = f"{prefix}log"
+
+    async def revoke(self, jti: str, expires_at: float):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zadd(self.revoked_key, {jti: expires_at})
+        pipe.xadd(self.log_key, {"kind": REVOKE, "key": jti, "value": expires_at}, maxlen=self.max_log, approximate=True)
+        await pipe.execute()
+
+    async def bump_epoch(self, user_id: str) -> int:
+        epoch = int(await self.client.hincrby(self.epochs_key, user_id, 1))
+        await self.client.xadd(self.log_key, {"kind": EPOCH, "key": user_id, "value": epoch}, maxlen=self.max_log, approximate=True)
+        return epoch
+
+    async def is_revoked(self, jti: str, now: float) -> bool:
+        expires_at = await self.client.zscore(self.revoked_key, jti)
+        return expires_at is not None and float(expires_at) > now
+
+    async def snapshot(self, now: float) -> Tuple[Any, Dict[str, float], Dict[str, int]]:
+        # 로그 위치를 먼저 읽어 그 뒤의 변경은 다음 동기화에서 다시 적용 (중복 적용해도 결과가 같음)
+        last = await self.client.xrevrange(self.log_key, count=1)
+        offset = last[0][0] if last else "0-0"
+        revoked = await self.client.zrangebyscore(self.revoked_key, now, "+inf", withscores=True)
+        epochs = await self.client.hgetall(self.epochs_key)
+        return offset, {jti: float(score) for jti, score in revoked}, {user_id: int(epoch) for user_id, epoch in epochs.items()}
+
+    async def events_since(self, offset: Any) -> Optional[Tuple[Any, List[RevocationEvent]]]:
+        first = await self.client.xrange(self.log_key, count=1)
+        if first and _stream_id(first[0][0]) > _stream_id(offset):
+            # 읽은 위치 이후 항목이 잘렸을 수 있음
+            return None
+        result = await self.client.xread({self.log_key: offset}, count=10_000)
+        events: List[RevocationEvent] = []
+        for _, entries in result or ():
+            for entry_id, fields in entries:
+                offset = entry_id
+                events.append((fields["kind"], fields["key"], float(fields["value"])))
+        return offset, events
+
+    async def purge(self, now: float):
+        await self.client.zremrangebyscore(self.revoked_key, "-inf", now)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _stream_id(value: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = value.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class RevocationFilter:
+    """인스턴스별 폐기 jti Bloom filter + 사용자 세대 사본 (공유 저장소 변경 로그로 동기화)"""
+
+    def __init__(self, store: Any, capacity: int = 100_000, error_rate: float = 0.001, sync_interval: float = 1.0):
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter.for_capacity(capacity, error_rate)
+        # 현재 필터를 만들 때 잡은 용량 (살아 있는 폐기 항목이 capacity보다 많으면 더 크게 만듦)
+        self._bloom_capacity = capacity
+        self._epochs: Dict[str, int] = {}
+        self._offset: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_sync: Optional[float] = None
+        self.sync_errors = 0
+        self.checks = 0
+        self.exact_lookups = 0
+        self.false_positives = 0
+
+    @classmethod
+    def from_env(cls) -> "RevocationFilter":
+        backend_name = os.getenv("TOKEN_REVOCATION_BACKEND", "memory").lower()
+        store = RedisRevocationStore() if backend_name == "redis" else InMemoryRevocationStore()
+        return cls(
+            store,
+            capacity=int(os.getenv("TOKEN_REVOCATION_CAPACITY", "100000")),
+            error_rate=float(os.getenv("TOKEN_REVOCATION_ERROR_RATE", "0.001")),
+            sync_interval=float(os.getenv("TOKEN_REVOCATION_SYNC_INTERVAL", "1")),
+        )
+
+    @property
+    def synced(self) -> bool:
+        return self._offset is not None
+
+    def current_epoch(self, user_id: str) -> int:
+        return self._epochs.get(user_id, 0)
+
+    async def is_revoked(self, jti: Optional[str], user_id: Optional[str], epoch: int = 0) -> bool:
+        """폐기 여부 (대부분의 유효 토큰은 메모리에서 끝나고, Bloom filter 양성일 때만 공유 저장소 조회)"""
+        self.checks += 1
+        if user_id is not None and epoch < self._epochs.get(user_id, 0):
+            return True
+        if jti is None:
+            return False
+        # 아직 한 번도 동기화하지 못했으면 필터가 비어 있으므로 모든 확인을 저장소에 맡김
+        if self.synced and jti not in self._bloom:
+            return False
+        self.exact_lookups += 1
+        revoked = await self.store.is_revoked(jti, time.time())
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    async def revoke(self, jti: str, expires_at: float):
+        await self.store.revoke(jti, expires_at)
+        self._bloom.add(jti)
+
+    async def revoke_all(self, user_id: str) -> int:
+        epoch = await self.store.bump_epoch(user_id)
+        self._epochs[user_id] = max(epoch, self._epochs.get(user_id, 0))
+        return epoch
+
+    def _apply(self, events: List[RevocationEvent]):
+        for kind, key, value in events:
+            if kind == REVOKE:
+                self._bloom.add(key)
+            elif kind == EPOCH:
+                self._epochs[key] = max(int(value), self._epochs.get(key, 0))
+
+    async def _load_snapshot(self, now: float):
+        offset, revoked, epochs = await self.store.snapshot(now)
+        bloom_capacity = max(self.capacity, len(revoked) * 2)
+        bloom = BloomFilter.for_capacity(bloom_capacity, self.error_rate)
+        for jti in revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._bloom_capacity = bloom_capacity
+        self._epochs = epochs
+        self._offset = offset
+
+    async def sync(self):
+        """공유 저장소의 새 변경을 반영 (처음이거나 로그를 이어 읽을 수 없으면 전체를 다시 읽음)"""
+        now = time.time()
+        # 만료된 jti가 쌓여 필터가 가득 차면 만료되지 않은 항목만으로 새로 만듦
+        if self._offset is None or self._bloom.count >= self._bloom_capacity:
+            await self.store.purge(now)
+            await self._load_snapshot(now)
+        else:
+            result = await self.store.events_since(self._offset)
+            if result is None:
+                await self._load_snapshot(now)
+            else:
+                self._offset, events = result
+                self._apply(events)
+        self.last_sync = now
+
+    async def start(self):
+        if self._task is not None:
+            return
+        try:
+            await self.sync()
+        except Exception as e:
+            self.sync_errors += 1
+            logger.warning(f"⚠️ 토큰 폐기 목록 초기 동기화 실패 (동기화될 때까지 저장소 직접 조회): {e}")
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"🔐 토큰 폐기 목록 동기화 시작 - {self.store.name} ({self.sync_interval}초 주기)")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                self.sync_errors += 1
+                logger.warning(f"⚠️ 토큰 폐기 목록 동기화 실패: {e}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": VERIFY_MODE,
+            "backend": self.store.name,
+            "synced": self.synced,
+            "last_sync": self.last_sync,
+            "sync_errors": self.sync_errors,
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hashes,
+            "bloom_items": self._bloom.count,
+            "bloom_capacity": self._bloom_capacity,
+            "user_epochs": len(self._epochs),
+            "checks": self.checks,
+            "exact_lookups": self.exact_lookups,
+            "false_positives": self.false_positives,
+        }
+
+
+# ✅ 게이트웨이 전역 토큰 폐기 목록 (TOKEN_REVOCATION_BACKEND=memory | redis)
+token_revocations = RevocationFilter.from_env()
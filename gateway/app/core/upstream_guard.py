@@ -0,0 +1,242 @@
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+import math
+import time
+
+from app.core.latency_tracker import LatencyTracker
+from app.domain.model.service_type import ServiceType
+from app.domain.model.upstream_config_model import UpstreamClientConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        # half_open에 들어갈 때마다 1 증가 (이전 half_open 기간의 시험 요청이 새 기간의 슬롯을 반환하지 않게 함)
+        self.half_open_round = 0
+        self.times_opened = 0
+
+    def retry_after(self, now: float) -> float:
+        """open 상태가 끝나기까지 남은 시간(초)"""
+        return max(0.0, self.opened_at + self.open_seconds - now)
+
+    def allow(self, now: float) -> bool:
+        """요청 허용 여부 (open 시간이 지나면 half_open으로 전환해 시험 요청 허용)"""
+        if self.state == OPEN:
+            if self.retry_after(now) > 0:
+                return False
+            self.state = HALF_OPEN
+            self.half_open_calls = 0
+            self.half_open_round += 1
+        if self.state == HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                return False
+            self.half_open_calls += 1
+        return True
+
+    def on_success(self):
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self.state = CLOSED
+
+    def on_failure(self, now: float):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+            self.times_opened += 1
+
+    def trial_round(self) -> Optional[int]:
+        """allow()가 방금 허용한 요청이 시험 요청이면 그 half_open 기간 번호, 아니면 None"""
+        return self.half_open_round if self.state == HALF_OPEN else None
+
+    def on_release(self, trial_round: Optional[int]):
+        """시험 요청 슬롯 반환 (같은 half_open 기간에 허용된 시험 요청만, closed 때 허용된 요청은 반환할 슬롯이 없음)"""
+        if trial_round is not None and self.state == HALF_OPEN and trial_round == self.half_open_round and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD 방식의 동시 요청 한도
+
+    응답이 목표 지연 시간 안에 성공하면 한도를 조금씩(1/limit) 늘리고,
+    실패하거나 목표 지연을 넘으면 backoff 비율만큼 줄입니다.
+    목표 지연이 0이면 지연 시간 이동 평균(EWMA)의 tolerance 배를 목표로 사용합니다
+    (수 ms 수준의 지터로 한도가 줄지 않도록 latency_floor 이하로는 내려가지 않음).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        target_latency: float = 0.0,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        latency_floor: float = 0.05
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.latency_floor = latency_floor
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency_ewma: Optional[float] = None
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.current_limit:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def on_sample(self, latency: float, ok: bool):
+        """응답 지연 시간과 성공 여부로 한도 조정"""
+        target = self.target_latency
+        if target <= 0 and self.latency_ewma is not None:
+            target = max(self.latency_ewma * self.tolerance, self.latency_floor)
+        too_slow = target > 0 and latency > target
+
+        if ok:
+            self.latency_ewma = latency if self.latency_ewma is None else self.latency_ewma * 0.9 + latency * 0.1
+
+        if not ok or too_slow:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+
+class GuardPermit:
+    """업스트림 요청 한 건의 허가 (응답 결과 기록 후 release로 슬롯 반환)"""
+
+    __slots__ = ("guard", "trial_round", "started_at", "released")
+
+    def __init__(self, guard: "UpstreamGuard", trial_round: Optional[int] = None):
+        self.guard = guard
+        # half_open 시험 요청으로 허용된 경우 그 기간 번호
+        self.trial_round = trial_round
+        self.started_at = time.monotonic()
+        self.released = False
+
+    def record(self, ok: bool):
+        """응답 헤더 수신 시점(또는 실패 시점)의 결과 기록"""
+        now = time.monotonic()
+        latency = now - self.started_at
+        self.guard.limiter.on_sample(latency, ok)
+        if ok:
+            self.guard.latency.record(latency)
+            self.guard.breaker.on_success()
+        else:
+            self.guard.breaker.on_failure(now)
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.guard.limiter.release()
+            self.guard.breaker.on_release(self.trial_round)
+
+
+class UpstreamGuard:
+    """서비스별 서킷 브레이커 + 적응형 동시성 한도 + 응답 지연 분포"""
+
+    def __init__(self, service_type: ServiceType, config: UpstreamClientConfig):
+        self.service_type = service_type
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.breaker_failure_threshold,
+            open_seconds=config.breaker_open_seconds,
+            half_open_max_calls=config.breaker_half_open_max_calls,
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=config.limit_initial,
+            min_limit=config.limit_min,
+            max_limit=config.limit_max,
+            target_latency=config.limit_target_latency,
+            backoff=config.limit_backoff,
+        )
+        self.latency = LatencyTracker()
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def acquire(self) -> GuardPermit:
+        """요청 허가 획득, 불가하면 503 + Retry-After로 즉시 실패"""
+        now = time.monotonic()
+        if not self.breaker.allow(now):
+            retry_after = max(1, math.ceil(self.breaker.retry_after(now)))
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.service_type.value} 서비스가 일시적으로 차단되었습니다 (circuit open)",
+                headers={"Retry-After": str(retry_after)}
+            )
+        trial_round = self.breaker.trial_round()
+        if not self.limiter.try_acquire():
+            self.breaker.on_release(trial_round)
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.service_type.value} 서비스 동시 요청 한도 초과",
+                headers={"Retry-After": "1"}
+            )
+        return GuardPermit(self, trial_round)
+
+    @staticmethod
+    def _round(value: Optional[float]) -> Optional[float]:
+        return round(value, 4) if value is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        breaker = self.breaker
+        limiter = self.limiter
+        return {
+            "state": breaker.state,
+            "consecutive_failures": breaker.consecutive_failures,
+            "times_opened": breaker.times_opened,
+            "retry_after": round(breaker.retry_after(time.monotonic()), 2) if breaker.state == OPEN else 0,
+            "concurrency_limit": limiter.current_limit,
+            "in_flight": limiter.in_flight,
+            "rejected": limiter.rejected,
+            "latency_ewma": round(limiter.latency_ewma, 4) if limiter.latency_ewma is not None else None,
+            "latency_p50": self._round(self.latency.percentile(50)),
+            "latency_p95": self._round(self.latency.percentile(95)),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class UpstreamGuardRegistry:
+    """ServiceType별 UpstreamGuard 보관소"""
+
+    def __init__(self):
+        self._guards: Dict[ServiceType, UpstreamGuard] = {}
+
+    def get(self, service_type: ServiceType, config: UpstreamClientConfig) -> UpstreamGuard:
+        guard = self._guards.get(service_type)
+        if guard is None:
+            guard = UpstreamGuard(service_type, config)
+            self._guards[service_type] = guard
+        return guard
+
+    def stats(self) -> Dict[str, Any]:
+        return {service_type.value: guard.stats() for service_type, guard in self._guards.items()}
+
+
+# ✅ 게이트웨이 전역 업스트림 보호 장치
+upstream_guards = UpstreamGuardRegistry()
@@ -0,0 +1,226 @@
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import json
+import logging
+import os
+import random
+
+from app.core.http_client_pool import ServiceClientPool
+from app.domain.model.service_type import ServiceType, service_urls_from_env
+
+logger = logging.getLogger("gateway_api")
+
+# 같은 호스트의 서비스에 Unix 도메인 소켓으로 연결 (예: unix:///run/lif/news.sock)
+UNIX_SCHEME = "unix://"
+
+
+class UpstreamInstance:
+    """업스트림 서비스 인스턴스 하나의 상태
+
+    url이 unix://로 시작하면 socket_path로 연결하고, 요청 URL에는 base_url(http://localhost)을 사용합니다.
+    """
+
+    __slots__ = ("url", "base_url", "socket_path", "outstanding", "healthy", "consecutive_failures", "total_requests")
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        if self.url.startswith(UNIX_SCHEME):
+            self.socket_path: Optional[str] = self.url[len(UNIX_SCHEME):]
+            self.base_url = "http://localhost"
+        else:
+            self.socket_path = None
+            self.base_url = self.url
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.total_requests = 0
+
+    def acquire(self):
+        self.outstanding += 1
+        self.total_requests += 1
+
+    def release(self):
+        self.outstanding = max(0, self.outstanding - 1)
+
+    def mark_success(self):
+        self.consecutive_failures = 0
+        if not self.healthy:
+            logger.info(f"💚 인스턴스 복구: {self.url}")
+        self.healthy = True
+
+    def mark_failure(self, unhealthy_threshold: int):
+        self.consecutive_failures += 1
+        if self.healthy and self.consecutive_failures >= unhealthy_threshold:
+            self.healthy = False
+            logger.warning(f"💔 인스턴스 제외: {self.url} (연속 실패 {self.consecutive_failures}회)")
+
+
+class UpstreamPool:
+    """서비스 하나의 인스턴스 집합과 로드 밸런싱"""
+
+    def __init__(self, service_type: ServiceType, balancer: str = "p2c"):
+        self.service_type = service_type
+        self.balancer = balancer
+        self.instances: List[UpstreamInstance] = []
+
+    def update(self, urls: Iterable[str]):
+        """인스턴스 목록 교체 (기존 인스턴스의 상태와 진행 중인 요청 수는 유지)"""
+        current = {instance.url: instance for instance in self.instances}
+        instances = []
+        for url in urls:
+            url = url.rstrip("/")
+            if url and url not in (instance.url for instance in instances):
+                instances.append(current.get(url) or UpstreamInstance(url))
+        added = [i.url for i in instances if i.url not in current]
+        removed = [url for url in current if url not in {i.url for i in instances}]
+        if added or removed:
+            logger.info(f"🔄 {self.service_type.value} 인스턴스 변경 - 추가: {added}, 제거: {removed}")
+        self.instances = instances
+
+    def pick(self, exclude: Optional[UpstreamInstance] = None) -> Optional[UpstreamInstance]:
+        """요청을 보낼 인스턴스 선택 (정상 인스턴스가 없으면 전체 중에서 선택)"""
+        candidates = [i for i in self.instances if i.healthy and i is not exclude]
+        if not candidates:
+            candidates = [i for i in self.instances if i is not exclude] or self.instances
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.balancer == "least_outstanding":
+            return min(candidates, key=lambda i: i.outstanding)
+        # power of two choices: 임의의 두 인스턴스 중 진행 중인 요청이 적은 쪽
+        first, second = random.sample(candidates, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "url": i.url,
+                "healthy": i.healthy,
+                "outstanding": i.outstanding,
+                "consecutive_failures": i.consecutive_failures,
+                "total_requests": i.total_requests,
+            }
+            for i in self.instances
+        ]
+
+
+class UpstreamRegistry:
+    """ServiceType별 인스턴스 풀 보관소
+
+    인스턴스 목록은 환경 변수(NEWS_SERVICE_URL, 쉼표로 여러 개)에서 읽고,
+    UPSTREAMS_CONFIG_FILE(JSON: {"news": ["http://..."]})이 있으면 그 값을 우선합니다.
+    백그라운드 작업이 주기적으로 설정 파일 변경을 반영(재시작 없이)하고 액티브 헬스 체크를 수행합니다.
+    """
+
+    def __init__(self, config_file: Optional[str] = None, check_interval: Optional[float] = None):
+        self.config_file = config_file
+        self.check_interval = check_interval
+        self._pools: Dict[ServiceType, UpstreamPool] = {}
+        self._config_mtime: Optional[float] = None
+        self._client_pool: Optional[ServiceClientPool] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+
+    def pool_for(self, service_type: ServiceType) -> UpstreamPool:
+        if not self._loaded:
+            self.reload()
+        pool = self._pools.get(service_type)
+        if pool is None:
+            pool = UpstreamPool(service_type)
+            self._pools[service_type] = pool
+        return pool
+
+    def _read_config_file(self) -> Dict[str, List[str]]:
+        path = self.config_file or os.getenv("UPSTREAMS_CONFIG_FILE")
+        if not path or not os.path.exists(path):
+            self._config_mtime = None
+            return {}
+        self._config_mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {name: [urls] if isinstance(urls, str) else list(urls) for name, urls in data.items()}
+
+    def reload(self):
+        """환경 변수와 설정 파일에서 인스턴스 목록을 다시 읽어 반영"""
+        try:
+            file_urls = self._read_config_file()
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ 업스트림 설정 파일 읽기 실패: {e}")
+            file_urls = {}
+        env_urls = service_urls_from_env()
+        for service_type in ServiceType:
+            urls = file_urls.get(service_type.value) or env_urls.get(service_type, [])
+            pool = self._pools.get(service_type)
+            if pool is None:
+                pool = UpstreamPool(service_type)
+                self._pools[service_type] = pool
+            if self._client_pool is not None:
+                pool.balancer = self._client_pool.config_for(service_type).balancer
+            pool.update(urls)
+        self._loaded = True
+
+    def _config_changed(self) -> bool:
+        path = self.config_file or os.getenv("UPSTREAMS_CONFIG_FILE")
+        mtime = os.path.getmtime(path) if path and os.path.exists(path) else None
+        return mtime != self._config_mtime
+
+    async def start(self, client_pool: ServiceClientPool):
+        """인스턴스 목록 로드 후 헬스 체크/설정 감시 작업 시작"""
+        self._client_pool = client_pool
+        self.reload()
+        interval = self.check_interval or float(os.getenv("UPSTREAM_HEALTH_CHECK_INTERVAL", "5"))
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self._config_changed():
+                    self.reload()
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"❌ 업스트림 헬스 체크 작업 오류: {e}")
+
+    async def check_all(self):
+        """모든 인스턴스에 동시에 헬스 체크 요청"""
+        checks = [
+            self._check(service_type, instance)
+            for service_type, pool in self._pools.items()
+            for instance in pool.instances
+        ]
+        if checks:
+            await asyncio.gather(*checks)
+
+    async def _check(self, service_type: ServiceType, instance: UpstreamInstance):
+        config = self._client_pool.config_for(service_type)
+        client = self._client_pool.get(service_type, instance.socket_path)
+        try:
+            response = await client.get(
+                f"{instance.base_url}{config.health_check_path}",
+                timeout=config.health_check_timeout
+            )
+            # 프로세스가 응답하면 정상 (5xx는 비정상)
+            healthy = response.status_code < 500
+        except Exception:
+            healthy = False
+        if healthy:
+            instance.mark_success()
+        else:
+            instance.mark_failure(config.unhealthy_threshold)
+
+    def stats(self) -> Dict[str, Any]:
+        return {service_type.value: pool.stats() for service_type, pool in self._pools.items()}
+
+
+# ✅ 게이트웨이 전역 업스트림 인스턴스 레지스트리 (lifespan에서 start/stop)
+upstream_registry = UpstreamRegistry()
@@ -1,15 +1,30 @@
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Union
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+import logging
+import os
 
-from app.domain.service.token_service import TokenService
-from app.domain.schema.token_schema import TokenSchema, TokenResponseSchema, TokenVerifyResponseSchema
+from app.core import json_codec
+from app.domain.service.token_service import TokenService, token_service
+from app.domain.schema.token_schema import (
+    TokenBatchVerifyResponseSchema,
+    TokenBatchVerifySchema,
+    TokenSchema,
+    TokenResponseSchema,
+    TokenVerifyResponseSchema,
+)
+
+logger = logging.getLogger("gateway_api")
+
+# 이 개수보다 많은 토큰의 일괄 검증 결과는 모아 두지 않고 검증되는 대로 스트리밍 (응답 형식은 같음)
+BATCH_STREAM_THRESHOLD = int(os.getenv("TOKEN_BATCH_STREAM_THRESHOLD", "500"))
 
 class TokenController:
     """토큰 컨트롤러"""
     
-    def __init__(self):
-        """컨트롤러 초기화"""
-        self.service = TokenService()
+    def __init__(self, service: Optional[TokenService] = None):
+        """컨트롤러 초기화 (기본값: 전역 토큰 서비스를 공유해 발급한 토큰을 그대로 검증)"""
+        self.service = service or token_service
     
     async def create_token(self, user_id: str) -> TokenResponseSchema:
         """새 토큰 생성"""
@@ -31,6 +46,19 @@ class TokenController:
                 detail=f"토큰 검증 중 오류 발생: {str(e)}"
             )
     
+    async def verify_tokens(self, batch: TokenBatchVerifySchema) -> Union[TokenBatchVerifyResponseSchema, StreamingResponse]:
+        """토큰 일괄 검증 (결과는 요청 순서대로)"""
+        results = self.service.verify_tokens(batch.tokens)
+        if len(batch.tokens) > BATCH_STREAM_THRESHOLD:
+            return StreamingResponse(_stream_results(results), media_type="application/json")
+        try:
+            return TokenBatchVerifyResponseSchema(results=[result async for result in results])
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"토큰 일괄 검증 중 오류 발생: {str(e)}"
+            )
+    
     async def revoke_token(self, token: str) -> Dict[str, Any]:
         """토큰 폐기"""
         try:
@@ -51,4 +79,19 @@ class TokenController:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"더미 토큰 생성 중 오류 발생: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+
+async def _stream_results(results: AsyncIterator[TokenVerifyResponseSchema]) -> AsyncIterator[bytes]:
+    """{"results": [...]} 본문을 결과가 나오는 대로 조금씩 전송"""
+    yield b'{"results":['
+    first = True
+    try:
+        async for result in results:
+            yield (b"" if first else b",") + json_codec.dumps(result.model_dump())
+            first = False
+    except Exception as e:
+        # 응답 헤더를 이미 보냈으므로 오류 응답 대신 본문을 끊어 클라이언트가 불완전한 응답임을 알게 함
+        logger.error(f"❌ 토큰 일괄 검증 스트리밍 중 오류: {e}")
+        raise
+    yield b"]}"
@@ -1,53 +1,418 @@
-from typing import Optional, Dict
+from typing import AsyncIterable, Iterable, Optional, Dict, Union
 from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+import asyncio
 import httpx
 import logging
+import time
 import traceback
 
-from app.domain.model.service_type import SERVICE_URLS, ServiceType
+from app.core.compression import upstream_accept_encoding
+from app.core.http_client_pool import ServiceClientPool, client_pool as default_client_pool
+from app.core.metrics import GatewayMetrics, gateway_metrics
+from app.core.msgpack_codec import MSGPACK_AVAILABLE, UPSTREAM_ACCEPT, accepts_msgpack
+from app.core.proxy_response import RequestBodyTooLarge
+from app.core.single_flight import RoutePatterns
+from app.core.tracing import Tracer, gateway_tracer
+from app.core.upstream_guard import GuardPermit, UpstreamGuard, UpstreamGuardRegistry, upstream_guards
+from app.core.upstream_pool import UpstreamInstance, UpstreamRegistry, upstream_registry
+from app.domain.model.service_type import ServiceType
+from app.domain.model.upstream_config_model import UpstreamClientConfig
 
 logger = logging.getLogger("gateway_api")
 
+# ✅ 남은 요청 시간 예산(ms): 클라이언트가 보내면 그 값을 기준으로, 업스트림에는 남은 시간으로 갱신해 전달
+DEADLINE_HEADER = "x-request-deadline-ms"
+# 같은 요청을 두 번 보내도 안전한 메서드 (그 외 메서드는 hedge_routes에 등록된 라우트만 헤지)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# 요청 본문: 버퍼링된 바이트 또는 클라이언트에서 받는 대로 전달하는 스트림
+RequestBody = Union[bytes, AsyncIterable[bytes], None]
+
+
+class UpstreamCall:
+    """업스트림 호출 한 건이 점유한 보호 장치 슬롯과 인스턴스 (release는 한 번만 반영)"""
+
+    __slots__ = ("permit", "instance", "released")
+
+    def __init__(self, permit: GuardPermit, instance: UpstreamInstance):
+        self.permit = permit
+        self.instance = instance
+        self.released = False
+        instance.acquire()
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.permit.release()
+            self.instance.release()
+
+
+class GuardedStream(httpx.AsyncByteStream):
+    """스트리밍 응답 본문이 닫힐 때 점유한 슬롯과 인스턴스를 반환"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, call: UpstreamCall):
+        self._stream = stream
+        self._call = call
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._call.release()
+
+
+def proxy_error(e: Exception) -> HTTPException:
+    """업스트림 호출 예외를 원인에 맞는 상태 코드로 변환"""
+    if isinstance(e, httpx.TimeoutException):
+        return HTTPException(status_code=504, detail=f"업스트림 응답 시간 초과: {str(e)}")
+    if isinstance(e, httpx.TransportError):
+        return HTTPException(status_code=502, detail=f"업스트림 연결 실패: {str(e)}")
+    return HTTPException(status_code=500, detail=f"Proxy 요청 실패: {str(e)}")
+
+
+def _close_when_done(task: asyncio.Future):
+    """헤지 경쟁에서 진 호출의 응답을 닫아 커넥션과 슬롯 반환"""
+    def discard(done: asyncio.Future):
+        if done.cancelled():
+            return
+        if done.exception() is None:
+            asyncio.ensure_future(done.result().aclose())
+
+    task.add_done_callback(discard)
+
+
 class ServiceProxyFactory:
-    def __init__(self, service_type: ServiceType):
+    def __init__(
+        self,
+        service_type: ServiceType,
+        client_pool: Optional[ServiceClientPool] = None,
+        guards: Optional[UpstreamGuardRegistry] = None,
+        upstreams: Optional[UpstreamRegistry] = None,
+        metrics: Optional[GatewayMetrics] = None,
+        tracer: Optional[Tracer] = None
+    ):
         self.service_type = service_type
-        self.base_url = SERVICE_URLS[service_type]
-        print(f"🎟🎁🎀🎄 Service URL: {self.base_url}")
+        # ✅ 요청마다 클라이언트를 만들지 않고 lifespan에서 생성된 풀의 클라이언트를 재사용
+        self.client_pool = client_pool or default_client_pool
+        self.guards = guards or upstream_guards
+        self.upstreams = upstreams or upstream_registry
+        self.metrics = metrics or gateway_metrics
+        self.tracer = tracer or gateway_tracer
+        self._hedge_routes: Optional[RoutePatterns] = None
+        self._accept_encoding: Optional[str] = None
 
-    async def request(
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """현재 풀의 서비스 클라이언트 (lifespan 재시작 후에도 유효한 클라이언트 반환)"""
+        return self.client_pool.get(self.service_type)
+
+    @property
+    def config(self) -> UpstreamClientConfig:
+        """서비스 프록시 설정"""
+        return self.client_pool.config_for(self.service_type)
+
+    @property
+    def guard(self) -> UpstreamGuard:
+        """서비스 서킷 브레이커 / 동시성 한도"""
+        return self.guards.get(self.service_type, self.config)
+
+    def pick_instance(self, exclude: Optional[UpstreamInstance] = None) -> UpstreamInstance:
+        """로드 밸런서로 요청을 보낼 인스턴스 선택"""
+        instance = self.upstreams.pool_for(self.service_type).pick(exclude)
+        if instance is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.service_type.value} 서비스 인스턴스가 설정되지 않았습니다"
+            )
+        return instance
+
+    def deadline_for(self, headers: Optional[Dict[str, str]] = None) -> float:
+        """요청 기한(monotonic 시각): 클라이언트가 보낸 예산과 설정된 예산 중 작은 값"""
+        config = self.config
+        budget = config.deadline_budget or config.read_timeout
+        raw = headers.get(DEADLINE_HEADER) if headers else None
+        if raw:
+            try:
+                budget = min(budget, float(raw) / 1000)
+            except ValueError:
+                logger.debug(f"⚠️ 잘못된 {DEADLINE_HEADER} 헤더 무시: {raw}")
+        return time.monotonic() + budget
+
+    def should_hedge(self, method: str, path: str) -> bool:
+        """헤지 요청 대상 여부 (멱등 메서드 또는 hedge_routes에 등록된 라우트)"""
+        config = self.config
+        if not config.hedge_enabled:
+            return False
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        if self._hedge_routes is None:
+            self._hedge_routes = RoutePatterns(config.hedge_routes)
+        return self._hedge_routes.matches(method.upper(), path)
+
+    def hedge_delay(self) -> float:
+        """헤지 요청을 보내기 전 대기 시간 (최근 응답 지연의 hedge_percentile 백분위)"""
+        config = self.config
+        observed = self.guard.latency.percentile(config.hedge_percentile)
+        return max(config.hedge_min_delay, observed or 0.0)
+
+    def _timeout_for(self, remaining: float) -> httpx.Timeout:
+        """남은 기한을 넘지 않도록 줄인 요청별 타임아웃"""
+        config = self.config
+        return httpx.Timeout(
+            connect=min(config.connect_timeout, remaining),
+            read=min(config.read_timeout, remaining),
+            write=min(config.write_timeout, remaining),
+            pool=min(config.pool_timeout, remaining)
+        )
+
+    def _build_request(
         self,
+        base_url: str,
         method: str,
         path: str,
         headers: Optional[Dict[str, str]] = None,
-        body: Optional[bytes] = None
-    ) -> httpx.Response:
-        url = f"{self.base_url}/{self.service_type.value}/{path}"
-        print(f"🎯🎯🎯 Requesting URL: {url}")
+        body: RequestBody = None,
+        query: Optional[str] = None,
+        remaining: Optional[float] = None,
+        socket_path: Optional[str] = None
+    ) -> httpx.Request:
+        url = f"{base_url}/{self.service_type.value}/{path}"
+        if query:
+            url = f"{url}?{query}"
+        logger.debug(f"🎯🎯🎯 Requesting URL: {url}")
 
         # ✅ 기본 헤더 구성
         headers_dict = {
-            "Accept": "application/json",
-            "Content-Type": "application/json"
+            "accept": "application/json",
+            "content-type": "application/json"
         }
 
-        # ✅ 전달된 헤더 병합 (기존 헤더가 우선)
+        # ✅ 전달된 헤더 병합 (전달된 헤더가 우선, 대소문자 중복 방지)
         if headers:
-            headers_dict.update(headers)
+            for key, value in headers.items():
+                headers_dict[key.lower()] = value
+
+        # ✅ 클라이언트와 무관하게 업스트림에는 압축 응답을 요청 (클라이언트 인코딩은 CompressionMiddleware가 맞춤)
+        if self._accept_encoding is None:
+            self._accept_encoding = upstream_accept_encoding(self.config.upstream_accept_encoding)
+        headers_dict["accept-encoding"] = self._accept_encoding
+
+        # ✅ 게이트웨이-서비스 구간은 msgpack으로 요청 (클라이언트가 msgpack을 받으면 Accept를 그대로 전달)
+        if self.config.upstream_msgpack and MSGPACK_AVAILABLE and not accepts_msgpack(headers_dict.get("accept")):
+            headers_dict["accept"] = UPSTREAM_ACCEPT
+
+        # ✅ 현재 업스트림 호출 span의 traceparent 전달 (클라이언트가 보낸 값은 그 하위 span으로 대체)
+        self.tracer.inject(headers_dict)
+
+        # ✅ 업스트림에는 남은 시간 예산을 전달하고, 그 시간을 넘겨 기다리지 않도록 타임아웃도 줄임
+        timeout = httpx.USE_CLIENT_DEFAULT
+        if remaining is not None:
+            headers_dict[DEADLINE_HEADER] = str(int(remaining * 1000))
+            timeout = self._timeout_for(remaining)
+
+        return self.client_pool.get(self.service_type, socket_path).build_request(
+            method=method.upper(),
+            url=url,
+            headers=headers_dict,
+            content=body,  # 바이트 또는 스트림을 변환 없이 전달
+            timeout=timeout
+        )
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        body: RequestBody,
+        query: Optional[str],
+        stream: bool,
+        deadline: Optional[float] = None
+    ) -> httpx.Response:
+        """기한을 정해 업스트림 호출 (헤지 대상이면 느린 응답을 다른 인스턴스와 경쟁시킴)"""
+        if deadline is None:
+            deadline = self.deadline_for(headers)
+        # 스트리밍 본문은 다시 보낼 수 없으므로 헤지하지 않음
+        if isinstance(body, (bytes, type(None))) and self.should_hedge(method, path):
+            return await self._send_hedged(method, path, headers, body, query, stream, deadline)
+        return await self._send_to(self.pick_instance(), method, path, headers, body, query, stream, deadline)
 
+    async def _send_hedged(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        body: RequestBody,
+        query: Optional[str],
+        stream: bool,
+        deadline: float
+    ) -> httpx.Response:
+        """첫 요청이 hedge_delay 안에 응답하지 않으면 다른 인스턴스에 같은 요청을 보내고 먼저 온 응답 사용"""
+        primary = self.pick_instance()
+        first = asyncio.ensure_future(
+            self._send_to(primary, method, path, headers, body, query, stream, deadline)
+        )
+        delay = self.hedge_delay()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method=method.upper(),
-                    url=url,
-                    headers=headers_dict,
-                    content=body  # JSON 바이트로 전달
-                )
-                print(f"✅ Response status: {response.status_code}")
-                print(f"✅ Response text: {response.text}")
-                return response
+            done, _ = await asyncio.wait({first}, timeout=delay)
+        except asyncio.CancelledError:
+            first.cancel()
+            _close_when_done(first)
+            raise
+        if done:
+            return first.result()
+
+        secondary = self.upstreams.pool_for(self.service_type).pick(exclude=primary)
+        if secondary is None or secondary is primary or deadline - time.monotonic() <= 0:
+            return await first
 
+        guard = self.guard
+        guard.hedges += 1
+        logger.debug(f"🪞 헤지 요청: {primary.url} → {secondary.url} ({delay * 1000:.0f}ms 대기 후)")
+        second = asyncio.ensure_future(
+            self._send_to(secondary, method, path, headers, body, query, stream, deadline)
+        )
+        response = await self._first_response([first, second])
+        if second.done() and not second.cancelled() and second.exception() is None and second.result() is response:
+            guard.hedge_wins += 1
+        return response
+
+    async def _first_response(self, tasks: Iterable[asyncio.Future]) -> httpx.Response:
+        """먼저 도착한 정상 응답(5xx 제외) 반환, 나머지 호출은 취소하고 응답은 닫음"""
+        pending = set(tasks)
+        winner: Optional[httpx.Response] = None
+        fallback: Optional[asyncio.Future] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif winner is None and task.result().status_code < 500:
+                        winner = task.result()
+                    elif fallback is None:
+                        fallback = task
+                    else:
+                        _close_when_done(task)
+        finally:
+            for task in pending:
+                task.cancel()
+                _close_when_done(task)
+
+        if winner is not None:
+            if fallback is not None:
+                _close_when_done(fallback)
+            return winner
+        if fallback is not None:
+            return fallback.result()
+        raise error
+
+    async def _send_to(
+        self,
+        instance: UpstreamInstance,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        body: RequestBody,
+        query: Optional[str],
+        stream: bool,
+        deadline: float
+    ) -> httpx.Response:
+        """인스턴스 하나에 보내는 업스트림 호출을 client span으로 기록"""
+        with self.tracer.span(f"{method.upper()} {self.service_type.value}", kind="client") as span:
+            span.set_attribute("http.method", method.upper())
+            span.set_attribute("http.target", f"/{self.service_type.value}/{path}")
+            span.set_attribute("upstream.instance", instance.url)
+            response = await self._call_instance(instance, method, path, headers, body, query, stream, deadline)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.status = "error"
+            return response
+
+    async def _call_instance(
+        self,
+        instance: UpstreamInstance,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        body: RequestBody,
+        query: Optional[str],
+        stream: bool,
+        deadline: float
+    ) -> httpx.Response:
+        """서킷 브레이커와 동시성 한도를 거쳐 인스턴스 하나에 업스트림 호출 (한도 초과 시 503 즉시 반환)"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(status_code=504, detail="요청 기한이 지나 업스트림을 호출하지 않았습니다")
+        request = self._build_request(instance.base_url, method, path, headers, body, query, remaining, instance.socket_path)
+        client = self.client_pool.get(self.service_type, instance.socket_path)
+        call = UpstreamCall(self.guard.acquire(), instance)
+        started = time.perf_counter()
+        try:
+            response = await client.send(request, stream=stream)
+        except asyncio.CancelledError:
+            call.release()
+            raise
+        except RequestBodyTooLarge:
+            call.release()
+            raise HTTPException(status_code=413, detail=f"요청 본문이 허용 크기({self.config.max_body_bytes} bytes)를 넘었습니다")
+        except ClientDisconnect:
+            call.release()
+            raise HTTPException(status_code=400, detail="요청 본문 업로드 중 클라이언트 연결이 끊어졌습니다")
         except Exception as e:
+            self.metrics.observe_upstream(self.service_type.value, time.perf_counter() - started, ok=False)
+            if isinstance(e, httpx.TimeoutException) and headers and DEADLINE_HEADER in headers:
+                # 클라이언트가 정한 기한 안에 응답하지 못한 것은 업스트림 실패로 집계하지 않음
+                call.release()
+                raise proxy_error(e)
+            call.permit.record(ok=False)
+            if isinstance(e, httpx.TransportError):
+                # 패시브 헬스 체크: 연결 실패가 이어지면 로테이션에서 제외
+                instance.mark_failure(self.config.unhealthy_threshold)
+            call.release()
             error_traceback = traceback.format_exc()
-            logger.error(f"❌ 요청 실패:\n{error_traceback}") # <--- 수정
-            raise HTTPException(status_code=500, detail=f"Proxy 요청 실패: {str(e)}") 
-          
+            logger.error(f"❌ 요청 실패 ({instance.url}):\n{error_traceback}") # <--- 수정
+            raise proxy_error(e)
+
+        self.metrics.observe_upstream(self.service_type.value, time.perf_counter() - started, ok=response.status_code < 500)
+        call.permit.record(ok=response.status_code < 500)
+        instance.mark_success()
+        logger.debug(f"✅ Response status: {response.status_code}")
+        if stream:
+            # 본문 전달이 끝날 때까지 동시 요청 슬롯 유지
+            response.stream = GuardedStream(response.stream, call)
+        else:
+            call.release()
+        return response
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: RequestBody = None,
+        query: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> httpx.Response:
+        """업스트림 요청 후 본문 전체를 읽은 응답 반환 (응답 변환이 필요한 경우용)"""
+        return await self._send(method, path, headers, body, query, stream=False, deadline=deadline)
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: RequestBody = None,
+        query: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> httpx.Response:
+        """업스트림 요청 후 헤더까지만 받은 스트리밍 응답 반환
+
+        본문은 읽지 않은 상태이므로 호출자가 aiter_raw()로 전달한 뒤 aclose()해야 합니다.
+        """
+        return await self._send(method, path, headers, body, query, stream=True, deadline=deadline)
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict, List
 import os
 
 
@@ -7,10 +8,23 @@ class ServiceType(str, Enum):
     SASB = "sasb"
     ISSUEPOOL = "issuepool"
 
-# ✅ 환경 변수에서 서비스 URL 가져오기
-NEWS_SERVICE_URL = os.getenv("NEWS_SERVICE_URL")
 
+def service_urls_from_env() -> Dict["ServiceType", List[str]]:
+    """환경 변수에서 서비스별 인스턴스 URL 목록을 읽어옵니다
 
+    NEWS_SERVICE_URL(없으면 NEWS_SERVICE_INTERNAL_URL)에 쉼표로 여러 인스턴스를 지정할 수 있습니다.
+    같은 호스트의 서비스는 unix:///run/lif/news.sock처럼 Unix 도메인 소켓 경로로도 지정할 수 있습니다.
+    """
+    urls: Dict[ServiceType, List[str]] = {}
+    for service_type in ServiceType:
+        raw = os.getenv(f"{service_type.name}_SERVICE_URL") or os.getenv(f"{service_type.name}_SERVICE_INTERNAL_URL")
+        urls[service_type] = [url.strip().rstrip("/") for url in raw.split(",") if url.strip()] if raw else []
+    return urls
+
+
+# ✅ 환경 변수에서 서비스 URL 가져오기 (서비스별 첫 번째 인스턴스)
 SERVICE_URLS = {
-    ServiceType.NEWS: NEWS_SERVICE_URL,
-}
\ No newline at end of file
+    service_type: urls[0]
+    for service_type, urls in service_urls_from_env().items()
+    if urls
+}
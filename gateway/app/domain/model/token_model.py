@@ -7,4 +7,5 @@ class TokenModel(BaseModel):
     user_id: str
     expires_at: datetime
     is_revoked: bool = False
+    epoch: int = 0  # 발급 시점의 사용자 폐기 세대 (사용자의 현재 세대보다 작으면 폐기된 토큰)
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
\ No newline at end of file
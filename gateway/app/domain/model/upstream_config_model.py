@@ -0,0 +1,66 @@
+from typing import List
+from pydantic import BaseModel, Field
+import os
+
+from app.domain.model.service_type import ServiceType
+
+
+class UpstreamClientConfig(BaseModel):
+    """업스트림 서비스별 프록시 설정 (커넥션 풀, 타임아웃, 캐시, 요청 병합, 서킷 브레이커, 로드 밸런싱, 헤지 요청)"""
+    max_connections: int = Field(100, description="최대 동시 커넥션 수")
+    max_keepalive_connections: int = Field(20, description="유지할 keep-alive 커넥션 수")
+    keepalive_expiry: float = Field(30.0, description="유휴 keep-alive 커넥션 만료 시간(초)")
+    connect_timeout: float = Field(5.0, description="커넥션 연결 타임아웃(초)")
+    read_timeout: float = Field(60.0, description="응답 읽기 타임아웃(초)")
+    write_timeout: float = Field(30.0, description="요청 쓰기 타임아웃(초)")
+    pool_timeout: float = Field(5.0, description="풀에서 커넥션을 얻기까지의 대기 타임아웃(초)")
+    http2: bool = Field(False, description="HTTP/2 사용 여부 (h2 패키지 필요)")
+    upstream_accept_encoding: str = Field("br, gzip", description="업스트림에 요청할 응답 압축 (게이트웨이가 풀 수 있는 것만 사용, 클라이언트에는 다시 협상)")
+    upstream_msgpack: bool = Field(False, description="업스트림에 MessagePack 응답 요청 (msgpack을 받지 않는 클라이언트에는 게이트웨이가 응답 전체를 버퍼링해 JSON으로 변환, 스트리밍 안 됨)")
+    max_body_bytes: int = Field(100 * 1024 * 1024, description="요청 본문 최대 크기(바이트), 0이면 무제한")
+    stream_upload_threshold: int = Field(1024 * 1024, description="이 크기를 넘는(또는 길이를 모르는) 요청 본문은 버퍼링 없이 스트리밍 전달")
+    validate_json: bool = Field(False, description="JSON 요청 본문 형식 검사 여부 (잘못된 본문은 업스트림에 보내지 않고 400)")
+    cache_enabled: bool = Field(False, description="GET 응답 캐시 사용 여부")
+    cache_ttl: float = Field(30.0, description="업스트림 Cache-Control이 없을 때의 캐시 TTL(초)")
+    cache_stale_ttl: float = Field(60.0, description="만료 후 재검증하는 동안 이전 응답을 제공하는 시간(초)")
+    coalesce_routes: List[str] = Field(default_factory=list, description="동일 요청 병합 대상 라우트 (METHOD:경로 패턴, 예: POST:search)")
+    coalesce_key_headers: List[str] = Field(default_factory=list, description="병합 키에 추가로 포함할 요청 헤더 (authorization, cookie는 항상 포함, 예: x-tenant-id)")
+    breaker_failure_threshold: int = Field(5, description="서킷을 여는 연속 실패 횟수")
+    breaker_open_seconds: float = Field(30.0, description="서킷이 열린 뒤 시험 요청을 허용하기까지의 시간(초)")
+    breaker_half_open_max_calls: int = Field(1, description="half-open 상태에서 허용할 동시 시험 요청 수")
+    limit_initial: int = Field(20, description="동시 요청 한도 초기값")
+    limit_min: int = Field(1, description="동시 요청 한도 최소값")
+    limit_max: int = Field(200, description="동시 요청 한도 최대값")
+    limit_target_latency: float = Field(0.0, description="한도를 줄이기 시작하는 응답 지연(초), 0이면 평균 지연 기준으로 자동 산정")
+    limit_backoff: float = Field(0.9, description="실패/지연 시 한도 감소 비율")
+    balancer: str = Field("p2c", description="인스턴스 선택 방식 (p2c | least_outstanding)")
+    health_check_path: str = Field("/health", description="액티브 헬스 체크 경로")
+    health_check_timeout: float = Field(2.0, description="헬스 체크 타임아웃(초)")
+    unhealthy_threshold: int = Field(3, description="인스턴스를 로테이션에서 제외하는 연속 실패 횟수")
+    hedge_enabled: bool = Field(False, description="멱등 요청(GET/HEAD/OPTIONS)의 헤지 요청 사용 여부")
+    hedge_routes: List[str] = Field(default_factory=list, description="헤지 요청을 허용할 추가 라우트 (METHOD:경로 패턴, 예: POST:search)")
+    hedge_percentile: float = Field(95.0, description="헤지 요청을 보내기까지 기다리는 지연 백분위")
+    hedge_min_delay: float = Field(0.05, description="헤지 요청 대기 시간 최소값(초), 표본이 없을 때도 사용")
+    deadline_budget: float = Field(0.0, description="클라이언트가 기한을 보내지 않았을 때의 요청 시간 예산(초), 0이면 read_timeout")
+
+
+def _env(service_type: ServiceType, name: str):
+    """서비스별 환경 변수(NEWS_PROXY_*)를 먼저 보고, 없으면 공통 값(PROXY_*)을 사용"""
+    return os.getenv(f"{service_type.name}_PROXY_{name}", os.getenv(f"PROXY_{name}"))
+
+
+def load_upstream_client_config(service_type: ServiceType) -> UpstreamClientConfig:
+    """환경 변수에서 서비스별 클라이언트 설정을 읽어옵니다"""
+    values = {}
+    for field_name in UpstreamClientConfig.model_fields:
+        raw = _env(service_type, field_name.upper())
+        if raw is None:
+            continue
+        annotation = UpstreamClientConfig.model_fields[field_name].annotation
+        if annotation is bool:
+            values[field_name] = raw.strip().lower() in ("1", "true", "yes", "on")
+        elif annotation == List[str]:
+            values[field_name] = [item.strip() for item in raw.split(",") if item.strip()]
+        else:
+            values[field_name] = raw
+    return UpstreamClientConfig(**values)
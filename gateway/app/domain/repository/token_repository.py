@@ -1,52 +1,151 @@
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, UTC
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
 from app.domain.model.token_model import TokenModel
 
+logger = logging.getLogger("gateway_api")
+
+# 한 번에 제거하는 만료 토큰 수 (저장/조회가 오래 멈추지 않게 조금씩 나눠 제거)
+EVICTION_SLICE = int(os.getenv("TOKEN_EVICTION_SLICE", "64"))
+# 백그라운드 제거 주기(초) - 요청이 없을 때도 만료 토큰을 비움
+EVICTION_INTERVAL = float(os.getenv("TOKEN_EVICTION_INTERVAL", "30"))
+
 class TokenRepository:
-    """토큰 저장소 클래스"""
-    
-    def __init__(self):
+    """토큰 저장소 클래스
+
+    만료 시각 min-heap으로 만료된 토큰을 찾아 EVICTION_SLICE개씩 제거합니다.
+    저장할 때마다 한 조각씩 제거하므로(추가 1건당 최대 EVICTION_SLICE건 제거) 메모리는 만료되지 않은 토큰 수에 비례하고,
+    start()로 백그라운드 제거를 켜면 요청이 없는 동안에도 같은 크기의 조각으로 비웁니다.
+    폐기된 토큰은 검증 결과를 유지하기 위해 만료될 때까지 보관합니다.
+
+    사용자 전체 폐기는 사용자별 세대(epoch)를 1 올리는 것으로 끝나며(O(1)),
+    토큰은 발급 시점 세대가 사용자의 현재 세대보다 작으면 폐기된 것으로 봅니다.
+    """
+
+    def __init__(self, eviction_slice: int = EVICTION_SLICE, eviction_interval: float = EVICTION_INTERVAL):
         """저장소 초기화"""
         self._tokens: Dict[str, TokenModel] = {}
-        self._user_tokens: Dict[str, List[str]] = {}
-    
+        # 사용자별 토큰 (dict를 순서 있는 집합으로 사용, 토큰이 모두 제거되면 사용자 키도 삭제)
+        self._user_tokens: Dict[str, Dict[str, None]] = {}
+        # (만료 시각, 순번, 토큰) - 같은 토큰을 다시 저장하면 이전 항목은 제거 시 건너뜀
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        # 사용자별 현재 폐기 세대 (없으면 0, 사용자의 토큰이 모두 만료되면 삭제)
+        self._user_epochs: Dict[str, int] = {}
+        self.eviction_slice = eviction_slice
+        self.eviction_interval = eviction_interval
+        self.evicted = 0
+        self._task: Optional[asyncio.Task] = None
+
     async def save(self, token: TokenModel) -> TokenModel:
         """토큰 저장"""
+        self.evict_expired()
         self._tokens[token.token] = token
-        
-        if token.user_id not in self._user_tokens:
-            self._user_tokens[token.user_id] = []
-        
-        self._user_tokens[token.user_id].append(token.token)
+        self._user_tokens.setdefault(token.user_id, {})[token.token] = None
+        heapq.heappush(self._expiry_heap, (token.expires_at.timestamp(), next(self._sequence), token.token))
         return token
-    
+
     async def find_by_token(self, token: str) -> Optional[TokenModel]:
         """토큰으로 조회"""
         return self._tokens.get(token)
-    
+
+    async def find_many(self, tokens: List[str]) -> List[Optional[TokenModel]]:
+        """여러 토큰을 한 번에 조회 (입력 순서대로, 없는 토큰은 None)"""
+        get = self._tokens.get
+        return [get(token) for token in tokens]
+
     async def find_by_user_id(self, user_id: str) -> List[TokenModel]:
-        """사용자 ID로 토큰 조회"""
-        token_ids = self._user_tokens.get(user_id, [])
+        """사용자 ID로 토큰 조회 (모델을 바꾸지 않으므로 사용자 전체 폐기 여부는 is_revoked()로 확인)"""
+        token_ids = self._user_tokens.get(user_id, {})
         return [self._tokens[token_id] for token_id in token_ids if token_id in self._tokens]
-    
+
+    def current_epoch(self, user_id: str) -> int:
+        """새로 발급하는 토큰에 넣을 사용자의 현재 폐기 세대"""
+        return self._user_epochs.get(user_id, 0)
+
+    def is_revoked(self, token_model: TokenModel) -> bool:
+        """개별 폐기 또는 사용자 전체 폐기(세대 증가) 여부"""
+        return token_model.is_revoked or token_model.epoch < self._user_epochs.get(token_model.user_id, 0)
+
     async def revoke(self, token: str) -> Optional[TokenModel]:
         """토큰 폐기"""
         token_model = self._tokens.get(token)
         if token_model:
             token_model.is_revoked = True
-            self._tokens[token] = token_model
         return token_model
-    
-    async def revoke_all_for_user(self, user_id: str) -> List[TokenModel]:
-        """사용자의 모든 토큰 폐기"""
-        revoked_tokens = []
-        token_ids = self._user_tokens.get(user_id, [])
-        
-        for token_id in token_ids:
-            if token_id in self._tokens:
-                token_model = self._tokens[token_id]
-                token_model.is_revoked = True
-                self._tokens[token_id] = token_model
-                revoked_tokens.append(token_model)
-                
-        return revoked_tokens
\ No newline at end of file
+
+    async def revoke_all_for_user(self, user_id: str) -> int:
+        """사용자의 모든 토큰 폐기 (세대를 올려 이전에 발급된 토큰을 모두 무효화하고 새 세대 반환)"""
+        if user_id not in self._user_tokens:
+            # 저장된 토큰이 없으면 무효화할 대상이 없으므로 세대를 기록하지 않음
+            return self._user_epochs.get(user_id, 0)
+        epoch = self._user_epochs.get(user_id, 0) + 1
+        self._user_epochs[user_id] = epoch
+        return epoch
+
+    def evict_expired(self, limit: Optional[int] = None, now: Optional[float] = None) -> int:
+        """만료 시각이 지난 토큰을 최대 limit개(기본 EVICTION_SLICE) 제거하고 제거한 수 반환"""
+        limit = self.eviction_slice if limit is None else limit
+        now = time.time() if now is None else now
+        heap = self._expiry_heap
+        removed = 0
+        popped = 0
+        while heap and popped < limit and heap[0][0] <= now:
+            expires_at, _, token = heapq.heappop(heap)
+            popped += 1
+            token_model = self._tokens.get(token)
+            # 같은 토큰이 더 늦은 만료 시각으로 다시 저장된 경우의 이전 항목
+            if token_model is None or token_model.expires_at.timestamp() != expires_at:
+                continue
+            del self._tokens[token]
+            user_tokens = self._user_tokens.get(token_model.user_id)
+            if user_tokens is not None:
+                user_tokens.pop(token, None)
+                if not user_tokens:
+                    # 남은 토큰이 없으면 이전 세대 토큰도 모두 만료된 것이므로 세대 기록도 삭제
+                    del self._user_tokens[token_model.user_id]
+                    self._user_epochs.pop(token_model.user_id, None)
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def start(self):
+        """백그라운드 만료 토큰 제거 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🧹 토큰 만료 제거 시작 ({self.eviction_interval}초 주기, {self.eviction_slice}개씩)")
+
+    async def stop(self):
+        """백그라운드 만료 토큰 제거 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            # 한 조각씩 제거하고 다른 요청에 이벤트 루프를 양보
+            while self._expiry_heap and self._expiry_heap[0][0] <= time.time():
+                self.evict_expired()
+                await asyncio.sleep(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 토큰/사용자 수와 누적 제거 수"""
+        next_expiry = self._expiry_heap[0][0] if self._expiry_heap else None
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._user_tokens),
+            "user_epochs": len(self._user_epochs),
+            "expiry_index": len(self._expiry_heap),
+            "evicted": self.evicted,
+            "next_expiry": datetime.fromtimestamp(next_expiry, UTC).isoformat() if next_expiry is not None else None,
+        }
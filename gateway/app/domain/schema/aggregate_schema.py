@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+from app.domain.model.service_type import ServiceType
+
+class AggregateRequestSchema(BaseModel):
+    """기업별 서비스 결과 통합 조회 요청 스키마 (company_name 또는 company_names 중 하나 이상)"""
+    company_name: Optional[str] = Field(None, description="조회할 기업명", example="샘플전자")
+    company_names: List[str] = Field(default_factory=list, description="여러 기업을 한 번에 조회할 때의 기업명 목록")
+    services: List[ServiceType] = Field(default_factory=lambda: list(ServiceType), description="조회할 서비스 (기본: 전체)")
+    timeout: Optional[float] = Field(None, gt=0, description="전체 시간 예산(초), 없으면 AGGREGATE_TIMEOUT")
+
+    def companies(self) -> List[str]:
+        """중복과 빈 값을 제외한 기업명 목록 (입력 순서 유지)"""
+        names = ([self.company_name] if self.company_name else []) + self.company_names
+        return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+class AggregateSectionSchema(BaseModel):
+    """서비스 하나의 조회 결과"""
+    status: str = Field(..., description="ok | error | timeout")
+    status_code: Optional[int] = Field(None, description="업스트림(또는 게이트웨이) 응답 상태 코드")
+    elapsed_ms: float = Field(..., description="소요 시간(ms)")
+    data: Optional[Any] = Field(None, description="업스트림 응답 본문")
+    error: Optional[str] = Field(None, description="실패 사유")
+
+class CompanyAggregateSchema(BaseModel):
+    """기업 하나의 서비스별 조회 결과"""
+    company_name: str = Field(..., description="기업명")
+    sections: Dict[str, AggregateSectionSchema] = Field(..., description="서비스별 결과 (news, sasb, issuepool)")
+
+class AggregateResponseSchema(BaseModel):
+    """통합 조회 응답 스키마"""
+    results: List[CompanyAggregateSchema] = Field(..., description="기업별 결과 (요청 순서)")
+    partial: bool = Field(..., description="실패하거나 시간 안에 응답하지 않은 서비스가 있는지 여부")
+    elapsed_ms: float = Field(..., description="전체 소요 시간(ms)")
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import os
+
+# 한 번에 검증할 수 있는 최대 토큰 수
+BATCH_VERIFY_MAX_TOKENS = int(os.getenv("TOKEN_BATCH_MAX_TOKENS", "10000"))
 
 class TokenSchema(BaseModel):
     """클라이언트로부터 받은 토큰을 검증하기 위한 스키마"""
@@ -15,4 +19,12 @@ class TokenVerifyResponseSchema(BaseModel):
     """토큰 검증 결과 스키마"""
     is_valid: bool = Field(..., description="토큰 유효성")
     user_id: Optional[str] = Field(None, description="사용자 ID")
-    payload: Optional[Dict[str, Any]] = Field(None, description="토큰 페이로드")
\ No newline at end of file
+    payload: Optional[Dict[str, Any]] = Field(None, description="토큰 페이로드")
+
+class TokenBatchVerifySchema(BaseModel):
+    """여러 토큰을 한 번에 검증하기 위한 스키마"""
+    tokens: List[str] = Field(..., min_length=1, max_length=BATCH_VERIFY_MAX_TOKENS, description="검증할 토큰 목록 (결과는 같은 순서로 반환)")
+
+class TokenBatchVerifyResponseSchema(BaseModel):
+    """토큰 일괄 검증 결과 스키마"""
+    results: List[TokenVerifyResponseSchema] = Field(..., description="요청한 토큰 순서대로의 검증 결과")
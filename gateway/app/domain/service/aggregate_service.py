@@ -0,0 +1,128 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+import asyncio
+import logging
+import os
+import time
+
+from app.core import json_codec
+from app.core.msgpack_codec import decode_body
+from app.domain.model.service_proxy_factory import ServiceProxyFactory
+from app.domain.model.service_type import ServiceType
+from app.domain.schema.aggregate_schema import (
+    AggregateRequestSchema,
+    AggregateResponseSchema,
+    AggregateSectionSchema,
+    CompanyAggregateSchema,
+)
+
+logger = logging.getLogger("gateway_api")
+
+# 각 서비스의 기업명 조회 경로 (POST /{service}/search, 본문: {"company_name": ...})
+SEARCH_PATH = "search"
+
+
+class AggregateService:
+    """여러 서비스의 기업 조회 결과를 동시에 호출해 하나의 응답으로 합치는 서비스
+
+    전체 시간 예산 안에 응답하지 않은 서비스는 timeout으로 표시하고
+    나머지 결과만으로 응답합니다 (가장 느린 업스트림이 응답 시간의 상한).
+    """
+
+    def __init__(
+        self,
+        factory_for: Callable[[ServiceType], ServiceProxyFactory],
+        timeout: Optional[float] = None,
+        max_companies: Optional[int] = None
+    ):
+        self.factory_for = factory_for
+        self.timeout = timeout or float(os.getenv("AGGREGATE_TIMEOUT", "10"))
+        self.max_companies = max_companies or int(os.getenv("AGGREGATE_MAX_COMPANIES", "20"))
+
+    async def aggregate(self, request: AggregateRequestSchema, headers: Dict[str, str]) -> AggregateResponseSchema:
+        companies = request.companies()
+        if not companies:
+            raise HTTPException(status_code=400, detail="company_name 또는 company_names가 필요합니다")
+        if len(companies) > self.max_companies:
+            raise HTTPException(status_code=400, detail=f"한 번에 조회할 수 있는 기업은 최대 {self.max_companies}개입니다")
+
+        services = list(dict.fromkeys(request.services))
+        budget = min(request.timeout, self.timeout) if request.timeout else self.timeout
+        started = time.monotonic()
+        deadline = started + budget
+
+        calls: Dict[Tuple[str, ServiceType], asyncio.Task] = {
+            (company, service_type): asyncio.create_task(self._call(service_type, company, headers, deadline))
+            for company in companies
+            for service_type in services
+        }
+        pending = set(calls.values())
+        try:
+            _, pending = await asyncio.wait(pending, timeout=budget)
+        finally:
+            # 시간 예산을 넘긴 호출(또는 클라이언트 연결 종료 시 전체)은 취소
+            for task in pending:
+                task.cancel()
+
+        results: List[CompanyAggregateSchema] = []
+        partial = False
+        for company in companies:
+            sections = {}
+            for service_type in services:
+                task = calls[(company, service_type)]
+                if task in pending:
+                    section = AggregateSectionSchema(
+                        status="timeout",
+                        elapsed_ms=round(budget * 1000, 1),
+                        error=f"{budget}초 안에 응답하지 않았습니다"
+                    )
+                else:
+                    section = task.result()
+                partial = partial or section.status != "ok"
+                sections[service_type.value] = section
+            results.append(CompanyAggregateSchema(company_name=company, sections=sections))
+
+        elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+        if partial:
+            logger.warning(f"⚠️ 통합 조회 일부 실패 - 기업 {len(companies)}개, 서비스 {len(services)}개, {elapsed_ms}ms")
+        return AggregateResponseSchema(results=results, partial=partial, elapsed_ms=elapsed_ms)
+
+    async def _call(
+        self,
+        service_type: ServiceType,
+        company_name: str,
+        headers: Dict[str, str],
+        deadline: float
+    ) -> AggregateSectionSchema:
+        """서비스 하나 호출 (실패는 예외 대신 섹션 상태로 반환)"""
+        started = time.monotonic()
+        body = json_codec.dumps({"company_name": company_name})
+        try:
+            response = await self.factory_for(service_type).request(
+                method="POST", path=SEARCH_PATH, headers=headers, body=body, deadline=deadline
+            )
+        except HTTPException as e:
+            return AggregateSectionSchema(
+                status="timeout" if e.status_code == 504 else "error",
+                status_code=e.status_code,
+                elapsed_ms=self._elapsed_ms(started),
+                error=str(e.detail)
+            )
+
+        try:
+            # 서비스가 msgpack으로 응답하면 msgpack을 바로 풀고, JSON 직렬화는 통합 응답에서 한 번만 수행
+            data = decode_body(response.headers.get("content-type"), response.content)
+        except ValueError:
+            data = response.text
+        ok = 200 <= response.status_code < 300
+        return AggregateSectionSchema(
+            status="ok" if ok else "error",
+            status_code=response.status_code,
+            elapsed_ms=self._elapsed_ms(started),
+            data=data,
+            error=None if ok else f"{service_type.value} 서비스 응답 오류 ({response.status_code})"
+        )
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.monotonic() - started) * 1000, 1)
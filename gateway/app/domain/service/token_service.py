@@ -1,46 +1,115 @@
-from typing import Dict, Optional, Any
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime, timedelta, UTC
+import asyncio
+import os
+import time
 import uuid
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
 
+from app.core.signing_keys import KeyRing, local_token_verifier, token_keyring
+from app.core.token_revocation import STATELESS, VERIFY_MODE, RevocationFilter, token_revocations
 from app.domain.repository.token_repository import TokenRepository
 from app.domain.model.token_model import TokenModel
 from app.domain.schema.token_schema import TokenSchema, TokenResponseSchema, TokenVerifyResponseSchema
+from app.core.token_verifier import TokenVerificationError, TokenVerifier
 
-# 토큰 설정
+# 토큰 설정 (TOKEN_SIGNING_ALG가 RS256/ES256/EdDSA면 SECRET_KEY 대신 signing_keys의 키로 서명)
 SECRET_KEY = "your-secret-key-for-testing-only-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ISSUER = os.getenv("TOKEN_ISSUER") or None
+
+# 서명 검증을 마친 토큰 → 클레임 캐시 크기 (자주 쓰이는 토큰의 HMAC 재계산 생략)
+CLAIMS_CACHE_SIZE = int(os.getenv("TOKEN_CLAIMS_CACHE_SIZE", "10000"))
+# 일괄 검증 시 스레드 하나가 검증하는 토큰 수와 동시에 검증하는 스레드 수
+BATCH_CHUNK_SIZE = max(1, int(os.getenv("TOKEN_BATCH_CHUNK_SIZE", "128")))
+BATCH_DECODE_THREADS = max(1, int(os.getenv("TOKEN_BATCH_DECODE_THREADS", str(min(4, os.cpu_count() or 1)))))
+
+class ClaimsCache:
+    """최근 검증한 토큰의 클레임 LRU (만료 시각이 지난 항목은 조회 시 버림)"""
+
+    def __init__(self, max_size: int = CLAIMS_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str, now: float) -> Optional[Dict[str, Any]]:
+        claims = self._entries.get(token)
+        if claims is None or claims.get("exp", 0) <= now:
+            if claims is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+        self._entries[token] = claims
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
 
 class TokenService:
-    """토큰 서비스"""
+    """토큰 서비스
+
+    TOKEN_VERIFY_MODE=stateless면 저장소를 조회하지 않고 서명/만료를 직접 확인한 뒤
+    jti와 사용자 세대만 폐기 목록(인스턴스 간 동기화)에서 확인합니다.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        revocations: Optional[RevocationFilter] = None,
+        mode: str = VERIFY_MODE,
+        keyring: Optional[KeyRing] = None,
+        verifier: Optional[TokenVerifier] = None,
+        repository: Optional[TokenRepository] = None,
+    ):
         """서비스 초기화"""
-        self.repository = TokenRepository()
+        self.repository = repository or TokenRepository()
+        self.keyring = keyring or token_keyring
+        self.verifier = verifier or local_token_verifier
+        self.revocations = revocations or token_revocations
+        self.stateless = mode == STATELESS
+        self.claims_cache = ClaimsCache()
     
     async def create_token(self, user_id: str) -> TokenResponseSchema:
         """새 토큰 생성"""
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         expires = datetime.now(UTC) + expires_delta
+        if self.stateless:
+            epoch = self.revocations.current_epoch(user_id)
+        else:
+            epoch = self.repository.current_epoch(user_id)
         
-        # 토큰 페이로드
+        # 토큰 페이로드 (epoch: 발급 시점의 사용자 폐기 세대)
         payload = {
             "sub": user_id,
-            "exp": expires,
-            "iat": datetime.now(UTC),
-            "jti": str(uuid.uuid4())
+            "exp": int(expires.timestamp()),
+            "iat": int(datetime.now(UTC).timestamp()),
+            "jti": str(uuid.uuid4()),
+            "epoch": epoch
         }
+        if ISSUER:
+            payload["iss"] = ISSUER
         
-        # JWT 토큰 생성
-        access_token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+        # JWT 토큰 생성 (비대칭 서명이면 현재 기간 키로 서명하고 헤더에 kid 포함)
+        if self.keyring is not None:
+            access_token = self.keyring.sign(payload)
+        else:
+            access_token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
         
         # 토큰 저장
         token_model = TokenModel(
             token=access_token,
             user_id=user_id,
-            expires_at=expires
+            expires_at=expires,
+            epoch=epoch
         )
         
         await self.repository.save(token_model)
@@ -55,47 +124,150 @@ class TokenService:
         """토큰 검증"""
         token = token_schema.token
         
+        if self.stateless:
+            payload = self.claims_cache.get(token, time.time())
+            if payload is None:
+                payload = self._decode_or_none(token)
+                if payload is not None:
+                    self.claims_cache.put(token, payload)
+            return await self._stateless_result(payload)
+        
         # 토큰 모델 조회
         token_model = await self.repository.find_by_token(token)
         
-        # 토큰이 저장소에 없거나 폐기된 경우
-        if not token_model or token_model.is_revoked:
+        # 토큰이 저장소에 없거나 폐기된 경우 (사용자 전체 폐기 후 이전 세대 토큰 포함)
+        if not token_model or self.repository.is_revoked(token_model):
+            return self._stateful_result(None, None)
+        
+        return self._stateful_result(token_model, self._decode_or_none(token))
+    
+    async def verify_tokens(self, tokens: List[str]) -> AsyncIterator[TokenVerifyResponseSchema]:
+        """여러 토큰을 검증해 요청 순서대로 결과 반환
+        
+        BATCH_CHUNK_SIZE * BATCH_DECODE_THREADS개씩 나눠 처리하므로 큰 배치도 앞부분 결과부터 바로 내보낼 수 있습니다.
+        각 묶음은 저장소를 한 번만 조회하고, 같은 토큰은 한 번만 검증하며,
+        서명 검증은 스레드에서 나눠 실행해 이벤트 루프를 막지 않습니다.
+        """
+        window = max(1, BATCH_CHUNK_SIZE * BATCH_DECODE_THREADS)
+        for start in range(0, len(tokens), window):
+            for result in await self._verify_window(tokens[start:start + window]):
+                yield result
+    
+    async def _verify_window(self, tokens: List[str]) -> List[TokenVerifyResponseSchema]:
+        distinct = list(dict.fromkeys(tokens))
+        claims: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self.stateless:
+            now = time.time()
+            to_decode = []
+            for token in distinct:
+                cached = self.claims_cache.get(token, now)
+                if cached is None:
+                    to_decode.append(token)
+                else:
+                    claims[token] = cached
+        else:
+            models = dict(zip(distinct, await self.repository.find_many(distinct)))
+            # 저장소에 없거나 폐기된 토큰은 서명 검증 생략
+            to_decode = [token for token, model in models.items() if model and not self.repository.is_revoked(model)]
+        
+        decoded = await self._decode_many(to_decode)
+        claims.update(decoded)
+        
+        results: Dict[str, TokenVerifyResponseSchema] = {}
+        for token in distinct:
+            payload = claims.get(token)
+            if self.stateless:
+                if payload is not None and token in decoded:
+                    self.claims_cache.put(token, payload)
+                results[token] = await self._stateless_result(payload)
+            elif token in decoded:
+                results[token] = self._stateful_result(models[token], payload)
+            else:
+                results[token] = self._stateful_result(None, None)
+        return [results[token] for token in tokens]
+    
+    async def _decode_many(self, tokens: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """BATCH_CHUNK_SIZE개씩 스레드에서 동시에 검증 (적은 수는 바로 검증)"""
+        if len(tokens) <= BATCH_CHUNK_SIZE:
+            return self._decode_chunk(tokens)
+        chunks = [tokens[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(tokens), BATCH_CHUNK_SIZE)]
+        decoded: Dict[str, Optional[Dict[str, Any]]] = {}
+        for part in await asyncio.gather(*(asyncio.to_thread(self._decode_chunk, chunk) for chunk in chunks)):
+            decoded.update(part)
+        return decoded
+    
+    def _decode_chunk(self, tokens: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return {token: self._decode_or_none(token) for token in tokens}
+    
+    def _decode(self, token: str, verify_exp: bool = True) -> Dict[str, Any]:
+        """서명/만료 확인 후 클레임 반환 (실패 시 JWTError)"""
+        if self.verifier is not None:
+            try:
+                return self.verifier.verify(token, verify_exp=verify_exp)
+            except TokenVerificationError as e:
+                raise JWTError(str(e)) from e
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": verify_exp})
+    
+    def _decode_or_none(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._decode(token)
+        except JWTError:
+            return None
+    
+    def _stateful_result(self, token_model: Optional[TokenModel], payload: Optional[Dict[str, Any]]) -> TokenVerifyResponseSchema:
+        """저장소 조회 결과와 검증한 클레임으로 결과 생성 (저장소에 없거나 폐기된 토큰은 token_model=None)"""
+        if token_model is None or payload is None:
             return TokenVerifyResponseSchema(
                 is_valid=False,
                 user_id=None,
                 payload=None
             )
         
-        try:
-            # JWT 토큰 검증
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id = payload.get("sub")
-            
-            # 토큰이 만료되었는지 확인
-            if datetime.now(UTC) > token_model.expires_at:
-                return TokenVerifyResponseSchema(
-                    is_valid=False,
-                    user_id=user_id,
-                    payload=None
-                )
-            
+        user_id = payload.get("sub")
+        
+        # 토큰이 만료되었는지 확인
+        if datetime.now(UTC) > token_model.expires_at:
             return TokenVerifyResponseSchema(
-                is_valid=True,
+                is_valid=False,
                 user_id=user_id,
-                payload=payload
+                payload=None
             )
-            
-        except JWTError:
+        
+        return TokenVerifyResponseSchema(
+            is_valid=True,
+            user_id=user_id,
+            payload=payload
+        )
+    
+    async def _stateless_result(self, payload: Optional[Dict[str, Any]]) -> TokenVerifyResponseSchema:
+        """서명/만료를 확인한 클레임에 대해 폐기 목록만 조회 (유효한 토큰은 공유 저장소를 조회하지 않음)"""
+        if payload is None or await self.revocations.is_revoked(payload.get("jti"), payload.get("sub"), payload.get("epoch", 0)):
             return TokenVerifyResponseSchema(
                 is_valid=False,
                 user_id=None,
                 payload=None
             )
+        
+        return TokenVerifyResponseSchema(
+            is_valid=True,
+            user_id=payload.get("sub"),
+            payload=payload
+        )
     
     async def revoke_token(self, token: str) -> Dict[str, Any]:
         """토큰 폐기"""
         token_model = await self.repository.revoke(token)
         
+        if self.stateless:
+            # 다른 인스턴스가 발급한 토큰도 폐기할 수 있도록 서명만 확인하고 jti를 폐기 목록에 추가
+            try:
+                payload = self._decode(token, verify_exp=False)
+            except JWTError:
+                payload = None
+            if payload and payload.get("jti"):
+                await self.revocations.revoke(payload["jti"], float(payload.get("exp", 0)))
+                return {"message": "토큰이 폐기되었습니다."}
+        
         if not token_model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -104,6 +276,19 @@ class TokenService:
         
         return {"message": "토큰이 폐기되었습니다."}
     
+    async def revoke_all_for_user(self, user_id: str) -> Dict[str, Any]:
+        """사용자의 모든 토큰 폐기 (사용자 세대를 올려 이전에 발급된 토큰을 모두 무효화)"""
+        await self.repository.revoke_all_for_user(user_id)
+        if self.stateless:
+            await self.revocations.revoke_all(user_id)
+        return {"message": "사용자의 모든 토큰이 폐기되었습니다."}
+    
     async def test_dummy_token(self, user_id: str = "test-user") -> TokenResponseSchema:
         """테스트용 더미 토큰 생성"""
-        return await self.create_token(user_id)
\ No newline at end of file
+        return await self.create_token(user_id)
+
+
+# ✅ 게이트웨이 전역 토큰 서비스 (토큰 발급과 검증/일괄 검증이 같은 저장소를 사용)
+# 저장소는 프로세스 메모리이므로 상태 저장 모드(stateful)는 워커 하나에서만 발급한 토큰을 찾을 수 있음
+# 멀티 워커/인스턴스 운영은 TOKEN_VERIFY_MODE=stateless를 사용
+token_service = TokenService()
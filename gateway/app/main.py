@@ -1,15 +1,33 @@
-import json
-from fastapi import APIRouter, FastAPI, Request, Response, File, UploadFile, Form
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 import os
 import logging
 import sys
 from dotenv import load_dotenv
-from app.domain.model.service_proxy_factory import ServiceProxyFactory
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.compression import CompressionMiddleware
+from app.core.http_client_pool import client_pool
+from app.core.internal_auth import internal_api_key, token_batch_keys
+from app.core.json_codec import FastJSONResponse
+from app.core.metrics import MetricsMiddleware, gateway_metrics, gateway_metrics_store
+from app.core.msgpack_codec import MsgpackTranscodeMiddleware
+from app.core.proxy_app import GatewayProxyApp
+from app.core.proxy_response import forward_request_headers
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.response_cache import response_cache
+from app.core.signing_keys import published_jwks, token_keyring
+from app.core.single_flight import single_flight
+from app.core.token_revocation import STATELESS, VERIFY_MODE, token_revocations
+from app.core.tracing import TracingMiddleware, gateway_tracer
+from app.core.upstream_guard import upstream_guards
+from app.core.upstream_pool import upstream_registry
+from app.domain.controller.token_controller import TokenController
+from app.domain.schema.aggregate_schema import AggregateRequestSchema, AggregateResponseSchema
+from app.domain.schema.token_schema import TokenBatchVerifyResponseSchema, TokenBatchVerifySchema
+from app.domain.service.token_service import token_service
+from app.domain.service.aggregate_service import AggregateService
 from contextlib import asynccontextmanager
-from app.domain.model.service_type import ServiceType
-from typing import Optional
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,7 +44,29 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Gateway API 서비스 시작")
+    await client_pool.start()
+    await upstream_registry.start(client_pool)
+    if gateway_metrics_store is not None:
+        gateway_metrics_store.start(client_pool.stats)
+    if VERIFY_MODE == STATELESS:
+        await token_revocations.start()
+    # 서명 키 준비/교체는 백그라운드 스레드에서 (요청 중에 키를 생성하지 않음)
+    if token_keyring is not None:
+        await token_keyring.start()
+    # 발급한 토큰 저장소의 만료 토큰을 요청이 없을 때도 주기적으로 제거
+    token_service.repository.start()
     yield
+    await token_service.repository.stop()
+    if token_keyring is not None:
+        await token_keyring.stop()
+    if VERIFY_MODE == STATELESS:
+        await token_revocations.stop()
+    if gateway_metrics_store is not None:
+        await gateway_metrics_store.stop(client_pool.stats())
+    await upstream_registry.stop()
+    await client_pool.close()
+    await rate_limiter.close()
+    gateway_tracer.shutdown()
     logger.info("🛑 Gateway API 서비스 종료")
 
 
@@ -35,9 +75,22 @@ app = FastAPI(
     title="Gateway API",
     description="Gateway API for jinmini.com",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# ✅ 서비스의 msgpack 응답을 msgpack을 받지 않는 클라이언트에게는 JSON으로 변환 (압축보다 안쪽)
+app.add_middleware(MsgpackTranscodeMiddleware)
+
+# ✅ 응답 압축 협상 (gzip/br, 업스트림 압축 응답은 인코딩이 맞으면 그대로 전달)
+app.add_middleware(CompressionMiddleware)
+
+# ✅ 입구 동시 처리 한도 (헬스 체크 > 읽기 > 쓰기 > news 검색/통합 조회 순으로 우선 처리)
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# ✅ 클라이언트/토큰별 요청 한도 (대기열에 들어가기 전에 확인, RATE_LIMIT_BACKEND=redis면 워커 간 공유)
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # ✅ CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +100,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ 요청 메트릭 (가장 바깥에서 측정해 거절/압축 시간까지 포함)
+app.add_middleware(MetricsMiddleware, metrics=gateway_metrics)
+
+# ✅ 분산 추적 (traceparent를 이어받아 요청 span 생성, 업스트림 호출마다 client span을 만들어 전달)
+app.add_middleware(TracingMiddleware, tracer=gateway_tracer)
+
+# ✅ 프록시 앱 (서비스별 프록시 팩토리를 통합 조회와 공유)
+proxy_app = GatewayProxyApp()
+aggregate_service = AggregateService(proxy_app.factory_for)
+token_controller = TokenController()
+
 # ✅ 메인 라우터 생성
 gateway_router = APIRouter(prefix="/e/v2", tags=["Gateway API"])
 
@@ -55,149 +119,88 @@ gateway_router = APIRouter(prefix="/e/v2", tags=["Gateway API"])
 async def health_check():
     return {"status": "healthy!"}
 
-# ✅ 메인 라우터 실행
-
-# GET
-@gateway_router.get("/{service}/{path:path}", summary="GET 프록시")
-async def proxy_get(
-    service: ServiceType, 
-    path: str, 
-    request: Request
-):
-    factory = ServiceProxyFactory(service_type=service)
-    logger.info(f"🎃✨🎉🎊 Service URL: {factory.base_url}")
-    response = await factory.request(
-        method="GET",
-        path=path,
-        headers=request.headers.raw
-    )
-    
-    content_type = response.headers.get('content-type', '')
-    
-    if 'text/html' in content_type:
-        return Response(
-            content=response.content,
-            media_type=content_type,
-            status_code=response.status_code
-        )
-    return JSONResponse(content=response.json(), status_code=response.status_code)
-
-# POST
-@gateway_router.post("/{service}/{path:path}", summary="POST 프록시")
-async def proxy_post(
-    service: ServiceType,
-    path: str,
-    request: Request,
-    file: Optional[UploadFile] = File(None),
-    json_data: Optional[str] = Form(None)
-):
-    logger.info(f"🌈Received request for service: {service}, path: {path}")
-    factory = ServiceProxyFactory(service_type=service)
-
-    content_type = request.headers.get('content-type', '')
-
-    # ✅ 기본 헤더 설정
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-
-    if 'application/json' in content_type:
-        body_dict = await request.json()
-        body_bytes = json.dumps(body_dict).encode("utf-8")
-        response = await factory.request(
-            method="POST",
-            path=path,
-            headers=headers,
-            body=body_bytes
-        )
-
-    elif file:
-        return JSONResponse(
-            content={"error": "파일 업로드는 현재 지원되지 않습니다."},
-            status_code=501
-        )
-
-    elif json_data:
-        try:
-            data_dict = json.loads(json_data)
-            body_bytes = json.dumps(data_dict).encode("utf-8")
-        except Exception as e:
-            return JSONResponse(content={"error": f"Invalid JSON string: {str(e)}"}, status_code=400)
-
-        response = await factory.request(
-            method="POST",
-            path=path,
-            headers=headers,
-            body=body_bytes
-        )
-
-    else:
-        return JSONResponse(
-            content={"error": "파일, JSON 데이터 또는 application/json 요청 중 하나가 필요합니다."},
-            status_code=400
-        )
-
-    # 응답 처리
-    if response.status_code == 200:
-        try:
-            return JSONResponse(
-                content=response.json(),
-                status_code=response.status_code
-            )
-        except json.JSONDecodeError:
-            return Response(
-                content=response.content,
-                media_type=response.headers.get('content-type', 'application/octet-stream'),
-                status_code=response.status_code
-            )
-    else:
-        return JSONResponse(
-            content={"detail": f"Service error: {response.text}"},
-            status_code=response.status_code
-        )
-
-
-# PUT
-@gateway_router.put("/{service}/{path:path}", summary="PUT 프록시")
-async def proxy_put(service: ServiceType, path: str, request: Request):
-    factory = ServiceProxyFactory(service_type=service)
-    response = await factory.request(
-        method="PUT",
-        path=path,
-        headers=request.headers.raw,
-        body=await request.body()
-    )
-    return JSONResponse(content=response.json(), status_code=response.status_code)
-
-# DELETE
-@gateway_router.delete("/{service}/{path:path}", summary="DELETE 프록시")
-async def proxy_delete(service: ServiceType, path: str, request: Request):
-    factory = ServiceProxyFactory(service_type=service)
-    response = await factory.request(
-        method="DELETE",
-        path=path,
-        headers=request.headers.raw,
-        body=await request.body()
-    )
-    return JSONResponse(content=response.json(), status_code=response.status_code)
-
-# PATCH
-@gateway_router.patch("/{service}/{path:path}", summary="PATCH 프록시")
-async def proxy_patch(service: ServiceType, path: str, request: Request):
-    factory = ServiceProxyFactory(service_type=service)
-    response = await factory.request(
-        method="PATCH",
-        path=path,
-        headers=request.headers.raw,
-        body=await request.body()
-    )
-    return JSONResponse(content=response.json(), status_code=response.status_code)
+# ✅ 업스트림 커넥션 풀 사용 현황
+@gateway_router.get("/health/pool", summary="업스트림 커넥션 풀 현황")
+async def pool_stats():
+    return client_pool.stats()
+
+# ✅ GET 응답 캐시 현황 (히트/미스/제거 횟수)
+@gateway_router.get("/health/cache", summary="응답 캐시 현황")
+async def cache_stats():
+    return response_cache.stats()
+
+# ✅ 동일 요청 병합 현황
+@gateway_router.get("/health/coalescing", summary="요청 병합 현황")
+async def coalescing_stats():
+    return single_flight.stats()
+
+# ✅ 업스트림별 서킷 브레이커 상태와 동시 요청 한도
+@gateway_router.get("/health/upstreams", summary="업스트림 보호 장치 현황")
+async def upstream_stats():
+    return upstream_guards.stats()
+
+# ✅ 서비스별 인스턴스 상태 (헬스 체크 결과, 진행 중인 요청 수)
+@gateway_router.get("/health/instances", summary="업스트림 인스턴스 현황")
+async def instance_stats():
+    return upstream_registry.stats()
+
+# ✅ 우선순위 클래스별 입구 대기열 현황 (대기 중/처리 중 요청 수, 거절 횟수)
+@gateway_router.get("/health/admission", summary="입구 동시 처리 한도 현황")
+async def admission_stats():
+    return admission_controller.stats()
+
+# ✅ rate limit 규칙별 허용/거절 횟수
+@gateway_router.get("/health/ratelimit", summary="요청 한도 현황")
+async def rate_limit_stats():
+    return rate_limiter.stats()
+
+# ✅ 분산 추적 설정과 span 기록 현황
+@gateway_router.get("/health/tracing", summary="분산 추적 현황")
+async def tracing_stats():
+    return gateway_tracer.stats()
+
+# ✅ 토큰 폐기 목록 동기화/조회 현황 (무상태 검증 모드)
+@gateway_router.get("/health/token-revocation", summary="토큰 폐기 목록 현황")
+async def token_revocation_stats():
+    return token_revocations.stats()
+
+# ✅ 기업별 news / sasb / issuepool 결과를 동시에 조회해 한 번에 응답
+@gateway_router.post("/aggregate", summary="기업별 서비스 결과 통합 조회", response_model=AggregateResponseSchema)
+async def aggregate(req: AggregateRequestSchema, request: Request):
+    return await aggregate_service.aggregate(req, forward_request_headers(request.scope["headers"]))
+
+# ✅ 토큰 일괄 검증 (내부 배치 작업용, 결과는 요청 순서대로, 많으면 검증되는 대로 스트리밍)
+# 토큰 유효성을 확인해 주는 기능이므로 X-Internal-Api-Key(TOKEN_BATCH_API_KEYS)가 있는 호출만 허용
+@gateway_router.post(
+    "/token/verify/batch",
+    summary="토큰 일괄 검증",
+    response_model=TokenBatchVerifyResponseSchema,
+    dependencies=[Depends(internal_api_key(token_batch_keys))],
+)
+async def verify_tokens(batch: TokenBatchVerifySchema):
+    return await token_controller.verify_tokens(batch)
 
 # ✅ 라우터 등록
 app.include_router(gateway_router)
 
-# ✅ 서버 실행
+# ✅ Prometheus 메트릭 (라우트/업스트림별 지연 시간 히스토그램, 커넥션 풀 게이지, 멀티 워커면 전체 워커 합산)
+@app.get("/metrics", summary="Prometheus 메트릭", include_in_schema=False)
+async def metrics():
+    pool_stats = client_pool.stats()
+    return Response(
+        content=gateway_metrics_store.render(pool_stats) if gateway_metrics_store else gateway_metrics.render(pool_stats),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+# ✅ 토큰 검증용 공개키 (서비스가 받아 캐시하고 게이트웨이 호출 없이 토큰 검증, 키 교체 시 새 kid가 먼저 공개됨)
+@app.get("/.well-known/jwks.json", summary="토큰 서명 공개키(JWKS)", include_in_schema=False)
+async def jwks():
+    return FastJSONResponse(content=published_jwks(), headers={"Cache-Control": "public, max-age=300"})
+
+# ✅ 프록시 라우트 (모든 메서드, /e/v2/health 등 위 라우트가 먼저 매칭됨)
+app.add_route("/e/v2/{service}/{path:path}", proxy_app, include_in_schema=False)
+
+# ✅ 서버 실행 (개발용 단일 프로세스 + reload, 운영은 gunicorn -c gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8080))
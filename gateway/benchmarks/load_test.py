@@ -0,0 +1,398 @@
+"""
+게이트웨이 부하 테스트 / 벤치마크
+
+가짜 업스트림(benchmarks.stub_upstream)과 게이트웨이(app.main:app)를 별도 프로세스로 띄우고
+GET / POST / PUT 프록시 요청을 두 가지 방식으로 보냅니다.
+
+- rate: 고정 속도(--rate 요청/초)로 보내는 open loop 방식. 지연 시간은 예정 전송 시각부터 재므로
+  게이트웨이가 밀려도 측정값이 낮게 나오지 않습니다.
+- saturation: --concurrency개 작업이 쉬지 않고 보내는 closed loop 방식 (최대 처리량 측정)
+
+결과는 시나리오별 RPS, p50/p95/p99/최대 지연, 오류 수, 게이트웨이 프로세스의 평균 CPU 사용률과
+최대 RSS(Linux /proc 기준), 부하 생성기 자체의 CPU 사용률입니다. 부하 생성기 CPU가 100%에 가까우면
+측정값은 게이트웨이가 아니라 부하 생성기 한계입니다.
+
+실행 (gateway 디렉터리):
+    python -m benchmarks.load_test --mode saturation --concurrency 64 --duration 10
+    python -m benchmarks.load_test --mode rate --rate 500 --output results.json
+    python -m benchmarks.load_test --baseline results.json --threshold 0.1   # 기준 대비 회귀 시 종료 코드 1
+    python -m benchmarks.load_test --gateway-url http://localhost:8080 --gateway-pid 1234  # 이미 실행 중인 게이트웨이
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ("news", "sasb", "issuepool")
+
+# (메서드, 경로, 요청 본문 크기) - 캐시/요청 병합 대상이 아닌 경로로 순수 프록시 비용만 측정
+SCENARIOS: Dict[str, Tuple[str, str, int]] = {
+    "GET": ("GET", "/e/v2/news/bench/items", 0),
+    "POST": ("POST", "/e/v2/news/bench/items", 1024),
+    "PUT": ("PUT", "/e/v2/sasb/bench/items/1", 1024),
+}
+
+# 벤치마크 중에는 요청 한도와 추적을 끔 (측정 대상은 프록시 경로)
+GATEWAY_ENV = {
+    "RATE_LIMIT_RULES": "[]",
+    "TRACE_EXPORTER": "none",
+}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ProcessSampler:
+    """프로세스의 CPU 시간과 RSS를 /proc에서 주기적으로 읽음 (Linux 외에는 None)"""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._task: Optional[asyncio.Task] = None
+        self._cpu_start: Optional[float] = None
+        self._wall_start = 0.0
+
+    def _cpu_seconds(self) -> Optional[float]:
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _rss_bytes(self) -> Optional[int]:
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            return None
+        return None
+
+    async def _run(self):
+        while True:
+            rss = self._rss_bytes()
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss, rss)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.pid is None:
+            return
+        self.peak_rss = 0
+        self._cpu_start = self._cpu_seconds()
+        self._wall_start = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, Optional[float]]:
+        if self._task is None:
+            return {"cpu_percent": None, "rss_mb": None}
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        cpu_end = self._cpu_seconds()
+        wall = time.monotonic() - self._wall_start
+        cpu_percent = None
+        if self._cpu_start is not None and cpu_end is not None and wall > 0:
+            cpu_percent = round((cpu_end - self._cpu_start) / wall * 100, 1)
+        return {"cpu_percent": cpu_percent, "rss_mb": round(self.peak_rss / 1024 / 1024, 1) if self.peak_rss else None}
+
+
+class Recorder:
+    """요청별 지연 시간과 오류 수 기록"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+
+    async def send(self, client: httpx.AsyncClient, method: str, path: str, body: Optional[bytes], started: float):
+        try:
+            response = await client.request(method, path, content=body)
+            await response.aread()
+            key = str(response.status_code)
+            if response.status_code >= 400:
+                self.errors += 1
+        except httpx.HTTPError as e:
+            key = type(e).__name__
+            self.errors += 1
+        self.latencies.append(time.perf_counter() - started)
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+
+async def run_saturation(client: httpx.AsyncClient, scenario: Tuple[str, str, int], concurrency: int, duration: float) -> Recorder:
+    method, path, body = scenario[0], scenario[1], request_body(scenario[2])
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await recorder.send(client, method, path, body, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder
+
+
+async def run_fixed_rate(
+    client: httpx.AsyncClient,
+    scenario: Tuple[str, str, int],
+    rate: float,
+    duration: float,
+    max_outstanding: int
+) -> Recorder:
+    method, path, body = scenario[0], scenario[1], request_body(scenario[2])
+    recorder = Recorder()
+    outstanding: set = set()
+    start = time.perf_counter()
+    total = int(rate * duration)
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(outstanding) >= max_outstanding:
+            # 게이트웨이가 따라오지 못해 미처리 요청이 한도를 넘으면 전송하지 않고 오류로 집계
+            recorder.errors += 1
+            recorder.status_counts["skipped"] = recorder.status_counts.get("skipped", 0) + 1
+            continue
+        # 지연 시간은 실제 전송 시각이 아니라 예정 시각부터 측정 (coordinated omission 보정)
+        task = asyncio.create_task(recorder.send(client, method, path, body, scheduled))
+        outstanding.add(task)
+        task.add_done_callback(outstanding.discard)
+    if outstanding:
+        await asyncio.gather(*outstanding)
+    return recorder
+
+
+def request_body(size: int) -> Optional[bytes]:
+    if size <= 0:
+        return None
+    filler = "x" * max(0, size - 32)
+    return json.dumps({"company_name": "샘플전자", "memo": filler}).encode("utf-8")
+
+
+def summarize(name: str, mode: str, recorder: Recorder, elapsed: float, gateway: Dict[str, Any], client_cpu: float) -> Dict[str, Any]:
+    latencies = sorted(recorder.latencies)
+    to_ms = lambda seconds: round(seconds * 1000, 2)
+    return {
+        "scenario": name,
+        "mode": mode,
+        "requests": len(latencies),
+        "errors": recorder.errors,
+        "statuses": recorder.status_counts,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+        "max_ms": to_ms(latencies[-1]) if latencies else 0.0,
+        "gateway_cpu_percent": gateway["cpu_percent"],
+        "gateway_rss_mb": gateway["rss_mb"],
+        "client_cpu_percent": round(client_cpu, 1),
+    }
+
+
+async def run_scenario(args: argparse.Namespace, client: httpx.AsyncClient, name: str, pid: Optional[int]) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    # 워밍업 (커넥션 생성, 업스트림 풀 준비)
+    await run_saturation(client, scenario, min(args.concurrency, 8), args.warmup)
+
+    sampler = ProcessSampler(pid)
+    sampler.start()
+    cpu_start = time.process_time()
+    started = time.perf_counter()
+    if args.mode == "rate":
+        recorder = await run_fixed_rate(client, scenario, args.rate, args.duration, args.max_outstanding)
+    else:
+        recorder = await run_saturation(client, scenario, args.concurrency, args.duration)
+    elapsed = time.perf_counter() - started
+    client_cpu = (time.process_time() - cpu_start) / elapsed * 100 if elapsed > 0 else 0.0
+    return summarize(name, args.mode, recorder, elapsed, await sampler.stop(), client_cpu)
+
+
+def ensure_port_free(port: int):
+    """이미 다른 프로세스가 쓰는 포트면 그 프로세스를 측정하게 되므로 시작 전에 중단"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        if sock.connect_ex(("127.0.0.1", port)) == 0:
+            raise RuntimeError(f"포트 {port}가 이미 사용 중입니다 (--gateway-port / --upstream-port로 변경)")
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (exit {process.returncode}): {url}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"준비되지 않음: {url}")
+
+
+@contextmanager
+def launch(args: argparse.Namespace) -> Iterator[Tuple[str, Optional[int]]]:
+    """가짜 업스트림(서비스별 1개)과 게이트웨이 프로세스 실행 → (게이트웨이 URL, 게이트웨이 PID)"""
+    if args.gateway_url:
+        yield args.gateway_url.rstrip("/"), args.gateway_pid
+        return
+
+    processes: List[subprocess.Popen] = []
+    env = dict(os.environ)
+    try:
+        stub_env = dict(
+            env,
+            STUB_LATENCY_MS=str(args.upstream_latency_ms),
+            STUB_JITTER_MS=str(args.upstream_jitter_ms),
+            STUB_PAYLOAD_BYTES=str(args.payload_bytes),
+            STUB_ERROR_RATE=str(args.error_rate),
+        )
+        gateway_env = dict(env, **GATEWAY_ENV)
+        for offset, service in enumerate(SERVICES):
+            port = args.upstream_port + offset
+            ensure_port_free(port)
+            stub = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "benchmarks.stub_upstream:app", "--port", str(port), "--log-level", "warning"],
+                cwd=GATEWAY_DIR, env=stub_env
+            )
+            processes.append(stub)
+            gateway_env[f"{service.upper()}_SERVICE_URL"] = f"http://127.0.0.1:{port}"
+            wait_until_ready(f"http://127.0.0.1:{port}/health", stub)
+
+        ensure_port_free(args.gateway_port)
+        gateway = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.gateway_port), "--log-level", "warning"],
+            cwd=GATEWAY_DIR, env=gateway_env
+        )
+        processes.append(gateway)
+        url = f"http://127.0.0.1:{args.gateway_port}"
+        wait_until_ready(f"{url}/e/v2/health", gateway)
+        yield url, gateway.pid
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> bool:
+    """기준 결과와 비교해 표로 출력 (RPS가 threshold 넘게 줄거나 p99가 threshold 넘게 늘면 회귀)"""
+    base_by_key = {(r["scenario"], r["mode"]): r for r in baseline}
+    regressed = False
+    print(f"\n{'기준 대비':<16}{'rps':>20}{'p50(ms)':>22}{'p99(ms)':>22}")
+    for result in results:
+        base = base_by_key.get((result["scenario"], result["mode"]))
+        if base is None:
+            print(f"{result['scenario'] + '/' + result['mode']:<16}{'(기준 없음)':>20}")
+            continue
+
+        def delta(key: str) -> Tuple[str, float]:
+            before, after = base[key], result[key]
+            change = (after - before) / before if before else 0.0
+            return f"{before:.1f}→{after:.1f} ({change * 100:+.1f}%)", change
+
+        rps_text, rps_change = delta("rps")
+        p50_text, _ = delta("p50_ms")
+        p99_text, p99_change = delta("p99_ms")
+        flag = rps_change < -threshold or p99_change > threshold
+        regressed = regressed or flag
+        print(f"{result['scenario'] + '/' + result['mode']:<16}{rps_text:>20}{p50_text:>22}{p99_text:>22}{'  ⚠️ 회귀' if flag else ''}")
+    return regressed
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"\n{'시나리오':<16}{'요청':>8}{'오류':>7}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'gw cpu%':>9}{'gw rss':>8}{'부하기 cpu%':>12}")
+    for r in results:
+        cpu = "-" if r["gateway_cpu_percent"] is None else f"{r['gateway_cpu_percent']:.0f}"
+        rss = "-" if r["gateway_rss_mb"] is None else f"{r['gateway_rss_mb']:.0f}M"
+        print(
+            f"{r['scenario'] + '/' + r['mode']:<16}{r['requests']:>8}{r['errors']:>7}{r['rps']:>10.1f}"
+            f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}{cpu:>9}{rss:>8}{r['client_cpu_percent']:>12.0f}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="게이트웨이 부하 테스트")
+    parser.add_argument("--mode", choices=("rate", "saturation"), default="saturation")
+    parser.add_argument("--scenarios", default="GET,POST,PUT", help="쉼표로 구분한 시나리오 (GET,POST,PUT)")
+    parser.add_argument("--duration", type=float, default=10.0, help="시나리오별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="시나리오별 워밍업 시간(초)")
+    parser.add_argument("--rate", type=float, default=200.0, help="rate 모드 초당 요청 수")
+    parser.add_argument("--max-outstanding", type=int, default=5000, help="rate 모드 최대 미처리 요청 수")
+    parser.add_argument("--concurrency", type=int, default=64, help="saturation 모드 동시 요청 수")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=2048, help="업스트림 응답 본문 크기")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="업스트림 500 응답 비율")
+    parser.add_argument("--gateway-port", type=int, default=9180)
+    parser.add_argument("--upstream-port", type=int, default=9181, help="첫 번째 가짜 업스트림 포트 (서비스별 +1)")
+    parser.add_argument("--gateway-url", help="이미 실행 중인 게이트웨이 주소 (지정하면 프로세스를 띄우지 않음)")
+    parser.add_argument("--gateway-pid", type=int, help="--gateway-url 사용 시 CPU/RSS를 측정할 게이트웨이 PID")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 (다음 실행의 --baseline으로 사용)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 판단할 변화율 (기본 10%%)")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace, url: str, pid: Optional[int]) -> List[Dict[str, Any]]:
+    connections = max(args.concurrency, 100) if args.mode == "saturation" else args.max_outstanding
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    headers = {"content-type": "application/json"}
+    results = []
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0, headers=headers) as client:
+        for name in (s.strip().upper() for s in args.scenarios.split(",") if s.strip()):
+            if name not in SCENARIOS:
+                raise SystemExit(f"알 수 없는 시나리오: {name}")
+            results.append(await run_scenario(args, client, name, pid))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    with launch(args) as (url, pid):
+        results = asyncio.run(run(args, url, pid))
+
+    print(
+        f"모드: {args.mode} ({f'{args.rate:g} req/s' if args.mode == 'rate' else f'동시 {args.concurrency}'}), "
+        f"측정 {args.duration:g}초, 업스트림 지연 {args.upstream_latency_ms:g}ms, 응답 {args.payload_bytes} bytes"
+    )
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+프록시 라우트 요청당 CPU 시간 비교 벤치마크
+
+기존 FastAPI proxy_* 핸들러 방식(의존성 해석 + Enum 검증 + Form/JSON 파싱)과
+raw ASGI 프록시 라우트(GatewayProxyApp)를 같은 가짜 업스트림(httpx.MockTransport)에
+연결해 요청당 CPU 시간을 비교합니다. 네트워크 비용은 포함되지 않습니다.
+
+두 방식을 번갈아 --runs번 측정하고(매 회 워밍업 후 GC를 끈 상태로 측정) 중앙값과 최소~최대를 출력합니다.
+한 번만 재면 CPU 클럭/캐시 상태에 따라 수십 % 차이가 나므로 범위가 겹치면 차이가 없다고 봅니다.
+
+실행: gateway 디렉터리에서 `python -m benchmarks.proxy_route_bench [--requests 2000] [--runs 7]`
+"""
+from typing import List, Optional
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("NEWS_SERVICE_URL", "http://news-service:8003")
+
+from fastapi import APIRouter, FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse
+import httpx
+
+from app.core.http_client_pool import ServiceClientPool
+from app.core.proxy_app import GatewayProxyApp
+from app.domain.model.service_proxy_factory import ServiceProxyFactory
+from app.domain.model.service_type import ServiceType
+
+PAYLOAD = json.dumps({"company": "샘플전자", "items": [{"id": i, "title": "ESG 뉴스"} for i in range(50)]}).encode("utf-8")
+
+
+class PayloadStream(httpx.AsyncByteStream):
+    """실제 커넥션처럼 본문을 스트림으로 내려주는 응답 본문"""
+
+    async def __aiter__(self):
+        yield PAYLOAD
+
+
+def upstream_handler(request: httpx.Request) -> httpx.Response:
+    """고정 JSON을 돌려주는 가짜 업스트림"""
+    return httpx.Response(
+        200,
+        stream=PayloadStream(),
+        headers={"content-type": "application/json", "content-length": str(len(PAYLOAD))}
+    )
+
+
+def build_pool() -> ServiceClientPool:
+    transport = httpx.MockTransport(upstream_handler)
+    return ServiceClientPool(transports={service_type: transport for service_type in ServiceType})
+
+
+def build_legacy_app(pool: ServiceClientPool) -> FastAPI:
+    """변경 전 proxy_get / proxy_post 핸들러와 같은 처리 방식"""
+    app = FastAPI()
+    router = APIRouter(prefix="/e/v2")
+
+    @router.get("/{service}/{path:path}")
+    async def proxy_get(service: ServiceType, path: str, request: Request):
+        factory = ServiceProxyFactory(service_type=service, client_pool=pool)
+        response = await factory.request(method="GET", path=path, headers=dict(request.headers))
+        return JSONResponse(content=response.json(), status_code=response.status_code)
+
+    @router.post("/{service}/{path:path}")
+    async def proxy_post(
+        service: ServiceType,
+        path: str,
+        request: Request,
+        file: Optional[UploadFile] = File(None),
+        json_data: Optional[str] = Form(None)
+    ):
+        factory = ServiceProxyFactory(service_type=service, client_pool=pool)
+        body_bytes = json.dumps(await request.json()).encode("utf-8")
+        response = await factory.request(method="POST", path=path, body=body_bytes)
+        return JSONResponse(content=response.json(), status_code=response.status_code)
+
+    app.include_router(router)
+    return app
+
+
+def build_raw_app(pool: ServiceClientPool) -> FastAPI:
+    app = FastAPI()
+    app.add_route("/e/v2/{service}/{path:path}", GatewayProxyApp(client_pool=pool), include_in_schema=False)
+    return app
+
+
+async def measure(app: FastAPI, method: str, requests: int, warmup: int) -> float:
+    """요청당 CPU 시간(마이크로초)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        kwargs = {"content": PAYLOAD, "headers": {"content-type": "application/json"}} if method == "POST" else {}
+        for _ in range(warmup):
+            response = await client.request(method, "/e/v2/news/search", **kwargs)
+            await response.aread()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.process_time()
+            for _ in range(requests):
+                response = await client.request(method, "/e/v2/news/search", **kwargs)
+                await response.aread()
+            return (time.process_time() - start) / requests * 1_000_000
+        finally:
+            gc.enable()
+
+
+def _summary(samples: List[float]) -> str:
+    return f"{statistics.median(samples):.1f} ({min(samples):.0f}~{max(samples):.0f})"
+
+
+async def main(requests: int, runs: int, warmup: int):
+    pool = build_pool()
+    apps = {"legacy": build_legacy_app(pool), "raw": build_raw_app(pool)}
+
+    print(f"요청 수: {requests} x {runs}회 (워밍업 {warmup}), 응답 크기: {len(PAYLOAD)} bytes")
+    print(f"{'method':<8}{'legacy 중앙값(범위) us':>26}{'raw asgi 중앙값(범위) us':>28}{'감소율':>10}")
+    for method in ("GET", "POST"):
+        samples = {name: [] for name in apps}
+        for run in range(runs):
+            # 순서에 따른 편향(클럭 상승, 캐시)을 없애기 위해 회차마다 측정 순서를 바꿈
+            order = list(apps) if run % 2 == 0 else list(reversed(list(apps)))
+            for name in order:
+                samples[name].append(await measure(apps[name], method, requests, warmup))
+        legacy = statistics.median(samples["legacy"])
+        raw = statistics.median(samples["raw"])
+        print(f"{method:<8}{_summary(samples['legacy']):>26}{_summary(samples['raw']):>28}{(1 - raw / legacy) * 100:>9.1f}%")
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프록시 라우트 요청당 CPU 시간 비교")
+    parser.add_argument("--requests", type=int, default=2000, help="회차당 요청 수")
+    parser.add_argument("--runs", type=int, default=7, help="방식별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--warmup", type=int, default=200, help="회차마다 측정 전에 보내는 요청 수")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.runs, args.warmup))
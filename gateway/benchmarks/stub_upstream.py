@@ -0,0 +1,87 @@
+"""
+부하 테스트용 가짜 업스트림 서비스
+
+news / sasb / issuepool 서비스 대신 띄우는 ASGI 앱으로, 모든 메서드의 /{service}/{path} 요청에
+지정한 지연 시간 후 지정한 크기의 JSON을 돌려줍니다. 요청 본문은 끝까지 읽고 버립니다.
+
+환경 변수:
+    STUB_LATENCY_MS   응답 지연 (기본 0)
+    STUB_JITTER_MS    지연에 더할 0~N ms 무작위 값 (기본 0)
+    STUB_PAYLOAD_BYTES 응답 본문 크기 (기본 2048)
+    STUB_ERROR_RATE   500 응답 비율 0~1 (기본 0)
+
+실행: gateway 디렉터리에서 `python -m uvicorn benchmarks.stub_upstream:app --port 9101`
+"""
+from starlette.types import Receive, Scope, Send
+import asyncio
+import json
+import os
+import random
+
+
+def build_payload(size: int) -> bytes:
+    """size 바이트 정도의 JSON 본문"""
+    item = {"title": "ESG 뉴스 샘플 제목", "link": "https://news.example.com/article/000000"}
+    item_size = len(json.dumps(item, ensure_ascii=False).encode("utf-8")) + 1
+    items = [item] * max(1, size // item_size)
+    return json.dumps({"company": "샘플전자", "items": items}, ensure_ascii=False).encode("utf-8")
+
+
+class StubUpstream:
+    """지연/본문 크기/오류 비율을 설정할 수 있는 가짜 업스트림"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, payload_bytes: int = 2048, error_rate: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.payload = build_payload(payload_bytes)
+        self.error_rate = error_rate
+
+    @classmethod
+    def from_env(cls) -> "StubUpstream":
+        return cls(
+            latency_ms=float(os.getenv("STUB_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("STUB_JITTER_MS", "0")),
+            payload_bytes=int(os.getenv("STUB_PAYLOAD_BYTES", "2048")),
+            error_rate=float(os.getenv("STUB_ERROR_RATE", "0")),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+
+        if scope["path"] == "/health":
+            await self._respond(send, 200, b'{"status":"healthy"}')
+            return
+
+        delay = self.latency + (random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            await self._respond(send, 500, b'{"detail":"stub error"}')
+            return
+        await self._respond(send, 200, self.payload)
+
+    @staticmethod
+    async def _respond(send: Send, status: int, body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+app = StubUpstream.from_env()
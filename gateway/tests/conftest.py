@@ -0,0 +1,53 @@
+"""테스트 공용 설정: 가짜 업스트림에 연결한 프록시 라우트"""
+from typing import Any, Callable, Dict
+import os
+
+os.environ.setdefault("NEWS_SERVICE_URL", "http://news-service:8003")
+
+from fastapi import FastAPI
+import httpx
+
+from app.core.http_client_pool import ServiceClientPool
+from app.core.proxy_app import GatewayProxyApp
+from app.core.response_cache import ResponseCache
+from app.core.single_flight import SingleFlight
+from app.core.upstream_guard import UpstreamGuardRegistry
+from app.core.upstream_pool import UpstreamRegistry
+from app.domain.model.service_proxy_factory import ServiceProxyFactory
+from app.domain.model.service_type import ServiceType
+from app.domain.model.upstream_config_model import UpstreamClientConfig
+
+
+class BodyStream(httpx.AsyncByteStream):
+    """실제 커넥션처럼 본문을 스트림으로 내려주는 응답 본문"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+
+
+def upstream_response(status_code: int, headers: Dict[str, str], body: bytes = b"") -> httpx.Response:
+    """가짜 업스트림 응답 (본문은 스트림, content-length 포함)"""
+    return httpx.Response(status_code, headers={**headers, "content-length": str(len(body))}, stream=BodyStream(body))
+
+
+def make_proxy(handler: Callable[[httpx.Request], Any], **config: Any) -> GatewayProxyApp:
+    """news 서비스를 handler(httpx.MockTransport)로 대신하는 프록시 앱 (캐시/병합기/보호 장치는 테스트마다 새로 만듦)"""
+    pool = ServiceClientPool(
+        configs={ServiceType.NEWS: UpstreamClientConfig(**config)},
+        transports={ServiceType.NEWS: httpx.MockTransport(handler)},
+    )
+    proxy = GatewayProxyApp(client_pool=pool, cache=ResponseCache(), coalescer=SingleFlight())
+    proxy._factories[ServiceType.NEWS] = ServiceProxyFactory(
+        ServiceType.NEWS, client_pool=pool, guards=UpstreamGuardRegistry(), upstreams=UpstreamRegistry()
+    )
+    return proxy
+
+
+def proxy_client(proxy: GatewayProxyApp) -> httpx.AsyncClient:
+    """/e/v2/{service}/{path}에 프록시 앱을 연결한 클라이언트"""
+    app = FastAPI()
+    app.add_route("/e/v2/{service}/{path:path}", proxy, include_in_schema=False)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
@@ -0,0 +1,133 @@
+"""입구 동시 처리 한도 (우선순위 대기열, 거절, 슬롯 반환)"""
+import asyncio
+
+import pytest
+
+from app.core.admission import CRITICAL, EXPENSIVE, READ, AdmissionClass, AdmissionController, AdmissionRejected
+
+
+def _controller(capacity: int = 1, max_queue: int = 10, max_queue_time: float = 1.0) -> AdmissionController:
+    return AdmissionController(
+        capacity=capacity,
+        classes=[
+            AdmissionClass(CRITICAL, 0, max_queue=max_queue, max_queue_time=max_queue_time, max_share=1.0),
+            AdmissionClass(READ, 1, max_queue=max_queue, max_queue_time=max_queue_time, max_share=1.0),
+            AdmissionClass(EXPENSIVE, 3, max_queue=max_queue, max_queue_time=max_queue_time, max_share=1.0),
+        ],
+    )
+
+
+def test_waiters_are_admitted_by_priority():
+    async def scenario():
+        controller = _controller()
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        admitted = []
+
+        async def wait(name):
+            admission_class = controller.get_class(name)
+            await controller.acquire(admission_class)
+            admitted.append(name)
+            await asyncio.sleep(0)
+            controller.release(admission_class, 0.0)
+
+        # 낮은 우선순위부터 대기열에 들어감
+        tasks = []
+        for name in (EXPENSIVE, READ, CRITICAL):
+            tasks.append(asyncio.create_task(wait(name)))
+            await asyncio.sleep(0)
+        controller.release(read, 0.0)
+        await asyncio.gather(*tasks)
+        return admitted, controller
+
+    admitted, controller = asyncio.run(scenario())
+    assert admitted == [CRITICAL, READ, EXPENSIVE]
+    assert controller.in_flight == 0
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        controller = _controller(max_queue=1)
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        waiter = asyncio.create_task(controller.acquire(read))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(read)
+        waiter.cancel()
+        return error.value, read
+
+    error, read = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert read.rejected_queue_full == 1
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        controller = _controller(max_queue_time=0.05)
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(read)
+        return error.value, controller, read
+
+    error, controller, read = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert read.rejected_timeout == 1
+    assert controller.stats()["classes"][READ]["queued"] == 0
+    assert controller.in_flight == 1
+
+
+def test_expected_wait_over_deadline_is_rejected_early():
+    async def scenario():
+        controller = _controller(max_queue_time=1.0)
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        controller.hold_time_ewma = 5.0
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(read)
+        return error.value, read
+
+    error, read = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.retry_after == 5
+    assert read.rejected_early == 1
+
+
+def test_cancel_after_grant_returns_slot():
+    async def scenario():
+        controller = _controller()
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        waiter = asyncio.create_task(controller.acquire(read))
+        await asyncio.sleep(0)
+
+        # 슬롯을 넘겨받았지만 대기 작업이 재개되기 전에 클라이언트가 끊김
+        controller.release(read, 0.0)
+        assert controller.in_flight == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return controller, read
+
+    controller, read = asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert read.in_flight == 0
+
+
+def test_cancel_while_waiting_leaves_queue():
+    async def scenario():
+        controller = _controller()
+        read = controller.get_class(READ)
+        await controller.acquire(read)
+        waiter = asyncio.create_task(controller.acquire(read))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release(read, 0.0)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert controller.stats()["classes"][READ]["queued"] == 0
@@ -0,0 +1,52 @@
+"""동일 요청 병합 (single flight)"""
+import asyncio
+
+import httpx
+
+from conftest import make_proxy, proxy_client, upstream_response
+
+URL = "/e/v2/news/search"
+
+
+class SlowUpstream:
+    """요청마다 Authorization 값을 그대로 돌려주고, 동시 요청이 겹치도록 잠시 대기"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        body = request.headers.get("authorization", "").encode()
+        return upstream_response(200, {"content-type": "text/plain"}, body)
+
+
+def _concurrent(headers_list):
+    upstream = SlowUpstream()
+    proxy = make_proxy(upstream, coalesce_routes=["POST:search"])
+
+    async def run():
+        async with proxy_client(proxy) as client:
+            return await asyncio.gather(*(client.post(URL, content=b"{}", headers=headers) for headers in headers_list))
+
+    return upstream, asyncio.run(run())
+
+
+def test_callers_with_different_credentials_do_not_share_results():
+    upstream, responses = _concurrent([{"authorization": "Bearer alice"}, {"authorization": "Bearer bob"}])
+
+    assert upstream.calls == 2
+    assert [response.text for response in responses] == ["Bearer alice", "Bearer bob"]
+
+
+def test_callers_with_different_cookies_do_not_share_results():
+    upstream, _ = _concurrent([{"cookie": "session=a"}, {"cookie": "session=b"}])
+
+    assert upstream.calls == 2
+
+
+def test_identical_requests_are_coalesced():
+    upstream, responses = _concurrent([{"authorization": "Bearer alice"}] * 3)
+
+    assert upstream.calls == 1
+    assert [response.text for response in responses] == ["Bearer alice"] * 3
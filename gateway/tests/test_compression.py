@@ -0,0 +1,68 @@
+"""응답 압축 협상 (그대로 전달, 압축, 재압축과 ETag)"""
+import asyncio
+import gzip
+import json
+
+import httpx
+from starlette.responses import Response
+
+from app.core.compression import CompressionMiddleware
+
+BODY = json.dumps({"items": ["ESG 뉴스"] * 200}).encode("utf-8")
+
+
+def _get(headers, accept_encoding: str, body: bytes = BODY) -> httpx.Response:
+    async def upstream(scope, receive, send):
+        await Response(body, headers=headers, media_type="application/json")(scope, receive, send)
+
+    app = CompressionMiddleware(upstream, minimum_size=100)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            return await client.get("/", headers={"accept-encoding": accept_encoding})
+
+    return asyncio.run(run())
+
+
+def test_passthrough_keeps_strong_etag():
+    response = _get({"content-encoding": "gzip", "etag": '"v1"'}, "gzip", gzip.compress(BODY))
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"v1"'
+    assert response.content == BODY
+
+
+def test_reencoded_body_gets_weak_etag():
+    response = _get({"content-encoding": "gzip", "etag": '"v1"'}, "br", gzip.compress(BODY))
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.content == BODY
+
+
+def test_decoded_body_gets_weak_etag():
+    response = _get({"content-encoding": "gzip", "etag": '"v1"'}, "identity", gzip.compress(BODY))
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.content == BODY
+
+
+def test_compressed_body_gets_weak_etag():
+    response = _get({"etag": '"v1"'}, "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+def test_weak_etag_is_left_alone():
+    response = _get({"etag": 'W/"v1"'}, "gzip")
+
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+def test_small_body_is_not_compressed():
+    response = _get({"etag": '"v1"'}, "gzip", b'{"ok": true}')
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
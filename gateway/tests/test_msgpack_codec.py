@@ -0,0 +1,39 @@
+"""업스트림 msgpack 응답의 JSON 변환"""
+import asyncio
+
+import httpx
+import msgpack
+from starlette.responses import Response
+
+from app.core.msgpack_codec import MsgpackTranscodeMiddleware
+
+DATA = {"company": "샘플전자", "items": [1, 2, 3]}
+
+
+def _get(accept: str) -> httpx.Response:
+    async def upstream(scope, receive, send):
+        await Response(msgpack.packb(DATA), media_type="application/msgpack", headers={"etag": '"v1"'})(scope, receive, send)
+
+    app = MsgpackTranscodeMiddleware(upstream)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            return await client.get("/", headers={"accept": accept})
+
+    return asyncio.run(run())
+
+
+def test_json_client_gets_converted_body_with_weak_etag():
+    response = _get("application/json")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == DATA
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "accept" in response.headers["vary"].lower()
+
+
+def test_msgpack_client_gets_upstream_bytes_and_etag():
+    response = _get("application/msgpack")
+
+    assert msgpack.unpackb(response.content) == DATA
+    assert response.headers["etag"] == '"v1"'
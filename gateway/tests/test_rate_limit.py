@@ -0,0 +1,117 @@
+"""토큰 버킷 rate limit (일괄 소비, 충전, 키 개수 제한, 저장소 장애 시 통과)"""
+import asyncio
+
+import pytest
+
+from app.core.rate_limit import CLIENT, TOKEN, InMemoryRateLimitBackend, RateLimiter, RateLimitRule, RedisRateLimitBackend
+
+
+def _scope(path: str = "/e/v2/news/search", method: str = "POST", client: str = "10.0.0.1", token: str = "") -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (client, 50000)}
+
+
+def test_denied_request_debits_no_bucket():
+    async def scenario():
+        backend = InMemoryRateLimitBackend()
+        checks = [("wide:a", 1.0, 5.0, 1.0), ("narrow:a", 1.0, 1.0, 1.0)]
+        assert await backend.consume(checks, 100.0) == [(True, 0.0), (True, 0.0)]
+        results = await backend.consume(checks, 100.0)
+        assert [ok for ok, _ in results] == [True, False]
+        # 좁은 버킷이 거절했으므로 넓은 버킷도 차감되지 않아야 함
+        assert backend._buckets["wide:a"][0] == 4.0
+        assert backend._buckets["narrow:a"][0] == 0.0
+
+    asyncio.run(scenario())
+
+
+def test_bucket_refills_over_time():
+    async def scenario():
+        backend = InMemoryRateLimitBackend()
+        check = [("client:a", 2.0, 2.0, 1.0)]
+        assert (await backend.consume(check, 10.0))[0][0]
+        assert (await backend.consume(check, 10.0))[0][0]
+        ok, retry_after = (await backend.consume(check, 10.0))[0]
+        assert not ok
+        assert retry_after == pytest.approx(0.5)
+        # 0.5초 뒤에는 한 개가 다시 채워짐, 오래 지나도 burst를 넘지 않음
+        assert (await backend.consume(check, 10.5))[0][0]
+        await backend.consume(check, 1000.0)
+        assert backend._buckets["client:a"][0] == 1.0
+
+    asyncio.run(scenario())
+
+
+def test_least_recently_used_keys_are_evicted():
+    async def scenario():
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        await backend.consume([("client:a", 1.0, 1.0, 1.0)], 0.0)
+        await backend.consume([("client:b", 1.0, 1.0, 1.0)], 0.0)
+        await backend.consume([("client:a", 1.0, 1.0, 1.0)], 0.0)
+        await backend.consume([("client:c", 1.0, 1.0, 1.0)], 0.0)
+        assert list(backend._buckets) == ["client:a", "client:c"]
+
+    asyncio.run(scenario())
+
+
+def test_limiter_applies_route_and_token_rules():
+    async def scenario():
+        rules = [
+            RateLimitRule("client", CLIENT, 1.0, 10.0),
+            RateLimitRule("token", TOKEN, 1.0, 10.0),
+            RateLimitRule("search", CLIENT, 1.0, 1.0, ["POST:e/v2/news/search"]),
+        ]
+        limiter = RateLimiter(rules, InMemoryRateLimitBackend())
+        assert await limiter.check(_scope(token="abc")) is None
+        rule, retry_after = await limiter.check(_scope(token="abc"))
+        assert rule.name == "search"
+        assert retry_after > 0
+        # 다른 경로는 검색 규칙에 걸리지 않음
+        assert await limiter.check(_scope(path="/e/v2/news/list", method="GET", token="abc")) is None
+        assert (rules[0].allowed, rules[1].allowed, rules[2].allowed) == (2, 2, 1)
+        assert rules[2].rejected == 1
+
+    asyncio.run(scenario())
+
+
+class FailingBackend:
+    name = "failing"
+
+    async def consume(self, checks, now):
+        raise ConnectionError("redis down")
+
+    async def close(self):
+        pass
+
+
+def test_backend_error_fails_open():
+    async def scenario():
+        limiter = RateLimiter([RateLimitRule("client", CLIENT, 1.0, 1.0)], FailingBackend())
+        assert await limiter.check(_scope()) is None
+        assert await limiter.check(_scope()) is None
+        assert limiter.backend_errors == 2
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 10), (-1, 10), (1, 0)])
+def test_rule_rejects_non_positive_rate_or_burst(rate, burst):
+    with pytest.raises(ValueError):
+        RateLimitRule("broken", CLIENT, rate, burst)
+
+
+def test_redis_script_debits_all_or_nothing():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    async def scenario():
+        backend = RedisRateLimitBackend(client=fakeredis.FakeAsyncRedis())
+        checks = [("wide:a", 1.0, 5.0, 1.0), ("narrow:a", 1.0, 1.0, 1.0)]
+        assert await backend.consume(checks, 100.0) == [(True, 0.0), (True, 0.0)]
+        results = await backend.consume(checks, 100.0)
+        assert [ok for ok, _ in results] == [True, False]
+        assert float(await backend.client.hget("ratelimit:wide:a", "tokens")) == 4.0
+        assert 0 < await backend.client.pttl("ratelimit:narrow:a") <= 2000
+        await backend.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,129 @@
+"""GET 응답 캐시 (LRU/TTL, 재검증, 저장 제외, Vary)"""
+import asyncio
+
+import httpx
+
+from conftest import make_proxy, proxy_client, upstream_response
+
+URL = "/e/v2/news/companies"
+
+
+class Upstream:
+    """요청을 기록하고 지정한 헤더로 응답하는 가짜 업스트림"""
+
+    def __init__(self, **headers):
+        self.headers = {"content-type": "application/json", **headers}
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if "etag" in self.headers and request.headers.get("if-none-match") == self.headers["etag"]:
+            return upstream_response(304, {"etag": self.headers["etag"]})
+        return upstream_response(200, self.headers, f'{{"n": {len(self.requests)}}}'.encode())
+
+
+def _run(upstream: Upstream, scenario, **config):
+    proxy = make_proxy(upstream, cache_enabled=True, **config)
+
+    async def run():
+        async with proxy_client(proxy) as client:
+            return await scenario(client, proxy.cache)
+
+    return asyncio.run(run())
+
+
+def test_fresh_entry_is_served_from_cache():
+    upstream = Upstream()
+
+    async def scenario(client, cache):
+        first = await client.get(URL)
+        second = await client.get(URL)
+        return first, second, cache
+
+    first, second, cache = _run(upstream, scenario)
+    assert len(upstream.requests) == 1
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_expired_entry_without_validators_is_fetched_again():
+    upstream = Upstream()
+
+    async def scenario(client, cache):
+        await client.get(URL)
+        for entry in cache._entries.values():
+            entry.fresh_until = entry.stale_until = 0.0
+        return await client.get(URL)
+
+    response = _run(upstream, scenario)
+    assert len(upstream.requests) == 2
+    assert response.json() == {"n": 2}
+    assert "x-cache" not in response.headers
+
+
+def test_expired_entry_with_etag_is_revalidated():
+    upstream = Upstream(etag='"v1"', **{"cache-control": "max-age=0, must-revalidate"})
+
+    async def scenario(client, cache):
+        await client.get(URL)
+        return await client.get(URL), cache
+
+    response, cache = _run(upstream, scenario)
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "REVALIDATED"
+    assert response.json() == {"n": 1}
+    assert cache.not_modified == 1
+
+
+def test_requests_with_credentials_or_no_store_are_not_cached():
+    upstream = Upstream()
+
+    async def scenario(client, cache):
+        await client.get(URL, headers={"authorization": "Bearer a"})
+        await client.get(URL, headers={"authorization": "Bearer a"})
+        await client.get(URL, headers={"cache-control": "no-store"})
+        return cache
+
+    cache = _run(upstream, scenario)
+    assert len(upstream.requests) == 3
+    assert cache.stats()["entries"] == 0
+
+
+def test_no_store_response_is_not_cached():
+    upstream = Upstream(**{"cache-control": "no-store"})
+
+    async def scenario(client, cache):
+        await client.get(URL)
+        await client.get(URL)
+
+    _run(upstream, scenario)
+    assert len(upstream.requests) == 2
+
+
+def test_vary_header_values_get_separate_entries():
+    upstream = Upstream(vary="Accept")
+
+    async def scenario(client, cache):
+        json_first = await client.get(URL, headers={"accept": "application/json"})
+        other = await client.get(URL, headers={"accept": "text/plain"})
+        json_again = await client.get(URL, headers={"accept": "application/json"})
+        return json_first, other, json_again
+
+    json_first, other, json_again = _run(upstream, scenario)
+    assert len(upstream.requests) == 2
+    assert other.json() != json_first.json()
+    assert json_again.headers["x-cache"] == "HIT"
+    assert json_again.json() == json_first.json()
+
+
+def test_vary_outside_cache_key_is_not_cached():
+    upstream = Upstream(vary="Cookie")
+
+    async def scenario(client, cache):
+        await client.get(URL)
+        await client.get(URL)
+
+    _run(upstream, scenario)
+    assert len(upstream.requests) == 2
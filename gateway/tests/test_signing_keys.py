@@ -0,0 +1,74 @@
+"""비대칭 서명 키 모음 (kid, 교체, JWKS)"""
+import asyncio
+import shutil
+import time
+
+import pytest
+
+from app.core.signing_keys import KeyRing
+from app.core.token_verifier import TokenVerifier
+
+
+def _keyring(directory, alg="ES256", **kwargs) -> KeyRing:
+    options = dict(rotation_seconds=3600, prepublish_seconds=600, retain_seconds=600)
+    options.update(kwargs)
+    return KeyRing(alg, str(directory), **options)
+
+
+def _claims() -> dict:
+    return {"sub": "user", "exp": int(time.time()) + 60}
+
+
+@pytest.mark.parametrize("alg", ["RS256", "ES256", "EdDSA"])
+def test_signed_token_verifies_with_published_jwks(tmp_path, alg):
+    keyring = _keyring(tmp_path, alg)
+    verifier = TokenVerifier(jwks_provider=keyring.jwks, algorithms=(alg,))
+
+    assert verifier.verify(keyring.sign(_claims()))["sub"] == "user"
+    assert keyring.active_key().kid.startswith(f"{alg}-")
+
+
+def test_regenerated_key_gets_new_kid_and_is_refetched(tmp_path):
+    published = {}
+    verifier = TokenVerifier(jwks_provider=lambda: published["jwks"], cache_ttl=300)
+
+    first = _keyring(tmp_path)
+    published["jwks"] = first.jwks()
+    verifier.verify(first.sign(_claims()))
+
+    # 공유 볼륨 없이 재시작한 경우: 같은 기간의 키가 새로 만들어짐
+    shutil.rmtree(tmp_path)
+    second = _keyring(tmp_path)
+    published["jwks"] = second.jwks()
+
+    assert second.active_key().kid != first.active_key().kid
+    assert verifier.verify(second.sign(_claims()))["sub"] == "user"
+
+
+def test_next_key_is_prepublished_and_used_after_rotation(tmp_path):
+    keyring = _keyring(tmp_path)
+    period_end = (int(time.time() // 3600) + 1) * 3600
+
+    keyring.refresh(period_end - 60)
+    current, upcoming = [jwk["kid"] for jwk in keyring.jwks()["keys"]]
+    assert keyring.active_key(period_end - 60).kid == current
+    assert keyring.active_key(period_end + 1).kid == upcoming
+
+
+def test_signing_does_not_prepare_keys_after_start(tmp_path, monkeypatch):
+    keyring = _keyring(tmp_path)
+
+    async def scenario():
+        await keyring.start()
+        try:
+            calls = []
+            monkeypatch.setattr(keyring, "refresh", lambda now=None: calls.append(now))
+            keyring.sign(_claims())
+            keyring.jwks()
+            # 다음 기간 키가 아직 없으면 직전 키로 계속 서명
+            keyring.active_key(time.time() + 7200)
+            assert calls == []
+        finally:
+            await keyring.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,101 @@
+"""토큰 일괄 검증 엔드포인트 (POST /e/v2/token/verify/batch)"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import internal_auth, rate_limit
+from app.domain.controller import token_controller as token_controller_module
+from app.domain.controller.token_controller import TokenController
+from app.domain.service.token_service import token_service
+from app.main import app
+
+BATCH_URL = "/e/v2/token/verify/batch"
+API_KEY = "test-internal-key"
+client = TestClient(app, headers={"X-Internal-Api-Key": API_KEY})
+
+
+@pytest.fixture(autouse=True)
+def batch_keys(monkeypatch):
+    keys = internal_auth.InternalApiKeys(["previous-key", API_KEY])
+    monkeypatch.setattr(internal_auth.token_batch_keys, "keys", keys.keys)
+    # 테스트마다 빈 버킷에서 시작 (일괄 검증 전용 rate limit에 걸리지 않게)
+    monkeypatch.setattr(rate_limit.rate_limiter, "backend", rate_limit.InMemoryRateLimitBackend())
+    return internal_auth.token_batch_keys
+
+
+def _issue(user_id: str) -> str:
+    return asyncio.run(token_service.create_token(user_id)).access_token
+
+
+def test_issued_token_verifies_in_batch():
+    token = _issue("batch-user")
+
+    response = client.post(BATCH_URL, json={"tokens": [token]})
+
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    assert result["is_valid"] is True
+    assert result["user_id"] == "batch-user"
+
+
+def test_controllers_share_token_service():
+    token = asyncio.run(TokenController().create_token("other-controller")).access_token
+
+    [result] = client.post(BATCH_URL, json={"tokens": [token]}).json()["results"]
+
+    assert result["is_valid"] is True
+
+
+def test_results_follow_request_order():
+    valid = _issue("order-user")
+    revoked = _issue("order-user-revoked")
+    asyncio.run(token_service.revoke_token(revoked))
+
+    results = client.post(BATCH_URL, json={"tokens": [revoked, "not-a-token", valid, valid]}).json()["results"]
+
+    assert [r["is_valid"] for r in results] == [False, False, True, True]
+    assert results[2]["user_id"] == "order-user"
+
+
+def test_large_batch_is_streamed(monkeypatch):
+    monkeypatch.setattr(token_controller_module, "BATCH_STREAM_THRESHOLD", 2)
+    tokens = [_issue(f"stream-user-{i}") for i in range(5)]
+
+    response = client.post(BATCH_URL, json={"tokens": tokens})
+
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    results = response.json()["results"]
+    assert [r["user_id"] for r in results] == [f"stream-user-{i}" for i in range(5)]
+    assert all(r["is_valid"] for r in results)
+
+
+def test_empty_batch_is_rejected():
+    assert client.post(BATCH_URL, json={"tokens": []}).status_code == 422
+
+
+def test_batch_requires_internal_api_key(batch_keys):
+    token = _issue("key-user")
+    anonymous = TestClient(app)
+
+    assert anonymous.post(BATCH_URL, json={"tokens": [token]}).status_code == 401
+    wrong = anonymous.post(BATCH_URL, json={"tokens": [token]}, headers={"X-Internal-Api-Key": "guess"})
+    assert wrong.status_code == 401
+    assert "results" not in wrong.json()
+    # 교체 중인 이전 키도 허용
+    rotated = anonymous.post(BATCH_URL, json={"tokens": [token]}, headers={"X-Internal-Api-Key": "previous-key"})
+    assert rotated.status_code == 200
+
+
+def test_batch_is_disabled_without_configured_keys(monkeypatch):
+    monkeypatch.setattr(internal_auth.token_batch_keys, "keys", [])
+
+    assert client.post(BATCH_URL, json={"tokens": ["any"]}).status_code == 403
+
+
+def test_batch_has_its_own_rate_limit():
+    statuses = [client.post(BATCH_URL, json={"tokens": ["any"]}).status_code for _ in range(11)]
+
+    assert statuses[:10] == [200] * 10
+    assert statuses[10] == 429
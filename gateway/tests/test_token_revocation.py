@@ -0,0 +1,111 @@
+"""무상태 검증용 폐기 목록 (Bloom filter + 공유 저장소 동기화)"""
+import asyncio
+import time
+
+from app.core.token_revocation import InMemoryRevocationStore, RevocationFilter
+
+
+class CountingStore(InMemoryRevocationStore):
+    """snapshot / is_revoked 호출 횟수를 세는 메모리 저장소"""
+
+    def __init__(self):
+        super().__init__()
+        self.snapshots = 0
+        self.lookups = 0
+
+    async def snapshot(self, now):
+        self.snapshots += 1
+        return await super().snapshot(now)
+
+    async def is_revoked(self, jti, now):
+        self.lookups += 1
+        return await super().is_revoked(jti, now)
+
+
+def test_sync_does_not_rebuild_when_live_revocations_exceed_capacity():
+    async def scenario():
+        store = CountingStore()
+        expires_at = time.time() + 3600
+        for i in range(10):
+            await store.revoke(f"jti-{i}", expires_at)
+        revocations = RevocationFilter(store, capacity=4)
+
+        await revocations.sync()
+        assert store.snapshots == 1
+        assert revocations.stats()["bloom_capacity"] == 20
+
+        for _ in range(3):
+            await revocations.sync()
+        assert store.snapshots == 1
+
+        # 다시 만든 필터의 용량까지 차면 그때 한 번 더 만듦
+        for i in range(10, 20):
+            await store.revoke(f"jti-{i}", expires_at)
+        await revocations.sync()
+        await revocations.sync()
+        assert store.snapshots == 2
+        assert revocations.stats()["bloom_capacity"] == 40
+
+    asyncio.run(scenario())
+
+
+def test_bloom_negative_skips_store_and_positive_checks_exact_set():
+    async def scenario():
+        store = CountingStore()
+        revocations = RevocationFilter(store)
+        await revocations.sync()
+        await revocations.revoke("revoked-jti", time.time() + 3600)
+
+        assert await revocations.is_revoked("live-jti", "user") is False
+        assert store.lookups == 0
+
+        assert await revocations.is_revoked("revoked-jti", "user") is True
+        assert store.lookups == 1
+
+        # 필터에는 있지만 저장소에는 없는 항목(오탐)은 저장소 결과를 따름
+        revocations._bloom.add("false-positive-jti")
+        assert await revocations.is_revoked("false-positive-jti", "user") is False
+        assert store.lookups == 2
+        assert revocations.false_positives == 1
+
+    asyncio.run(scenario())
+
+
+def test_unsynced_filter_checks_store():
+    async def scenario():
+        store = CountingStore()
+        await store.revoke("revoked-jti", time.time() + 3600)
+        revocations = RevocationFilter(store)
+
+        assert await revocations.is_revoked("revoked-jti", "user") is True
+        assert await revocations.is_revoked("live-jti", "user") is False
+        assert store.lookups == 2
+
+    asyncio.run(scenario())
+
+
+def test_revoke_all_invalidates_older_epochs():
+    async def scenario():
+        revocations = RevocationFilter(InMemoryRevocationStore())
+        await revocations.sync()
+        epoch = await revocations.revoke_all("user")
+
+        assert await revocations.is_revoked("jti", "user", epoch - 1) is True
+        assert await revocations.is_revoked("jti", "user", epoch) is False
+
+    asyncio.run(scenario())
+
+
+def test_local_revoke_replayed_by_sync_is_counted_once():
+    async def scenario():
+        revocations = RevocationFilter(InMemoryRevocationStore())
+        await revocations.sync()
+        await revocations.revoke("revoked-jti", time.time() + 3600)
+        assert revocations.stats()["bloom_items"] == 1
+
+        # sync가 같은 폐기 이벤트를 다시 적용해도 용량 계산에는 한 번만 반영
+        await revocations.sync()
+        await revocations.sync()
+        assert revocations.stats()["bloom_items"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+"""업스트림 보호 장치 (서킷 브레이커, AIMD 동시성 한도)"""
+import pytest
+from fastapi import HTTPException
+
+from app.core.upstream_guard import CLOSED, HALF_OPEN, OPEN, AdaptiveConcurrencyLimiter, UpstreamGuard
+from app.domain.model.service_type import ServiceType
+from app.domain.model.upstream_config_model import UpstreamClientConfig
+
+
+def _guard(**config) -> UpstreamGuard:
+    options = dict(breaker_failure_threshold=2, breaker_open_seconds=0.0, breaker_half_open_max_calls=1, limit_initial=100)
+    options.update(config)
+    return UpstreamGuard(ServiceType.NEWS, UpstreamClientConfig(**options))
+
+
+def _trip(guard: UpstreamGuard):
+    for _ in range(guard.breaker.failure_threshold):
+        permit = guard.acquire()
+        permit.record(False)
+        permit.release()
+
+
+def test_breaker_opens_after_consecutive_failures_and_rejects():
+    guard = _guard(breaker_open_seconds=30.0)
+    _trip(guard)
+
+    assert guard.breaker.state == OPEN
+    with pytest.raises(HTTPException) as error:
+        guard.acquire()
+    assert error.value.status_code == 503
+    assert int(error.value.headers["Retry-After"]) >= 1
+
+
+def test_half_open_admits_limited_trials_and_closes_on_success():
+    guard = _guard()
+    _trip(guard)
+
+    trial = guard.acquire()
+    assert guard.breaker.state == HALF_OPEN
+    with pytest.raises(HTTPException):
+        guard.acquire()
+
+    trial.record(True)
+    trial.release()
+    assert guard.breaker.state == CLOSED
+    guard.acquire().release()
+
+
+def test_releasing_pre_trip_permit_does_not_free_trial_slot():
+    guard = _guard()
+    slow = guard.acquire()  # closed 상태에서 허용된 느린 요청
+    _trip(guard)
+
+    trial = guard.acquire()
+    slow.release()
+
+    with pytest.raises(HTTPException):
+        guard.acquire()
+    assert guard.breaker.half_open_calls == 1
+    trial.release()
+
+
+def test_trial_from_previous_half_open_round_does_not_free_new_slot():
+    guard = _guard()
+    _trip(guard)
+    stale_trial = guard.acquire()
+    stale_trial.record(False)  # 시험 요청 실패 → 다시 open
+
+    new_trial = guard.acquire()  # open 시간이 지나 새 half_open 기간
+    stale_trial.release()
+
+    with pytest.raises(HTTPException):
+        guard.acquire()
+    new_trial.release()
+
+
+def test_limiter_rejection_returns_trial_slot():
+    guard = _guard(limit_initial=1, limit_min=1)
+    _trip(guard)
+    busy = guard.limiter.in_flight
+    guard.limiter.in_flight = guard.limiter.current_limit  # 한도가 가득 찬 상태
+
+    with pytest.raises(HTTPException):
+        guard.acquire()
+    assert guard.breaker.half_open_calls == 0
+
+    guard.limiter.in_flight = busy
+    guard.acquire().release()
+
+
+def test_limiter_grows_on_fast_success_and_backs_off_on_failure():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=2, max_limit=12, target_latency=0.1, backoff=0.5)
+
+    for _ in range(50):
+        limiter.on_sample(0.01, ok=True)
+    assert limiter.current_limit == 12
+
+    limiter.on_sample(0.01, ok=False)
+    assert limiter.current_limit == 6
+    limiter.on_sample(0.5, ok=True)  # 목표 지연 초과
+    assert limiter.current_limit == 3
+    for _ in range(5):
+        limiter.on_sample(0.01, ok=False)
+    assert limiter.current_limit == 2
+
+
+def test_limiter_rejects_above_limit_and_frees_on_release():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.rejected == 1
+    limiter.release()
+    assert limiter.try_acquire()
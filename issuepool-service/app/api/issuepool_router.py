@@ -1,6 +1,8 @@
-from fastapi import APIRouter,Request
+from fastapi import APIRouter,Depends,Request
 from fastapi.responses import JSONResponse
 import logging
+from app.core.msgpack_codec import negotiated_response
+from app.core.token_verifier import bearer_claims, token_verifier
 from app.domain.controller.issuepool_controller import IssuepoolController
 from app.domain.model.issuepool_schema import IssuepoolRequest
 
@@ -8,9 +10,10 @@ router = APIRouter()
 logger = logging.getLogger("issuepool_main")
 issuepool_controller = IssuepoolController()
 
-@router.post("/search")
-async def issuepool(req: IssuepoolRequest):
+# ✅ 게이트웨이가 발급한 토큰을 JWKS 공개키로 로컬 검증 (게이트웨이 호출 없음)
+@router.post("/search", dependencies=[Depends(bearer_claims(token_verifier))])
+async def issuepool(req: IssuepoolRequest, request: Request):
     logger.info(f"🔍 기업명 수신: {req.company_name}")
     result = issuepool_controller.get_issuepool(req.company_name)
-    return JSONResponse(content=result)
+    return negotiated_response(request, result)
     
\ No newline at end of file
@@ -1,8 +1,11 @@
 
+from app.core.tracing import issuepool_tracer
+
 class SasbService:
     def __init__(self):
         pass
 
+    @issuepool_tracer.traced("IssuepoolService.get_issuepool")
     def get_issuepool(self,company_name:str):
         return {"message": f"ISSUEPOOL 서비스 호출: {company_name}"}
 
@@ -4,11 +4,16 @@ SASB 서비스 메인 애플리케이션 진입점
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from app.api.issuepool_router import router as issuepool_router
+from app.core.msgpack_codec import MsgpackRequestMiddleware
+from app.core.tracing import TracingMiddleware, issuepool_tracer
 
 import uvicorn
 import logging
 import traceback
+import time
 import os
 
 # 로깅 설정
@@ -37,12 +42,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (게이트웨이가 Accept-Encoding: gzip으로 요청하면 압축된 본문을 그대로 전달)
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")))
+
+# msgpack 요청 본문을 JSON으로 변환 (응답은 라우터에서 Accept에 맞춰 msgpack/JSON 선택)
+app.add_middleware(MsgpackRequestMiddleware)
+
 app.include_router(issuepool_router, prefix="/issuepool",tags=["ISSUEPOOL 서비스"])
 
+# 헬스 체크 엔드포인트 (게이트웨이 액티브 헬스 체크용)
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy"}
+
+# 게이트웨이가 전달한 남은 시간 예산(x-request-deadline-ms) 확인
+# 이미 기한이 지난 요청은 처리하지 않고, 남은 기한은 request.state.deadline(monotonic 시각)으로 전달
+@app.middleware("http")
+async def enforce_deadline(request: Request, call_next):
+    budget = request.headers.get("x-request-deadline-ms")
+    if budget is not None:
+        try:
+            remaining = float(budget) / 1000
+        except ValueError:
+            remaining = None
+        if remaining is not None:
+            if remaining <= 0:
+                logger.warning(f"⌛ 기한이 지난 요청 무시: {request.method} {request.url.path}")
+                return JSONResponse(status_code=504, content={"detail": "요청 기한이 지났습니다"})
+            request.state.deadline = time.monotonic() + remaining
+    return await call_next(request)
+
 # 예외 처리 미들웨어 추가
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"📥 요청: {request.method} {request.url.path} (클라이언트: {request.client.host})")
+    logger.info(f"📥 요청: {request.method} {request.url.path} (클라이언트: {request.client.host if request.client else 'unix'})")
     try:
         response = await call_next(request)
         logger.info(f"📤 응답: {response.status_code}")
@@ -52,14 +85,26 @@ async def log_requests(request: Request, call_next):
         logger.error(traceback.format_exc())
         raise
 
+# 분산 추적 (게이트웨이가 보낸 traceparent를 이어받아 요청 span 생성, 가장 바깥 미들웨어)
+app.add_middleware(TracingMiddleware, tracer=issuepool_tracer)
+
+# 종료 시 버퍼에 남은 span 기록
+@app.on_event("shutdown")
+def flush_traces():
+    issuepool_tracer.shutdown()
+
 
-# 직접 실행 시 (개발 환경)
+# 직접 실행 시 (개발 환경, 운영은 gunicorn -c gunicorn.conf.py)
 if __name__ == "__main__":
-    logger.info(f"💻 개발 모드로 실행 - 포트: 8005")
+    # SERVICE_UDS를 지정하면 TCP 포트 대신 Unix 소켓으로 실행
+    # (같은 호스트의 게이트웨이는 ISSUEPOOL_SERVICE_URL=unix://<소켓 경로>로 연결)
+    uds = os.getenv("SERVICE_UDS")
+    logger.info(f"💻 개발 모드로 실행 - " + (f"Unix 소켓: {uds}" if uds else "포트: 8005"))
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8005,
+        uds=uds,
         reload=True,
         log_level="info"
     ) 
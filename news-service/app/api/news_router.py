@@ -1,6 +1,8 @@
-from fastapi import APIRouter,Request
+from fastapi import APIRouter,Depends,Request
 from fastapi.responses import JSONResponse
 import logging
+from app.core.msgpack_codec import negotiated_response
+from app.core.token_verifier import bearer_claims, token_verifier
 from app.domain.controlloer.news_controller import NewsController
 from app.domain.model.news_schema import NewsRequest
 
@@ -8,9 +10,10 @@ router = APIRouter()
 logger = logging.getLogger("news_main")
 news_controller = NewsController()
 
-@router.post("/search")
-async def news(req: NewsRequest):
+# ✅ 게이트웨이가 발급한 토큰을 JWKS 공개키로 로컬 검증 (게이트웨이 호출 없음)
+@router.post("/search", dependencies=[Depends(bearer_claims(token_verifier))])
+async def news(req: NewsRequest, request: Request):
     logger.info(f"🔍 기업명 수신: {req.company_name}")
-    result = news_controller.get_news(req.company_name)
-    return JSONResponse(content=result)
+    result = news_controller.get_news(req.company_name, deadline=getattr(request.state, "deadline", None))
+    return negotiated_response(request, result)
     
\ No newline at end of file
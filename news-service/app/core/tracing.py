@@ -0,0 +1,349 @@
+"""
+W3C Trace Context(traceparent) 기반 분산 추적
+
+- 게이트웨이가 보낸 traceparent를 이어받아 요청 span을 만들고, 처리 단계는 tracer.span() / tracer.traced()로
+  하위 span을 기록합니다 (게이트웨이 app/core/tracing.py와 같은 형식).
+- 샘플링: traceparent의 sampled 플래그를 따르고, 직접 호출되어 traceparent가 없으면 TRACE_SAMPLE_RATIO 비율로 샘플링
+- 내보내기: TRACE_EXPORTER=none | log | file | "모듈:팩토리" (file은 TRACE_FILE에 span 하나당 JSON 한 줄)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger("news_main")
+
+TRACEPARENT = "traceparent"
+
+_ZERO_TRACE_ID = "0" * 32
+_ZERO_SPAN_ID = "0" * 16
+
+
+class SpanContext:
+    """trace 식별자와 샘플링 여부 (traceparent 헤더 한 줄에 해당)"""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """traceparent 헤더 파싱 (형식이 잘못되면 None → 새 trace 시작)"""
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4:
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if len(version) != 2 or version == "ff" or (version == "00" and len(parts) != 4):
+        return None
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(version, 16)
+        int(trace_id, 16)
+        int(span_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if trace_id == _ZERO_TRACE_ID or span_id == _ZERO_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, sampled)
+
+
+def _new_id(hex_digits: int) -> str:
+    value = 0
+    while value == 0:
+        value = random.getrandbits(hex_digits * 4)
+    return f"{value:0{hex_digits}x}"
+
+
+class Span:
+    """처리 단계 하나의 시작/소요 시간과 속성 (샘플링되지 않은 span은 속성을 모으지 않음)"""
+
+    __slots__ = ("name", "context", "parent_id", "kind", "start_time", "_started", "duration", "attributes", "status", "error")
+
+    def __init__(self, name: str, context: SpanContext, parent_id: Optional[str], kind: str):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes: Dict[str, Any] = {}
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if self.context.sampled:
+            self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+
+    def to_dict(self, service_name: str) -> Dict[str, Any]:
+        return {
+            "service": service_name,
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class LogSpanExporter:
+    """span을 로그로 출력 (개발용)"""
+
+    def export(self, span: Dict[str, Any]):
+        logger.info(f"🧵 span {span['name']} ({span['duration_ms']}ms) {json.dumps(span, ensure_ascii=False)}")
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter:
+    """span을 메모리에 모았다가 batch_size개마다 파일에 JSON Lines로 기록
+
+    버퍼가 max_queue를 넘으면 새 span은 버리고 개수만 셉니다 (요청 처리를 막지 않도록).
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, max_queue: int = 4096):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]):
+        with self._lock:
+            if len(self._buffer) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        try:
+            # 배치를 한 번의 write로 추가해 여러 워커 프로세스가 같은 파일에 써도 줄이 섞이지 않게 함
+            data = "".join(json.dumps(span, ensure_ascii=False) + "\n" for span in batch).encode("utf-8")
+            with open(self.path, "ab", buffering=0) as f:
+                f.write(data)
+        except OSError as e:
+            self.dropped += len(batch)
+            logger.warning(f"⚠️ trace 파일 기록 실패 ({self.path}): {e}")
+
+    def shutdown(self):
+        self.flush()
+
+
+# ✅ TRACE_EXPORTER 이름별 exporter 생성 함수 (register_exporter로 추가 가능)
+EXPORTERS: Dict[str, Callable[[], Any]] = {
+    "none": lambda: None,
+    "log": LogSpanExporter,
+    "file": lambda: FileSpanExporter(
+        os.getenv("TRACE_FILE", "traces.jsonl"),
+        batch_size=int(os.getenv("TRACE_BATCH_SIZE", "64")),
+    ),
+}
+
+
+def register_exporter(name: str, factory: Callable[[], Any]):
+    EXPORTERS[name] = factory
+
+
+def create_exporter(name: str) -> Any:
+    """이름으로 exporter 생성 ('패키지.모듈:팩토리' 형식이면 import해서 호출)"""
+    if ":" in name:
+        module_name, _, attr = name.partition(":")
+        return getattr(importlib.import_module(module_name), attr)()
+    if name not in EXPORTERS:
+        raise ValueError(f"지원하지 않는 trace exporter입니다: {name}")
+    return EXPORTERS[name]()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class Tracer:
+    """span 생성과 현재 span 관리
+
+    exporter가 None이어도 샘플링 결정은 내려 traceparent로 전달합니다 (이 프로세스의 span만 기록하지 않음).
+    """
+
+    def __init__(self, service_name: str, exporter: Any = None, sample_ratio: float = 1.0):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.started = 0
+        self.exported = 0
+
+    @classmethod
+    def from_env(cls, service_name: str) -> "Tracer":
+        return cls(
+            service_name=os.getenv("TRACE_SERVICE_NAME", service_name),
+            exporter=create_exporter(os.getenv("TRACE_EXPORTER", "none")),
+            sample_ratio=float(os.getenv("TRACE_SAMPLE_RATIO", "0.1")),
+        )
+
+    def start_span(self, name: str, parent: Optional[SpanContext] = None, kind: str = "internal") -> Span:
+        """parent가 없으면 현재 span의 하위 span, 현재 span도 없으면 새 trace 시작"""
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is not None:
+            context = SpanContext(parent.trace_id, _new_id(16), parent.sampled)
+            parent_id = parent.span_id
+        else:
+            sampled = random.random() < self.sample_ratio
+            context = SpanContext(_new_id(32), _new_id(16), sampled)
+            parent_id = None
+        self.started += 1
+        return Span(name, context, parent_id, kind)
+
+    def end_span(self, span: Span):
+        span.end()
+        if span.context.sampled and self.exporter is not None:
+            self.exported += 1
+            self.exporter.export(span.to_dict(self.service_name))
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Span]:
+        """with 블록 동안 현재 span으로 설정 (예외가 나면 span에 기록하고 다시 발생)"""
+        span = self.start_span(name, parent, kind)
+        if attributes:
+            for key, value in attributes.items():
+                span.set_attribute(key, value)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def traced(self, name: Optional[str] = None):
+        """함수 호출 전체를 span으로 기록하는 데코레이터 (동기/비동기 함수 모두 지원)"""
+
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def inject(self, headers: Dict[str, str]):
+        """현재 span의 traceparent를 전달할 헤더에 설정"""
+        span = _current_span.get()
+        if span is not None:
+            headers[TRACEPARENT] = span.context.traceparent()
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "service": self.service_name,
+            "exporter": type(self.exporter).__name__ if self.exporter is not None else None,
+            "sample_ratio": self.sample_ratio,
+            "spans_started": self.started,
+            "spans_exported": self.exported,
+            "spans_dropped": getattr(self.exporter, "dropped", 0),
+        }
+
+
+class TracingMiddleware:
+    """요청마다 server span을 만들고 들어온 traceparent를 이어받음 (exclude_paths로 시작하는 경로는 제외)"""
+
+    def __init__(self, app: ASGIApp, tracer: Optional[Tracer] = None, exclude_paths: Sequence[str] = ("/health",)):
+        self.app = app
+        self.tracer = tracer or news_tracer
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get(TRACEPARENT))
+        method = scope["method"]
+        with self.tracer.span(f"{method} {scope['path']}", parent=parent, kind="server") as span:
+            span.set_attribute("http.method", method)
+            span.set_attribute("http.target", scope["path"])
+
+            async def traced_send(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{method} {route.path}"
+
+
+# ✅ news 서비스 전역 tracer (TRACE_EXPORTER / TRACE_SAMPLE_RATIO / TRACE_FILE)
+news_tracer = Tracer.from_env("news-service")
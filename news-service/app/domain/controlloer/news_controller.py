@@ -1,5 +1,6 @@
 from app.domain.service.news_service import NewsService
 import logging
+import os
 import threading
 import time
 import sys
@@ -45,9 +46,29 @@ def run_batch_job():
     kst_now = datetime.datetime.now(ZoneInfo('Asia/Seoul'))
     logger_controller.info(f"📊 배치 뉴스 크롤링 작업이 실행되었습니다. 현재 시간: {kst_now.strftime('%Y-%m-%d %H:%M:%S')}")
 
+# 멀티 워커(gunicorn)에서도 배치가 한 번만 실행되도록 스케줄러는 파일 잠금을 가진 프로세스 하나만 실행
+BATCH_LOCK_FILE = os.getenv("BATCH_LOCK_FILE", "/tmp/news-batch-scheduler.lock")
+
+def acquire_scheduler_lock():
+    """스케줄러 잠금을 얻을 때까지 대기 (잠금을 가진 워커가 종료되면 대기 중인 워커가 이어받음)"""
+    try:
+        import fcntl
+    except ImportError:  # fcntl이 없는 OS는 단일 프로세스 실행으로 간주
+        return None
+    lock_file = open(BATCH_LOCK_FILE, "w")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
 # 스케줄러를 실행하는 스레드 함수
 def run_scheduler():
     """스케줄러를 백그라운드에서 실행하는 함수"""
+    lock_file = acquire_scheduler_lock()  # 프로세스가 끝날 때까지 잠금 유지
+    # 매일 오전 11:30에 실행
+    schedule.every().day.at("11:30").do(run_batch_job)
+
+    # 현재 한국 시간을 로그에 기록
+    kst_now = datetime.datetime.now(ZoneInfo('Asia/Seoul'))
+    logger_controller.info(f"⏰ 배치 작업이 매일 오전 11:30에 실행되도록 설정되었습니다 (pid {os.getpid()}). 현재 시간: {kst_now.strftime('%Y-%m-%d %H:%M:%S')}")
     while True:
         schedule.run_pending()
         time.sleep(60)  # 1분마다 스케줄 확인
@@ -77,14 +98,7 @@ class NewsController:
     def setup_batch_schedule(self):
         """배치 작업을 매일 오전 11:30에 실행하도록 스케줄 설정"""
         try:
-            # 매일 오전 11:30에 실행
-            schedule.every().day.at("11:30").do(run_batch_job)
-            
-            # 현재 한국 시간을 로그에 기록
-            kst_now = datetime.datetime.now(ZoneInfo('Asia/Seoul'))
-            logger_controller.info(f"⏰ 배치 작업이 매일 오전 11:30에 실행되도록 설정되었습니다. 현재 시간: {kst_now.strftime('%Y-%m-%d %H:%M:%S')}")
-            
-            # 스케줄러를 백그라운드에서 실행
+            # 스케줄러를 백그라운드에서 실행 (잠금을 얻은 워커 하나만 배치 작업 등록)
             scheduler_thread = threading.Thread(target=run_scheduler)
             scheduler_thread.daemon = True  # 메인 프로그램 종료 시 함께 종료
             scheduler_thread.start()
@@ -120,9 +134,9 @@ class NewsController:
             print(f"타이머 설정 중 오류 발생: {e}")
             logger_controller.error(f"타이머 설정 오류: {e}")
 
-    def get_news(self, company_name: str):
+    def get_news(self, company_name: str, deadline: float = None):
         # 1. 뉴스 정보 및 본문 가져오기 (get_news가 본문까지 가져오도록 수정됨)
-        self.news_service.get_news(company_name)
+        self.news_service.get_news(company_name, deadline=deadline)
         
         return {
             "company": company_name,
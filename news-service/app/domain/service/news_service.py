@@ -22,6 +22,7 @@ import sys
 
 # 로깅 포맷터 임포트 (새로운 유틸리티 파일에서)
 from app.core.logging_utils import KSTFormatter  # <--- 수정된 임포트
+from app.core.tracing import current_span, news_tracer
 
 # --- 로깅 설정 수정 (이전과 동일하게 유지) ---
 logger_service = logging.getLogger("news_service")
@@ -63,7 +64,10 @@ class NewsService:
         except OSError as e:
             logger_service.error(f"❌ 출력 디렉터리 '{OUTPUT_DIR}' 생성 실패: {e}")
 
-    def get_news(self, company_name: str):
+    @news_tracer.traced("NewsService.get_news")
+    def get_news(self, company_name: str, deadline: float = None):
+        """deadline(time.monotonic 기준)이 주어지면 기한이 지난 뒤에는 남은 기사 크롤링을 중단"""
+        current_span().set_attribute("company_name", company_name)
         base_url = "https://search.naver.com/search.naver"
         params = {
             "where": "news",
@@ -76,7 +80,10 @@ class NewsService:
         }
 
         try:
-            response = requests.get(base_url, headers=headers, params=params)
+            # 네이버 검색 요청 시간을 크롤링/NLP 단계와 구분해 기록
+            with news_tracer.span("naver_search", kind="client", attributes={"http.url": base_url}) as span:
+                response = requests.get(base_url, headers=headers, params=params)
+                span.set_attribute("http.status_code", response.status_code)
             logger_service.info(f"🎃✨🎉🎊 Response: {response.text}")
             response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
         except requests.RequestException as e:
@@ -121,6 +128,9 @@ class NewsService:
             print(link)
         
         for i, link in enumerate(links[:5], start=1):
+            if deadline is not None and time.monotonic() >= deadline:
+                logger_service.warning(f"⌛ 요청 기한이 지나 나머지 {len(links[:5]) - i + 1}개 기사 크롤링 중단")
+                break
             content = self.crawl_with_selenium(link)
             word_freq = self.process_text_for_nlp(content)
             self.generate_wordcloud_image_from_freq(word_freq, i)
@@ -129,8 +139,10 @@ class NewsService:
 
   
     
+    @news_tracer.traced("NewsService.crawl_with_selenium")
     def crawl_with_selenium(self, link: str) -> str:
         """Selenium을 이용한 뉴스 본문 동적 크롤링 (Docker 최적화)"""
+        current_span().set_attribute("link", link)
         
         # ChromeDriver는 Docker 내부 PATH에 있거나, 명시적 경로 사용:
         CHROMEDRIVER_IN_CONTAINER_PATH = "/usr/bin/chromedriver" 
@@ -225,6 +237,7 @@ class NewsService:
                 logger_service.info(f"🧹 Selenium WebDriver 종료됨 (URL: {link})")
      # --- 여기에 새로운 NLP 및 워드클라우드 함수 추가 ---
     
+    @news_tracer.traced("NewsService.process_text_for_nlp")
     def process_text_for_nlp(self, text: str, custom_stopwords: list = None) -> Counter:
         """
         주어진 텍스트에 대해 NLP 전처리 (형태소 분석, 명사 추출, 불용어 제거 등)를 수행하고
@@ -285,6 +298,7 @@ class NewsService:
         
         return word_freq
 
+    @news_tracer.traced("NewsService.generate_wordcloud_image_from_freq")
     def generate_wordcloud_image_from_freq(self, word_freq: Counter, num: int = 1, font_path: str = FONT_PATH) -> str:
         """
         단어 빈도수(Counter 객체)를 기반으로 워드클라우드 이미지를 생성하고
@@ -0,0 +1,115 @@
+"""
+게이트웨이와 주고받는 본문의 MessagePack 협상
+
+- 응답: Accept에 application/msgpack이 명시되어 있고 JSON보다 낮지 않으면 msgpack, 아니면 JSON
+- 요청: Content-Type이 application/msgpack이면 라우터(pydantic 검증) 앞에서 JSON 본문으로 바꿔 전달
+msgpack 패키지가 없으면 항상 JSON으로 동작합니다.
+"""
+from typing import Any, Dict, Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = frozenset({"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"})
+
+
+def parse_accept(value: Optional[str]) -> Dict[str, float]:
+    """Accept 헤더 → {미디어 타입: q값}"""
+    accepted: Dict[str, float] = {}
+    if not value:
+        return accepted
+    for item in value.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        accepted[media_type] = q
+    return accepted
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    if msgpack is None:
+        return False
+    accepted = parse_accept(accept)
+    msgpack_q = max((accepted.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES), default=0.0)
+    if msgpack_q <= 0:
+        return False
+    json_q = accepted.get("application/json", accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return msgpack_q >= json_q
+
+
+class MsgpackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def negotiated_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """요청의 Accept에 맞춰 msgpack 또는 JSON 응답 생성"""
+    if accepts_msgpack(request.headers.get("accept")):
+        response: Response = MsgpackResponse(content=content, status_code=status_code)
+    else:
+        response = JSONResponse(content=content, status_code=status_code)
+    response.headers["vary"] = "Accept"
+    return response
+
+
+class MsgpackRequestMiddleware:
+    """msgpack 요청 본문을 JSON으로 바꿔 FastAPI 본문 파싱/검증을 그대로 사용 (요청 본문은 작아 변환 비용이 작음)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or msgpack is None:
+            await self.app(scope, receive, send)
+            return
+        content_type = Headers(scope=scope).get("content-type", "")
+        if content_type.split(";", 1)[0].strip().lower() not in MSGPACK_MEDIA_TYPES:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        try:
+            body = json.dumps(msgpack.unpackb(b"".join(chunks), raw=False), ensure_ascii=False).encode("utf-8")
+        except Exception:
+            response = JSONResponse(status_code=400, content={"detail": "잘못된 msgpack 요청 본문입니다"})
+            await response(scope, receive, send)
+            return
+
+        headers = MutableHeaders(scope=scope)
+        headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(body))
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
@@ -0,0 +1,235 @@
+"""
+비대칭 서명(RS256 / ES256 / EdDSA) JWT 로컬 검증
+
+게이트웨이가 공개하는 JWKS(/.well-known/jwks.json)를 받아 파싱한 공개키를 kid별로 캐시하고,
+게이트웨이를 호출하지 않고 서명/만료를 직접 확인합니다.
+- 모르는 kid가 오면(키 교체 직후) JWKS를 다시 받아 확인 (너무 잦은 재조회는 제한)
+- 헤더의 alg는 키의 alg와 같아야 하며 허용 목록에 없는 알고리즘(none, HS256 등)은 거부
+news / sasb / issuepool 서비스에 같은 파일을 두고 사용합니다.
+"""
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from fastapi import HTTPException, Request, status
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+import urllib.request
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+logger = logging.getLogger("sasb_main")
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+class TokenVerificationError(Exception):
+    """서명, 형식, 만료 등으로 토큰을 받아들일 수 없음"""
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _b64url_int(data: str) -> int:
+    return int.from_bytes(b64url_decode(data), "big")
+
+
+def public_key_from_jwk(jwk: Dict[str, Any]) -> Tuple[str, Any]:
+    """JWK → (alg, 공개키 객체) - alg는 키 종류로 정하고, JWK에 다른 alg가 적혀 있으면 거부"""
+    kty = jwk.get("kty")
+    if kty == "RSA":
+        alg, key = "RS256", rsa.RSAPublicNumbers(_b64url_int(jwk["e"]), _b64url_int(jwk["n"])).public_key()
+    elif kty == "EC" and jwk.get("crv") == "P-256":
+        alg, key = "ES256", ec.EllipticCurvePublicNumbers(_b64url_int(jwk["x"]), _b64url_int(jwk["y"]), ec.SECP256R1()).public_key()
+    elif kty == "OKP" and jwk.get("crv") == "Ed25519":
+        alg, key = "EdDSA", ed25519.Ed25519PublicKey.from_public_bytes(b64url_decode(jwk["x"]))
+    else:
+        raise ValueError(f"지원하지 않는 JWK입니다: kty={kty}, crv={jwk.get('crv')}")
+    if jwk.get("alg", alg) != alg:
+        raise ValueError(f"JWK의 alg({jwk['alg']})가 키 종류와 다릅니다")
+    return alg, key
+
+
+def verify_signature(alg: str, key: Any, signing_input: bytes, signature: bytes):
+    """서명 확인 (실패 시 InvalidSignature)"""
+    if alg == "RS256":
+        key.verify(signature, signing_input, padding.PKCS1v15(), hashes.SHA256())
+    elif alg == "ES256":
+        # JWS의 ES256 서명은 r || s (각 32바이트) 형식
+        if len(signature) != 64:
+            raise InvalidSignature()
+        r = int.from_bytes(signature[:32], "big")
+        s = int.from_bytes(signature[32:], "big")
+        key.verify(encode_dss_signature(r, s), signing_input, ec.ECDSA(hashes.SHA256()))
+    elif alg == "EdDSA":
+        key.verify(signature, signing_input)
+    else:
+        raise InvalidSignature()
+
+
+class TokenVerifier:
+    """JWKS 기반 JWT 검증기 (파싱한 공개키를 kid별로 캐시)
+
+    jwks_url로 JWKS를 받아오거나, 같은 프로세스에 키가 있으면 jwks_provider로 직접 받습니다.
+    """
+
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        jwks_provider: Optional[Callable[[], Dict[str, Any]]] = None,
+        algorithms: Sequence[str] = ASYMMETRIC_ALGORITHMS,
+        issuer: Optional[str] = None,
+        leeway: float = 30.0,
+        cache_ttl: float = 300.0,
+        min_refresh_interval: float = 10.0,
+        timeout: float = 3.0,
+    ):
+        self.jwks_url = jwks_url
+        self.jwks_provider = jwks_provider
+        self.algorithms = frozenset(algorithms) & frozenset(ASYMMETRIC_ALGORITHMS)
+        self.issuer = issuer
+        self.leeway = leeway
+        self.cache_ttl = cache_ttl
+        # 로컬 키는 조회 비용이 없으므로 재조회를 제한하지 않음
+        self.min_refresh_interval = 0.0 if jwks_provider is not None else min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Tuple[str, Any]] = {}
+        self._fetched_at = 0.0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @classmethod
+    def from_env(cls) -> "TokenVerifier":
+        return cls(
+            jwks_url=os.getenv("TOKEN_JWKS_URL", "http://gateway:8080/.well-known/jwks.json"),
+            issuer=os.getenv("TOKEN_ISSUER") or None,
+            leeway=float(os.getenv("TOKEN_LEEWAY", "30")),
+            cache_ttl=float(os.getenv("TOKEN_JWKS_CACHE_TTL", "300")),
+        )
+
+    def _fetch(self) -> Dict[str, Any]:
+        if self.jwks_provider is not None:
+            return self.jwks_provider()
+        with urllib.request.urlopen(self.jwks_url, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def refresh(self):
+        """JWKS를 다시 받아 kid별 공개키 캐시 교체 (파싱할 수 없는 키는 건너뜀)"""
+        self._fetched_at = time.monotonic()
+        try:
+            jwks = self._fetch()
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"⚠️ JWKS 조회 실패 ({self.jwks_url}): {e}")
+            return
+        keys: Dict[str, Tuple[str, Any]] = {}
+        for jwk in jwks.get("keys", []):
+            kid = jwk.get("kid")
+            if not kid or jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = public_key_from_jwk(jwk)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"⚠️ JWK 파싱 실패 (kid={kid}): {e}")
+        self._keys = keys
+        self.refreshes += 1
+
+    def _needs_refresh(self, kid: str) -> bool:
+        age = time.monotonic() - self._fetched_at
+        if age >= self.cache_ttl:
+            return True
+        return kid not in self._keys and age >= self.min_refresh_interval
+
+    def verify(self, token: str, verify_exp: bool = True) -> Dict[str, Any]:
+        """서명과 등록 클레임(exp, nbf, iss)을 확인하고 클레임 반환 (실패 시 TokenVerificationError)"""
+        header, claims, signing_input, signature = self._parse(token)
+        if self._needs_refresh(header["kid"]):
+            self.refresh()
+        return self._check(header, claims, signing_input, signature, verify_exp)
+
+    async def averify(self, token: str, verify_exp: bool = True) -> Dict[str, Any]:
+        """verify의 비동기 버전 (JWKS 조회가 필요할 때만 스레드에서 받아 이벤트 루프를 막지 않음)"""
+        header, claims, signing_input, signature = self._parse(token)
+        if self._needs_refresh(header["kid"]):
+            await asyncio.to_thread(self.refresh)
+        return self._check(header, claims, signing_input, signature, verify_exp)
+
+    def _parse(self, token: str) -> Tuple[Dict[str, Any], Dict[str, Any], bytes, bytes]:
+        try:
+            encoded_header, encoded_claims, encoded_signature = token.split(".")
+            header = json.loads(b64url_decode(encoded_header))
+            claims = json.loads(b64url_decode(encoded_claims))
+            signature = b64url_decode(encoded_signature)
+            signing_input = f"{encoded_header}.{encoded_claims}".encode("ascii")
+        except (ValueError, TypeError) as e:
+            raise TokenVerificationError("토큰 형식이 올바르지 않습니다") from e
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise TokenVerificationError("토큰 형식이 올바르지 않습니다")
+        if header.get("alg") not in self.algorithms:
+            raise TokenVerificationError(f"허용되지 않는 서명 알고리즘입니다: {header.get('alg')}")
+        if not isinstance(header.get("kid"), str):
+            raise TokenVerificationError("토큰에 kid가 없습니다")
+        return header, claims, signing_input, signature
+
+    def _check(self, header: Dict[str, Any], claims: Dict[str, Any], signing_input: bytes, signature: bytes, verify_exp: bool) -> Dict[str, Any]:
+        entry = self._keys.get(header["kid"])
+        if entry is None:
+            raise TokenVerificationError(f"알 수 없는 서명 키입니다: {header['kid']}")
+        alg, key = entry
+        if header["alg"] != alg:
+            raise TokenVerificationError("토큰 알고리즘이 서명 키와 다릅니다")
+        try:
+            verify_signature(alg, key, signing_input, signature)
+        except InvalidSignature as e:
+            raise TokenVerificationError("서명이 올바르지 않습니다") from e
+
+        now = time.time()
+        if verify_exp:
+            exp = claims.get("exp")
+            if not isinstance(exp, (int, float)) or exp + self.leeway < now:
+                raise TokenVerificationError("토큰이 만료되었습니다")
+        nbf = claims.get("nbf")
+        if isinstance(nbf, (int, float)) and nbf - self.leeway > now:
+            raise TokenVerificationError("아직 사용할 수 없는 토큰입니다")
+        if self.issuer is not None and claims.get("iss") != self.issuer:
+            raise TokenVerificationError("토큰 발급자가 다릅니다")
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jwks_url": self.jwks_url if self.jwks_provider is None else "local",
+            "kids": sorted(self._keys),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+def bearer_claims(verifier: TokenVerifier) -> Callable[[Request], Any]:
+    """FastAPI 의존성 생성: Authorization: Bearer 토큰을 로컬에서 검증하고 클레임 반환 (실패 시 401)
+
+        @router.post("/search")
+        async def search(req: ..., claims: dict = Depends(bearer_claims(token_verifier))):
+    """
+    async def dependency(request: Request) -> Dict[str, Any]:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="인증 토큰이 필요합니다", headers={"WWW-Authenticate": "Bearer"})
+        try:
+            return await verifier.averify(token.strip())
+        except TokenVerificationError as e:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+    return dependency
+
+
+# ✅ 서비스 전역 토큰 검증기 (TOKEN_JWKS_URL의 공개키로 검증, 처음 검증할 때 JWKS 조회)
+token_verifier = TokenVerifier.from_env()
@@ -1,7 +1,9 @@
+from app.core.tracing import sasb_tracer
 
 class SasbService:
     def __init__(self):
         pass
 
+    @sasb_tracer.traced("SasbService.get_sasb")
     def get_sasb(self,company_name:str):
         return {"message": f"SASB 서비스 호출: {company_name}"}
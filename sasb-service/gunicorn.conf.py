@@ -0,0 +1,53 @@
+"""
+SASB Service 운영 서버 설정 (gunicorn pre-fork + uvicorn 워커)
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+- 워커 수: WEB_CONCURRENCY (기본값: 프로세스가 쓸 수 있는 CPU 코어 수)
+- 이벤트 루프/HTTP 파서: uvicorn 워커가 uvloop/httptools를 자동 사용 (설치되어 있지 않으면 asyncio/h11)
+- 워커 재시작: MAX_REQUESTS건 처리 후(워커마다 MAX_REQUESTS_JITTER만큼 분산) 진행 중 요청을 마치고 교체
+- SERVICE_UDS를 지정하면 TCP 포트 대신 Unix 소켓에서 받음 (모든 워커가 같은 소켓 공유)
+개발 환경은 python -m app.main (단일 프로세스 + reload)을 사용합니다.
+"""
+import os
+
+
+def _cpu_count() -> int:
+    # 컨테이너에 할당된 CPU 집합 기준 (지원하지 않는 OS는 전체 코어 수)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+_uds = os.getenv("SERVICE_UDS")
+bind = [f"unix:{_uds}"] if _uds else [f"0.0.0.0:{os.getenv('PORT', '8004')}"]
+workers = int(os.getenv("WEB_CONCURRENCY", str(_cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# ✅ 워커 재시작 (메모리 증가 상한, 지터로 워커들이 동시에 재시작되지 않게 함)
+max_requests = int(os.getenv("MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "500"))
+
+# 재시작/종료 시 진행 중 요청을 마칠 때까지 기다리는 시간, 응답 없는 워커를 교체하기까지의 시간
+# SASB 요청은 이벤트 루프를 오래 막는 작업(크롤링 등) 없이 바로 응답하므로 기본 heartbeat 제한으로 충분
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# 워커 heartbeat 파일은 메모리 파일시스템에 (컨테이너의 overlay 디스크 I/O로 워커가 멈춘 것처럼 보이는 것 방지)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# 요청 로그는 앱 로거가 남기므로 gunicorn 접근 로그는 끔
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    server.log.info(f"🚀 운영 모드 - 워커 {workers}개, 이벤트 루프: {loop}, 워커당 최대 요청 {max_requests}(+{max_requests_jitter})")